@@ -2,13 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
 import shutil
+import signal
 import subprocess
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Tuple,
+)
 
-from .exceptions import AdapterExecutionError, ValidationError
+from .artifacts import open_log_writer
+from .cache import ResultCache
+from .config import parse_limits, parse_timeout
+from .exceptions import AdapterExecutionError, AdapterTimeoutError, ValidationError
+from .models import ResourceLimits
+from .paths import cache_dir
+from .resources import (
+    Placement,
+    ResourceUsage,
+    TransientCgroup,
+    resolve_cpus,
+    thread_affinity,
+    wait_with_usage,
+    wait_with_usage_async,
+)
 from .utils import load_yaml
 
 
@@ -45,6 +79,8 @@ class AdapterManifest:
     parameters: Dict[str, AdapterParameter] = field(default_factory=dict)
     description: str | None = None
     args: List[str] = field(default_factory=list)
+    timeout_s: float | None = None
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
 
     def build_command(self, parameters: Mapping[str, Any]) -> List[str]:
         for key, value in parameters.items():
@@ -63,97 +99,675 @@ class AdapterManifest:
         return command
 
 
+ADAPTER_INDEX_VERSION = 1
+
+# Shared indexes kept under the cache directory, one per adapters directory.
+ADAPTER_INDEX_LIMIT = 32
+
+
+def _default_index_path(directory: Path) -> Path:
+    digest = hashlib.sha256(directory.resolve().as_posix().encode("utf-8")).hexdigest()[:16]
+    return cache_dir() / "adapters" / f"{digest}.json"
+
+
+def _prune_indexes(folder: Path, current: Path) -> None:
+    """Drop shared indexes whose adapters directory is gone, then the least recently used.
+
+    Reading an index touches it, so its mtime orders the survivors; ``current`` is always
+    kept and counts towards ``ADAPTER_INDEX_LIMIT``.
+    """
+    survivors: List[Tuple[float, Path]] = []
+    for path in folder.glob("*.json"):
+        if path == current:
+            continue
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                directory = json.load(handle).get("directory")
+            used = path.stat().st_mtime
+        except (OSError, ValueError, AttributeError):
+            directory = None
+        if isinstance(directory, str) and Path(directory).is_dir():
+            survivors.append((used, path))
+            continue
+        with contextlib.suppress(OSError):
+            path.unlink()
+    survivors.sort(reverse=True)
+    for _, path in survivors[max(ADAPTER_INDEX_LIMIT - 1, 0) :]:
+        with contextlib.suppress(OSError):
+            path.unlink()
+
+
+def _parse_manifest(manifest_file: Path, payload: Any) -> AdapterManifest:
+    if not isinstance(payload, dict):
+        raise ValidationError(f"{manifest_file}: adapter manifest must be mapping")
+    name = payload.get("name")
+    path = payload.get("path")
+    if not name or not path:
+        raise ValidationError(f"{manifest_file}: adapter 'name' and 'path' required")
+    params_spec = payload.get("parameters", {})
+    parameters: Dict[str, AdapterParameter] = {}
+    if params_spec:
+        if not isinstance(params_spec, dict):
+            raise ValidationError(f"{manifest_file}: parameters must be mapping")
+        for param_name, spec in params_spec.items():
+            if not isinstance(spec, dict):
+                raise ValidationError(
+                    f"{manifest_file}: parameter '{param_name}' spec must be mapping"
+                )
+            parameters[param_name] = AdapterParameter(
+                type=str(spec.get("type", "string")),
+                allowed=spec.get("allowed"),
+                minimum=spec.get("min"),
+                maximum=spec.get("max"),
+            )
+    args = payload.get("args", [])
+    if args and not isinstance(args, list):
+        raise ValidationError(f"{manifest_file}: 'args' must be a list when provided")
+    return AdapterManifest(
+        name=str(name),
+        path=Path(path),
+        parameters=parameters,
+        description=payload.get("description"),
+        args=[str(item) for item in args] if args else [],
+        timeout_s=parse_timeout(payload.get("timeout_s"), f"{manifest_file}"),
+        limits=parse_limits(payload, f"{manifest_file}"),
+    )
+
+
 class AdapterRegistry:
-    def __init__(self, directory: Path) -> None:
+    """Adapter manifests, resolved lazily through a persisted index.
+
+    The index maps each manifest file to its mtime/size and parsed payload, so a warm
+    start only stats the directory; YAML is parsed again only for new or changed files, and
+    ``AdapterManifest`` objects are built for the adapters a flow actually uses. Without an
+    explicit ``index_path`` the index is shared under the cache directory, which keeps at
+    most ``ADAPTER_INDEX_LIMIT`` of them.
+    """
+
+    def __init__(self, directory: Path, index_path: Path | None = None) -> None:
         self._directory = directory
+        self._shared_index = index_path is None
+        self._index_path = index_path or _default_index_path(directory)
         self._cache: MutableMapping[str, AdapterManifest] = {}
+        self._entries: Dict[str, Dict[str, Any]] | None = None
 
     def load(self) -> None:
-        if not self._directory.exists():
-            return
-        for manifest_file in self._directory.glob("*.yaml"):
-            payload = load_yaml(manifest_file)
-            if not isinstance(payload, dict):
-                raise ValidationError(f"{manifest_file}: adapter manifest must be mapping")
-            name = payload.get("name")
-            path = payload.get("path")
-            if not name or not path:
-                raise ValidationError(f"{manifest_file}: adapter 'name' and 'path' required")
-            params_spec = payload.get("parameters", {})
-            parameters: Dict[str, AdapterParameter] = {}
-            if params_spec:
-                if not isinstance(params_spec, dict):
-                    raise ValidationError(f"{manifest_file}: parameters must be mapping")
-                for param_name, spec in params_spec.items():
-                    if not isinstance(spec, dict):
-                        raise ValidationError(
-                            f"{manifest_file}: parameter '{param_name}' spec must be mapping"
-                        )
-                    parameters[param_name] = AdapterParameter(
-                        type=str(spec.get("type", "string")),
-                        allowed=spec.get("allowed"),
-                        minimum=spec.get("min"),
-                        maximum=spec.get("max"),
-                    )
-            args = payload.get("args", [])
-            if args and not isinstance(args, list):
-                raise ValidationError(f"{manifest_file}: 'args' must be a list when provided")
-            manifest = AdapterManifest(
-                name=str(name),
-                path=Path(path),
-                parameters=parameters,
-                description=payload.get("description"),
-                args=[str(item) for item in args] if args else [],
-            )
-            self._cache[manifest.name] = manifest
+        for file_name, entry in self._index_entries().items():
+            if entry["name"] not in self._cache:
+                manifest = _parse_manifest(self._directory / file_name, entry["payload"])
+                self._cache[manifest.name] = manifest
 
     def get(self, name: str) -> AdapterManifest:
-        if not self._cache:
-            self.load()
+        if name not in self._cache:
+            for file_name, entry in self._index_entries().items():
+                if entry["name"] == name:
+                    manifest = _parse_manifest(self._directory / file_name, entry["payload"])
+                    self._cache[manifest.name] = manifest
+                    break
         if name not in self._cache:
             raise ValidationError(f"unknown adapter '{name}'")
         return self._cache[name]
 
+    def _index_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        previous = self._read_index()
+        entries: Dict[str, Dict[str, Any]] = {}
+        changed = False
+        if self._directory.exists():
+            for manifest_file in sorted(self._directory.glob("*.yaml")):
+                stat = manifest_file.stat()
+                cached = previous.get(manifest_file.name)
+                if (
+                    cached is not None
+                    and cached.get("mtime_ns") == stat.st_mtime_ns
+                    and cached.get("size") == stat.st_size
+                ):
+                    entries[manifest_file.name] = cached
+                    continue
+                payload = load_yaml(manifest_file)
+                manifest = _parse_manifest(manifest_file, payload)
+                entries[manifest_file.name] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "name": manifest.name,
+                    "payload": payload,
+                }
+                changed = True
+        if changed or set(entries) != set(previous):
+            self._write_index(entries)
+        self._entries = entries
+        return entries
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with self._index_path.open("r", encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != ADAPTER_INDEX_VERSION:
+            return {}
+        if self._shared_index:
+            # Marks the index as recently used for _prune_indexes.
+            with contextlib.suppress(OSError):
+                os.utime(self._index_path)
+        files = index.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        index = {
+            "version": ADAPTER_INDEX_VERSION,
+            "directory": self._directory.resolve().as_posix(),
+            "files": entries,
+        }
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self._index_path.with_name(f".{self._index_path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(index), encoding="utf-8")
+            os.replace(temporary, self._index_path)
+        except (OSError, TypeError, ValueError):
+            # The index is only an accelerator; an unwritable cache or a manifest that does
+            # not round-trip through JSON just means parsing again next time.
+            return
+        if self._shared_index:
+            _prune_indexes(self._index_path.parent, self._index_path)
+
+
+@dataclass(slots=True)
+class AdapterResult:
+    name: str
+    command: List[str]
+    returncode: int
+    duration_s: float
+    timed_out: bool = False
+    cached: bool = False
+    # Uncompressed output sizes; ``None`` when unknown (e.g. replayed from an older cache).
+    stdout_bytes: int | None = None
+    stderr_bytes: int | None = None
+    # Only collected for processes reaped by AdapterExecutor; cached replays have none.
+    resources: ResourceUsage | None = None
+    placement: Placement | None = None
+
+
+def _resolve_command(
+    manifest: AdapterManifest, name: str, parameters: Mapping[str, Any]
+) -> List[str]:
+    command = manifest.build_command(parameters)
+    executable = shutil.which(command[0]) if manifest.path.is_absolute() else command[0]
+    if manifest.path.is_absolute() and not manifest.path.exists():
+        raise AdapterExecutionError(f"adapter '{name}' path '{manifest.path}' not found")
+    if manifest.path.is_absolute():
+        command[0] = str(manifest.path)
+    elif executable:
+        command[0] = executable
+    else:
+        raise AdapterExecutionError(f"adapter '{name}' executable '{command[0]}' not found")
+    return command
+
 
-class AdapterExecutor:
-    def __init__(self, registry: AdapterRegistry) -> None:
+def _signal_group(pid: int, signum: int) -> None:
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signum)
+
+
+class _Watchdog:
+    """Kills a child's whole process group once its deadline passes.
+
+    Escalates from SIGTERM to SIGKILL after ``grace_s`` if the group has not exited. The
+    child must be started in its own session so its pid is also its process group id.
+    """
+
+    def __init__(self, pid: int, timeout_s: float, grace_s: float) -> None:
+        self._pid = pid
+        self._timeout_s = timeout_s
+        self._grace_s = grace_s
+        self._done = threading.Event()
+        self.fired = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name=f"rr-watchdog-{pid}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._done.set()
+        self._thread.join()
+        if self.fired.is_set():
+            # The group leader is gone; make sure none of its descendants linger.
+            _signal_group(self._pid, signal.SIGKILL)
+
+    def _watch(self) -> None:
+        if self._done.wait(self._timeout_s):
+            return
+        self.fired.set()
+        _signal_group(self._pid, signal.SIGTERM)
+        if self._done.wait(self._grace_s):
+            return
+        _signal_group(self._pid, signal.SIGKILL)
+
+
+class _Pump:
+    """Copies a child's pipe into a (compressing) sink on a thread, counting raw bytes."""
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, source: IO[bytes], sink: BinaryIO, name: str) -> None:
+        self._source = source
+        self._sink = sink
+        self.raw_bytes = 0
+        self._thread = threading.Thread(target=self._copy, name=name, daemon=True)
+        self._thread.start()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _copy(self) -> None:
+        with self._source:
+            while chunk := self._source.read1(self.CHUNK_SIZE):  # type: ignore[attr-defined]
+                self._sink.write(chunk)
+                self.raw_bytes += len(chunk)
+
+
+def _check_result(result: AdapterResult, timeout_s: float | None = None) -> AdapterResult:
+    if result.timed_out:
+        raise AdapterTimeoutError(
+            f"adapter '{result.name}' timed out after {timeout_s}s", result=result
+        )
+    if result.returncode != 0:
+        raise AdapterExecutionError(
+            f"adapter '{result.name}' failed with exit code {result.returncode}", result=result
+        )
+    return result
+
+
+KILL_GRACE_S = 5.0
+
+
+@dataclass(slots=True)
+class _Invocation:
+    """An adapter call resolved against its manifest, ready to be launched or replayed."""
+
+    name: str
+    command: List[str]
+    timeout_s: float | None
+    limits: ResourceLimits
+    cpus: Tuple[int, ...] | None
+    cache_key: str | None
+
+
+class _ExecutorBase:
+    """Launch logic shared by the blocking and the asyncio executor.
+
+    Command resolution, result cache lookups and stores, CPU affinity, transient cgroups and
+    rusage collection all live here, so both executors record the same thing for the same
+    invocation; they differ only in how they wait for the child and move its output.
+    """
+
+    def __init__(
+        self,
+        registry: AdapterRegistry,
+        kill_grace_s: float = KILL_GRACE_S,
+        cache: ResultCache | None = None,
+    ) -> None:
         self._registry = registry
+        self._kill_grace_s = kill_grace_s
+        self._cache = cache
 
-    def run(
+    def _prepare(
         self,
         name: str,
         parameters: Mapping[str, Any],
         stdout_path: Path,
         stderr_path: Path,
-        env: Mapping[str, str] | None = None,
-    ) -> subprocess.CompletedProcess[str]:
+        env: Mapping[str, str] | None,
+        timeout_s: float | None,
+        compression: str,
+        limits: ResourceLimits | None,
+    ) -> _Invocation:
         manifest = self._registry.get(name)
-        command = manifest.build_command(parameters)
-        executable = shutil.which(command[0]) if manifest.path.is_absolute() else command[0]
-        if manifest.path.is_absolute() and not manifest.path.exists():
-            raise AdapterExecutionError(f"adapter '{name}' path '{manifest.path}' not found")
-        if manifest.path.is_absolute():
-            command[0] = str(manifest.path)
-        elif executable:
-            command[0] = executable
-        else:
-            raise AdapterExecutionError(f"adapter '{name}' executable '{command[0]}' not found")
-
+        command = _resolve_command(manifest, name, parameters)
+        limits = manifest.limits.merged(limits)
+        cpus = resolve_cpus(limits)
         stdout_path.parent.mkdir(parents=True, exist_ok=True)
         stderr_path.parent.mkdir(parents=True, exist_ok=True)
-        with stdout_path.open("w", encoding="utf-8") as stdout, stderr_path.open(
-            "w", encoding="utf-8"
-        ) as stderr:
-            result = subprocess.run(
-                command,
-                text=True,
-                stdout=stdout,
-                stderr=stderr,
-                check=False,
-                env=dict(env) if env else None,
+        cache = self._cache
+        return _Invocation(
+            name,
+            command,
+            timeout_s if timeout_s is not None else manifest.timeout_s,
+            limits,
+            cpus,
+            cache.key(command, env or {}, compression) if cache is not None else None,
+        )
+
+    def _replay(
+        self, invocation: _Invocation, stdout_path: Path, stderr_path: Path
+    ) -> AdapterResult | None:
+        if self._cache is None or invocation.cache_key is None:
+            return None
+        cached = self._cache.get(invocation.cache_key)
+        if cached is None:
+            return None
+        shutil.copyfile(cached.stdout_path, stdout_path)
+        shutil.copyfile(cached.stderr_path, stderr_path)
+        stdout_bytes, stderr_bytes = cached.output_bytes
+        return _check_result(
+            AdapterResult(
+                invocation.name,
+                invocation.command,
+                cached.returncode,
+                0.0,
+                cached=True,
+                stdout_bytes=stdout_bytes,
+                stderr_bytes=stderr_bytes,
             )
-        if result.returncode != 0:
-            raise AdapterExecutionError(
-                f"adapter '{name}' failed with exit code {result.returncode}"
+        )
+
+    def _spawn(
+        self,
+        invocation: _Invocation,
+        stdout: int | IO[bytes],
+        stderr: int | IO[bytes],
+        env: Mapping[str, str] | None,
+    ) -> Tuple[subprocess.Popen[bytes], TransientCgroup | None, Placement | None]:
+        """Start the child in its own session, pinned and placed in a cgroup per its limits."""
+        limits = invocation.limits
+        cgroup = TransientCgroup.create(limits, invocation.cpus) if not limits.empty else None
+        try:
+            with thread_affinity(invocation.cpus) as pinned:
+                process = subprocess.Popen(
+                    invocation.command,
+                    stdout=stdout,
+                    stderr=stderr,
+                    env=dict(env) if env else None,
+                    start_new_session=True,
+                )
+        except BaseException:
+            if cgroup is not None:
+                cgroup.remove()
+            raise
+        if cgroup is not None and not cgroup.add(process.pid):
+            cgroup.remove()
+            cgroup = None
+        placement = None
+        if not limits.empty:
+            placement = Placement(
+                cpus=invocation.cpus,
+                numa_node=limits.numa_node,
+                memory_max=limits.memory_max,
+                affinity=pinned,
+                cgroup=cgroup.path.as_posix() if cgroup is not None else None,
+                cgroup_controllers=tuple(cgroup.enforced) if cgroup is not None else (),
             )
-        return result
+        return process, cgroup, placement
+
+    def _finish(
+        self,
+        invocation: _Invocation,
+        result: AdapterResult,
+        stdout_path: Path,
+        stderr_path: Path,
+    ) -> AdapterResult:
+        if self._cache is not None and invocation.cache_key is not None and not result.timed_out:
+            self._cache.put(
+                invocation.cache_key,
+                result.returncode,
+                stdout_path,
+                stderr_path,
+                output_bytes=(result.stdout_bytes, result.stderr_bytes),
+            )
+        return _check_result(result, invocation.timeout_s)
+
+
+class AdapterExecutor(_ExecutorBase):
+    def run(
+        self,
+        name: str,
+        parameters: Mapping[str, Any],
+        stdout_path: Path,
+        stderr_path: Path,
+        env: Mapping[str, str] | None = None,
+        timeout_s: float | None = None,
+        compression: str = "none",
+        limits: ResourceLimits | None = None,
+    ) -> AdapterResult:
+        """Run an adapter, writing its output to the given paths compressed as requested.
+
+        ``limits`` (merged over the manifest's own) pin the child to CPUs with
+        ``sched_setaffinity`` and, where a delegated cgroup v2 tree is writable, place it in
+        a transient cgroup enforcing ``memory_max`` and the cpuset. Without cgroup v2 the
+        affinity still applies and the memory cap is skipped; ``result.placement`` records
+        what was enforced.
+        """
+        invocation = self._prepare(
+            name, parameters, stdout_path, stderr_path, env, timeout_s, compression, limits
+        )
+        cached = self._replay(invocation, stdout_path, stderr_path)
+        if cached is not None:
+            return cached
+        # Uncompressed logs are written by the child straight into the files; compressed
+        # ones go through pipes and a pump thread per stream.
+        piped = compression != "none"
+        start = time.monotonic()
+        with (
+            open_log_writer(stdout_path, compression) as stdout,
+            open_log_writer(stderr_path, compression) as stderr,
+        ):
+            process, cgroup, placement = self._spawn(
+                invocation,
+                subprocess.PIPE if piped else stdout,
+                subprocess.PIPE if piped else stderr,
+                env,
+            )
+            pumps: List[_Pump] = []
+            if piped:
+                assert process.stdout is not None and process.stderr is not None
+                pumps = [
+                    _Pump(process.stdout, stdout, f"rr-pump-{process.pid}-out"),
+                    _Pump(process.stderr, stderr, f"rr-pump-{process.pid}-err"),
+                ]
+            watchdog = None
+            if invocation.timeout_s is not None:
+                watchdog = _Watchdog(process.pid, invocation.timeout_s, self._kill_grace_s)
+                watchdog.start()
+            try:
+                returncode, usage = wait_with_usage(process)
+                for pump in pumps:
+                    pump.join()
+                if cgroup is not None:
+                    usage = cgroup.usage(usage)
+            finally:
+                if watchdog is not None:
+                    watchdog.stop()
+                if cgroup is not None:
+                    cgroup.remove()
+        if piped:
+            stdout_bytes, stderr_bytes = (pump.raw_bytes for pump in pumps)
+        else:
+            stdout_bytes, stderr_bytes = stdout_path.stat().st_size, stderr_path.stat().st_size
+        result = AdapterResult(
+            name,
+            invocation.command,
+            returncode,
+            time.monotonic() - start,
+            timed_out=watchdog is not None and watchdog.fired.is_set(),
+            stdout_bytes=stdout_bytes,
+            stderr_bytes=stderr_bytes,
+            resources=usage,
+            placement=placement,
+        )
+        return self._finish(invocation, result, stdout_path, stderr_path)
+
+
+# Called with (tag, stream, chunk) where stream is "stdout" or "stderr".
+OutputSubscriber = Callable[[str, str, bytes], None]
+
+
+@dataclass(slots=True)
+class AdapterRequest:
+    name: str
+    parameters: Mapping[str, Any]
+    stdout_path: Path
+    stderr_path: Path
+    env: Mapping[str, str] | None = None
+    timeout_s: float | None = None
+    tag: str | None = None
+    compression: str = "none"
+    limits: ResourceLimits | None = None
+
+
+class AsyncAdapterExecutor(_ExecutorBase):
+    """Runs adapters from an event loop so one loop can drive many of them at once.
+
+    Output is streamed chunk by chunk to the log files and to every subscriber while the
+    process runs. A per-call ``timeout_s`` and task cancellation both kill the process
+    group. Children are launched and reaped exactly as :class:`AdapterExecutor` does, so
+    cached results, limits and resource usage behave the same on both paths.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        registry: AdapterRegistry,
+        kill_grace_s: float = KILL_GRACE_S,
+        cache: ResultCache | None = None,
+    ) -> None:
+        super().__init__(registry, kill_grace_s, cache)
+        self._subscribers: List[OutputSubscriber] = []
+
+    def subscribe(self, subscriber: OutputSubscriber) -> Callable[[], None]:
+        self._subscribers.append(subscriber)
+        return lambda: self._subscribers.remove(subscriber)
+
+    async def run(
+        self,
+        name: str,
+        parameters: Mapping[str, Any],
+        stdout_path: Path,
+        stderr_path: Path,
+        env: Mapping[str, str] | None = None,
+        timeout_s: float | None = None,
+        tag: str | None = None,
+        compression: str = "none",
+        limits: ResourceLimits | None = None,
+    ) -> AdapterResult:
+        invocation = self._prepare(
+            name, parameters, stdout_path, stderr_path, env, timeout_s, compression, limits
+        )
+        cached = await asyncio.to_thread(self._replay, invocation, stdout_path, stderr_path)
+        if cached is not None:
+            return cached
+        label = tag or name
+        start = time.monotonic()
+        timed_out = False
+        raw_bytes = {"stdout": 0, "stderr": 0}
+        with (
+            open_log_writer(stdout_path, compression) as stdout,
+            open_log_writer(stderr_path, compression) as stderr,
+        ):
+            # Popen itself is synchronous, so the thread affinity set around it never leaks
+            # into other tasks on this loop.
+            process, cgroup, placement = self._spawn(
+                invocation, subprocess.PIPE, subprocess.PIPE, env
+            )
+            assert process.stdout is not None and process.stderr is not None
+            try:
+                streams = asyncio.gather(
+                    self._pump(process.stdout, stdout, label, "stdout", raw_bytes),
+                    self._pump(process.stderr, stderr, label, "stderr", raw_bytes),
+                    wait_with_usage_async(process),
+                )
+                try:
+                    _, _, (returncode, usage) = await asyncio.wait_for(
+                        streams, invocation.timeout_s
+                    )
+                except TimeoutError:
+                    timed_out = True
+                    returncode, usage = await self._terminate(process)
+                except asyncio.CancelledError:
+                    await self._terminate(process)
+                    raise
+                if cgroup is not None:
+                    usage = cgroup.usage(usage)
+            finally:
+                if cgroup is not None:
+                    cgroup.remove()
+        result = AdapterResult(
+            name,
+            invocation.command,
+            returncode,
+            time.monotonic() - start,
+            timed_out=timed_out,
+            stdout_bytes=raw_bytes["stdout"],
+            stderr_bytes=raw_bytes["stderr"],
+            resources=usage,
+            placement=placement,
+        )
+        return self._finish(invocation, result, stdout_path, stderr_path)
+
+    async def run_all(
+        self, requests: Iterable[AdapterRequest], max_concurrency: int | None = None
+    ) -> List[AdapterResult | BaseException]:
+        """Run requests concurrently, returning results (or raised errors) in request order."""
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def _run(request: AdapterRequest) -> AdapterResult:
+            if semaphore is None:
+                return await self._run_request(request)
+            async with semaphore:
+                return await self._run_request(request)
+
+        return await asyncio.gather(
+            *(_run(request) for request in requests), return_exceptions=True
+        )
+
+    async def _run_request(self, request: AdapterRequest) -> AdapterResult:
+        return await self.run(
+            request.name,
+            request.parameters,
+            request.stdout_path,
+            request.stderr_path,
+            env=request.env,
+            timeout_s=request.timeout_s,
+            tag=request.tag,
+            compression=request.compression,
+            limits=request.limits,
+        )
+
+    async def _pump(
+        self,
+        pipe: IO[bytes],
+        sink: BinaryIO,
+        tag: str,
+        stream: str,
+        raw_bytes: MutableMapping[str, int],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(loop=loop)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe
+        )
+        # Plain logs are flushed per chunk so they can be tailed live; compressed streams are
+        # left to fill whole blocks, since flushing them mid-stream costs compression ratio.
+        flush = isinstance(sink, io.BufferedWriter)
+        try:
+            while chunk := await reader.read(self.CHUNK_SIZE):
+                sink.write(chunk)
+                raw_bytes[stream] += len(chunk)
+                if flush:
+                    sink.flush()
+                for subscriber in list(self._subscribers):
+                    subscriber(tag, stream, chunk)
+        finally:
+            transport.close()
+
+    async def _terminate(
+        self, process: subprocess.Popen[bytes]
+    ) -> Tuple[int, ResourceUsage | None]:
+        # Same escalation as the blocking watchdog: SIGTERM the group, then SIGKILL whatever
+        # is left of it once the leader exits or the grace period runs out.
+        _signal_group(process.pid, signal.SIGTERM)
+        exited = asyncio.ensure_future(wait_with_usage_async(process))
+        await asyncio.wait({exited}, timeout=self._kill_grace_s)
+        _signal_group(process.pid, signal.SIGKILL)
+        return await exited
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import gzip
+import io
 import json
+import mmap
+import os
 import re
+import struct
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from types import TracebackType
+from typing import IO, Any, BinaryIO, Dict, Iterator, List, Mapping, Sequence, Tuple, overload
 
-from .utils import dump_json
+from .exceptions import MissingDependencyError, ValidationError
+from .utils import dump_json, read_json
 
 
 def timestamp_now() -> str:
@@ -33,10 +42,22 @@ class RunPaths:
     def plan_path(self) -> Path:
         return self.parent_dir / "plan.json"
 
+    @property
+    def plan_header_path(self) -> Path:
+        return self.parent_dir / "plan_header.json"
+
     @property
     def summary_path(self) -> Path:
         return self.parent_dir / "summary.json"
 
+    @property
+    def subrun_journal_path(self) -> Path:
+        return self.parent_dir / "subruns.ldjson"
+
+    @property
+    def subrun_index_path(self) -> Path:
+        return self.parent_dir / "subruns.idx"
+
     @property
     def sysinfo_path(self) -> Path:
         return self.parent_dir / "sysinfo.json"
@@ -53,6 +74,13 @@ class RunPaths:
     def html_report_path(self) -> Path:
         return self.parent_dir / "report.html"
 
+    @property
+    def report_pages_dir(self) -> Path:
+        return self.parent_dir / "report_pages"
+
+    def report_page(self, number: int) -> Path:
+        return self.report_pages_dir / f"page-{number:04d}.html"
+
     def subrun_dir(self, subrun_id: str) -> Path:
         return self.parent_dir / "subruns" / subrun_id
 
@@ -74,17 +102,457 @@ class RunPaths:
             suffix += f"_{invocation:02d}"
         return self.subrun_dir(subrun_id) / "stderr" / f"{suffix}.log"
 
+    def step_telemetry(self, subrun_id: str, step_name: str, index: int, invocation: int) -> Path:
+        suffix = f"{index:02d}_{sanitize(step_name)}"
+        if invocation:
+            suffix += f"_{invocation:02d}"
+        return self.subrun_dir(subrun_id) / "telemetry" / f"{suffix}.ldjson"
+
+
+def load_plan_header(run_paths: RunPaths) -> Dict[str, Any]:
+    """Return a run's plan without its per-sub-run list.
+
+    Reads ``plan_header.json``, which every run writes; the full ``plan.json`` listing each
+    planned sub-run is only written on request. Runs recorded before the header existed
+    fall back to the full plan.
+    """
+    if run_paths.plan_header_path.exists():
+        header: Dict[str, Any] = read_json(run_paths.plan_header_path)
+        return header
+    plan: Dict[str, Any] = read_json(run_paths.plan_path)
+    subruns = plan.pop("subruns", [])
+    plan.setdefault("subrun_count", len(subruns))
+    return plan
+
+
+@dataclass(slots=True)
+class FlushPolicy:
+    """Controls when buffered LDJSON records reach the OS and stable storage.
+
+    Records are flushed once ``every_records`` are pending, or at most ``interval_s`` seconds
+    after the first of them was buffered, whichever comes first. The interval is enforced by a
+    timer thread, so a step that hangs after logging its ``start`` record still gets that record
+    written out. With ``fsync`` enabled each flush is followed by ``os.fsync`` so flushed records
+    survive a host crash or power loss.
+    """
+
+    every_records: int = 1
+    interval_s: float | None = None
+    fsync: bool = False
+
 
 class LDJSONLogger:
-    def __init__(self, path: Path) -> None:
+    """Append-only newline-delimited JSON log that keeps its file handle open.
+
+    Crash-safety guarantees, from weakest to strongest:
+
+    * Records still buffered by the flush policy are lost if the process dies.
+    * Flushed records survive a process crash; without ``fsync`` they can still be lost
+      if the host resets (e.g. a power-margin crash) before the kernel writes them back.
+    * With ``fsync`` enabled, every flushed record is on stable storage.
+
+    Each flush writes whole lines, so a crash can leave at most one truncated trailing line,
+    which ``read_ldjson`` ignores. ``close`` (and leaving the context manager) always
+    flushes and fsyncs whatever is pending.
+    """
+
+    def __init__(self, path: Path, policy: FlushPolicy | None = None) -> None:
         self._path = path
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._policy = policy or FlushPolicy()
+        self._handle: IO[str] | None = None
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+        # Steps of one sub-run may run on several threads and share the logger.
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __enter__(self) -> "LDJSONLogger":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def open(self) -> None:
+        with self._lock:
+            if self._handle is None:
+                self._handle = self._path.open("a", encoding="utf-8")
+                self._last_flush = time.monotonic()
 
     def append(self, record: Dict[str, Any]) -> None:
-        with self._path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(record))
-            handle.write("\n")
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.open()
+            self._pending.append(line)
+            policy = self._policy
+            if len(self._pending) >= max(policy.every_records, 1) or (
+                policy.interval_s is not None
+                and time.monotonic() - self._last_flush >= policy.interval_s
+            ):
+                self.flush()
+            elif policy.interval_s is not None and self._timer is None:
+                delay = max(policy.interval_s - (time.monotonic() - self._last_flush), 0.0)
+                self._timer = threading.Timer(delay, self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._pending:
+                self.flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self, fsync: bool | None = None) -> None:
+        with self._lock:
+            self._cancel_timer()
+            if self._handle is None:
+                return
+            if self._pending:
+                self._handle.write("".join(self._pending))
+                self._pending.clear()
+            self._handle.flush()
+            if self._policy.fsync if fsync is None else fsync:
+                os.fsync(self._handle.fileno())
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            try:
+                self.flush(fsync=True)
+            finally:
+                self._handle.close()
+                self._handle = None
+
+
+LOG_COMPRESSIONS = ("none", "gzip", "zstd")
+_LOG_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ModuleNotFoundError as exc:
+        raise MissingDependencyError(
+            "zstd log compression requires zstandard; install with 'pip install road_runner[zstd]'"
+        ) from exc
+    return zstandard
+
+
+def check_log_compression(compression: str) -> str:
+    if compression not in LOG_COMPRESSIONS:
+        raise ValidationError(
+            f"unknown log compression '{compression}' "
+            f"(expected one of {', '.join(LOG_COMPRESSIONS)})"
+        )
+    if compression == "zstd":
+        _zstandard()
+    return compression
+
+
+def compressed_log_path(path: Path, compression: str) -> Path:
+    """Return ``path`` with the file suffix used for ``compression`` appended."""
+    return path.with_name(path.name + _LOG_SUFFIXES[compression])
+
+
+def open_log_writer(path: Path, compression: str) -> BinaryIO:
+    """Open a binary sink that compresses everything written to it on the fly."""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)  # type: ignore[return-value]
+    if compression == "zstd":
+        compressor = _zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+        return compressor.stream_writer(path.open("wb"))  # type: ignore[no-any-return]
+    return path.open("wb")
+
+
+def open_log(path: Path) -> BinaryIO:
+    """Open a step log for reading, decompressing according to its suffix."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if path.suffix == ".zst":
+        reader = _zstandard().ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+        return io.BufferedReader(reader)
+    return path.open("rb")
+
+
+def read_log_text(path: Path) -> str:
+    with open_log(path) as handle:
+        return handle.read().decode("utf-8", errors="replace")
+
+
+def read_ldjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield records from an LDJSON file, skipping a truncated final line left by a crash."""
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            if not line.endswith("\n"):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+                return
+            yield json.loads(line)
 
 
 def write_summary(path: Path, payload: Dict[str, Any]) -> None:
-    dump_json(payload, path)
+    """Write a summary atomically so readers never observe a half-written file."""
+    temporary = path.with_name(f".{path.name}.tmp")
+    dump_json(payload, temporary)
+    with temporary.open("rb") as handle:
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def subrun_rollup(sub_summary: Mapping[str, Any], run_paths: RunPaths) -> Dict[str, Any]:
+    """Compact parent-summary entry for a sub-run; step details stay in its own summary."""
+    step_status_counts: Dict[str, int] = {}
+    steps = sub_summary.get("steps", [])
+    for step in steps:
+        status = step.get("status", "UNKNOWN")
+        step_status_counts[status] = step_status_counts.get(status, 0) + 1
+    subrun_id = sub_summary["run_id"]
+    return {
+        "run_id": subrun_id,
+        "margin": sub_summary.get("margin", {}),
+        "status": sub_summary.get("status"),
+        "started_at": sub_summary.get("started_at"),
+        "completed_at": sub_summary.get("completed_at"),
+        "duration_s": sub_summary.get("duration_s"),
+        "step_count": len(steps),
+        "step_status_counts": step_status_counts,
+        "log_bytes": sub_summary.get("log_bytes", {}),
+        "summary": run_paths.subrun_summary(subrun_id).relative_to(run_paths.parent_dir).as_posix(),
+    }
+
+
+# One record per journal line: byte offset and length of the line (without newline).
+SUBRUN_INDEX_RECORD = struct.Struct("<QI")
+
+
+def write_subrun_index(run_paths: RunPaths) -> int:
+    """Write ``subruns.idx`` for the sub-run journal and return the number of entries."""
+    records = bytearray()
+    count = 0
+    offset = 0
+    with run_paths.subrun_journal_path.open("rb") as handle:
+        for line in handle:
+            if line.endswith(b"\n") and line.strip():
+                records += SUBRUN_INDEX_RECORD.pack(offset, len(line) - 1)
+                count += 1
+            offset += len(line)
+    temporary = run_paths.subrun_index_path.with_name(f".{run_paths.subrun_index_path.name}.tmp")
+    temporary.write_bytes(records)
+    os.replace(temporary, run_paths.subrun_index_path)
+    return count
+
+
+def _map_file(path: Path) -> mmap.mmap | None:
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SubRunRollups(Sequence[Dict[str, Any]]):
+    """Random access to the sub-run rollups of a run without parsing the whole journal.
+
+    The journal and its fixed-width ``subruns.idx`` index are memory-mapped, so looking up
+    rollup ``i`` reads one index record and decodes one journal line. When the index is
+    missing or stale (a run still executing or killed) line offsets are found by scanning
+    the mapped journal; runs without a journal fall back to the rollups in ``summary.json``.
+    ``close`` (and leaving the context manager) unmaps both files.
+    """
+
+    def __init__(self, run_paths: RunPaths) -> None:
+        self._journal: mmap.mmap | None = None
+        self._index: mmap.mmap | None = None
+        self._offsets: List[Tuple[int, int]] = []
+        self._fallback: List[Dict[str, Any]] | None = None
+        journal_path = run_paths.subrun_journal_path
+        if not journal_path.exists():
+            summary = read_json(run_paths.summary_path) if run_paths.summary_path.exists() else {}
+            self._fallback = list(summary.get("subruns", []))
+            return
+        self._journal = _map_file(journal_path)
+        if self._journal is None:
+            return
+        index_path = run_paths.subrun_index_path
+        index = _map_file(index_path) if index_path.exists() else None
+        if index is not None and len(index) % SUBRUN_INDEX_RECORD.size == 0:
+            # The index is current if its last entry ends on the journal's last newline.
+            last = len(index) - SUBRUN_INDEX_RECORD.size
+            end = sum(SUBRUN_INDEX_RECORD.unpack_from(index, last))
+            if end < len(self._journal) and self._journal.find(b"\n", end + 1) == -1:
+                self._index = index
+                return
+        if index is not None:
+            index.close()
+        self._offsets = _scan_lines(self._journal)
+
+    def __enter__(self) -> "SubRunRollups":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for mapped in (self._index, self._journal):
+            if mapped is not None:
+                mapped.close()
+        self._index = None
+        self._journal = None
+        self._offsets = []
+
+    def __len__(self) -> int:
+        if self._fallback is not None:
+            return len(self._fallback)
+        if self._index is not None:
+            return len(self._index) // SUBRUN_INDEX_RECORD.size
+        return len(self._offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> Dict[str, Any] | List[Dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        if self._fallback is not None:
+            return self._fallback[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length or self._journal is None:
+            raise IndexError("sub-run index out of range")
+        if self._index is not None:
+            offset, size = SUBRUN_INDEX_RECORD.unpack_from(
+                self._index, index * SUBRUN_INDEX_RECORD.size
+            )
+        else:
+            offset, size = self._offsets[index]
+        record: Dict[str, Any] = json.loads(self._journal[offset : offset + size])
+        return record
+
+
+def _scan_lines(data: mmap.mmap) -> List[Tuple[int, int]]:
+    offsets: List[Tuple[int, int]] = []
+    start = 0
+    while True:
+        end = data.find(b"\n", start)
+        if end == -1:
+            # A truncated final line left by a crash is not part of the journal.
+            return offsets
+        if end > start:
+            offsets.append((start, end - start))
+        start = end + 1
+
+
+class SubRunDetails(Sequence[Dict[str, Any]]):
+    """Full per-sub-run summaries, each read from its own file only when accessed.
+
+    Without explicit ``rollups`` the details own a :class:`SubRunRollups`, which ``close``
+    (and leaving the context manager) releases; rollups passed in are left to the caller.
+    """
+
+    def __init__(
+        self, run_paths: RunPaths, rollups: Sequence[Dict[str, Any]] | None = None
+    ) -> None:
+        self._run_paths = run_paths
+        self._owned: SubRunRollups | None = None
+        if rollups is None:
+            rollups = self._owned = SubRunRollups(run_paths)
+        self._rollups = rollups
+
+    @property
+    def rollups(self) -> Sequence[Dict[str, Any]]:
+        return self._rollups
+
+    def __enter__(self) -> "SubRunDetails":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owned is not None:
+            self._owned.close()
+
+    def __len__(self) -> int:
+        return len(self._rollups)
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> Dict[str, Any] | List[Dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        rollup = self._rollups[index]
+        summary_path = self._run_paths.subrun_summary(rollup["run_id"])
+        if not summary_path.exists():
+            return rollup
+        details: Dict[str, Any] = read_json(summary_path)
+        return details
+
+
+def iter_subrun_rollups(run_paths: RunPaths) -> Iterator[Dict[str, Any]]:
+    """Yield sub-run entries in execution order, preferring the journal over summary.json."""
+    journal_path = run_paths.subrun_journal_path
+    if journal_path.exists():
+        yield from read_ldjson(journal_path)
+        return
+    if run_paths.summary_path.exists():
+        yield from read_json(run_paths.summary_path).get("subruns", [])
+
+
+def iter_subrun_summaries(run_paths: RunPaths) -> Iterator[Dict[str, Any]]:
+    """Yield full per-sub-run summaries one file at a time."""
+    for rollup in iter_subrun_rollups(run_paths):
+        summary_path = run_paths.subrun_summary(rollup["run_id"])
+        yield read_json(summary_path) if summary_path.exists() else rollup
+
+
+def load_run_summary(run_paths: RunPaths) -> Dict[str, Any]:
+    """Read a parent summary, folding in journaled sub-runs when the run never completed.
+
+    ``summary.json`` only lists sub-runs once the run finishes; until then (or after the
+    run was killed) completed sub-runs live in the ``subruns.ldjson`` journal.
+    """
+    summary: Dict[str, Any] = read_json(run_paths.summary_path)
+    journal_path = run_paths.subrun_journal_path
+    if summary.get("state") != "complete" and journal_path.exists():
+        summary["subruns"] = list(read_ldjson(journal_path))
+    return summary
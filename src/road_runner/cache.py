@@ -0,0 +1,206 @@
+"""Content-addressed cache of adapter results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from .paths import cache_dir
+
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+DEFAULT_MAX_AGE_S = 30 * 24 * 3600.0
+
+# These identify one particular run, or a point's position in the grid, rather than what
+# the adapter is asked to do; the margin values themselves are keyed through RR_MARGIN_*.
+_RUN_SCOPED_ENV = frozenset({"RR_RUN_ID", "RR_SUB_RUN_ID", "RR_MARGIN_POINT"})
+
+# Set by the runner when it picked the seed itself. Nothing asked for that seed, so it must
+# not keep otherwise identical invocations of later runs from matching.
+SEED_GENERATED_ENV = "RR_SEED_GENERATED"
+_SEED_ENV = frozenset({"RR_GLOBAL_SEED", SEED_GENERATED_ENV})
+
+
+@dataclass(slots=True)
+class CachedResult:
+    key: str
+    returncode: int
+    stdout_path: Path
+    stderr_path: Path
+    output_bytes: Tuple[int | None, int | None] = (None, None)
+
+
+class ResultCache:
+    """Stores adapter stdout/stderr and exit status keyed by what determines them.
+
+    The key covers the resolved command line, the ``RR_*`` environment (margin values,
+    parameters, seed and unit id, minus run identifiers and a seed the runner generated) and
+    the content of the adapter's executable and argument files. Entries are evicted by age
+    and, when the cache grows past ``max_bytes``, least recently used first.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        max_age_s: float | None = DEFAULT_MAX_AGE_S,
+    ) -> None:
+        self._directory = directory or cache_dir() / "results"
+        self._max_bytes = max_bytes
+        self._max_age_s = max_age_s
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
+        self._total_bytes: int | None = None
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def key(self, command: Sequence[str], env: Mapping[str, str], compression: str = "none") -> str:
+        ignored = _RUN_SCOPED_ENV | _SEED_ENV if env.get(SEED_GENERATED_ENV) else _RUN_SCOPED_ENV
+        payload = {
+            "version": CACHE_FORMAT_VERSION,
+            # Stored logs are replayed byte for byte, so their encoding is part of the key.
+            "compression": compression,
+            "command": list(command),
+            "env": {
+                name: value
+                for name, value in sorted(env.items())
+                if name.startswith("RR_") and name not in ignored
+            },
+            "files": {item: self._file_digest(Path(item)) for item in command if _is_file(item)},
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> CachedResult | None:
+        entry = self._entry_dir(key)
+        meta_path = entry / "meta.json"
+        try:
+            with meta_path.open("r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            age = time.time() - meta["created_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if self._max_age_s is not None and age > self._max_age_s:
+            self._remove(entry)
+            return None
+        # The meta file's mtime doubles as the last-used timestamp for LRU eviction.
+        os.utime(meta_path)
+        output_bytes = meta.get("output_bytes") or (None, None)
+        return CachedResult(
+            key,
+            int(meta["returncode"]),
+            entry / "stdout",
+            entry / "stderr",
+            output_bytes=(output_bytes[0], output_bytes[1]),
+        )
+
+    def put(
+        self,
+        key: str,
+        returncode: int,
+        stdout_path: Path,
+        stderr_path: Path,
+        output_bytes: Tuple[int | None, int | None] = (None, None),
+    ) -> None:
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per call: threads of one process may store the same key concurrently.
+            staging = Path(
+                tempfile.mkdtemp(prefix=f".{entry.name}.", suffix=".tmp", dir=entry.parent)
+            )
+        except OSError:
+            return
+        try:
+            shutil.copyfile(stdout_path, staging / "stdout")
+            shutil.copyfile(stderr_path, staging / "stderr")
+            meta = {
+                "returncode": returncode,
+                "created_at": time.time(),
+                "output_bytes": list(output_bytes),
+            }
+            (staging / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+            size = _dir_size(staging)
+            os.rename(staging, entry)
+        except OSError:
+            # Another process stored the same key first, or the cache is not writable.
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        if self._total_bytes is not None:
+            self._total_bytes += size
+        if self._max_bytes is not None and (
+            self._total_bytes is None or self._total_bytes > self._max_bytes
+        ):
+            self.evict()
+
+    def evict(self) -> None:
+        now = time.time()
+        entries: List[Tuple[float, int, Path]] = []
+        total = 0
+        if self._directory.exists():
+            for bucket in os.scandir(self._directory):
+                if not bucket.is_dir():
+                    continue
+                for entry in os.scandir(bucket.path):
+                    if entry.name.startswith("."):
+                        continue
+                    path = Path(entry.path)
+                    try:
+                        last_used = (path / "meta.json").stat().st_mtime
+                    except OSError:
+                        continue
+                    if self._max_age_s is not None and now - last_used > self._max_age_s:
+                        self._remove(path)
+                        continue
+                    size = _dir_size(path)
+                    entries.append((last_used, size, path))
+                    total += size
+        if self._max_bytes is not None and total > self._max_bytes:
+            for _, size, path in sorted(entries):
+                self._remove(path)
+                total -= size
+                if total <= self._max_bytes:
+                    break
+        self._total_bytes = total
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    def _file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        memo_key = (path.as_posix(), stat.st_mtime_ns, stat.st_size)
+        digest = self._file_digests.get(memo_key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._file_digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _is_file(item: Any) -> bool:
+    try:
+        return os.path.isfile(item)
+    except (TypeError, ValueError):
+        return False
+
+
+def _dir_size(path: Path) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
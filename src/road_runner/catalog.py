@@ -0,0 +1,349 @@
+"""SQLite catalog of runs for fast cross-run lookups."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .artifacts import RunPaths, SubRunDetails, load_run_summary
+
+CATALOG_SCHEMA_VERSION = 1
+CATALOG_FILE_NAME = "catalog.sqlite"
+
+# Stays below SQLite's historical default limit on bound parameters per statement.
+_MAX_SQL_PARAMETERS = 900
+
+# Severity order used to derive a run's overall status from its sub-runs.
+_STATUS_ORDER = ("PASS", "FAIL", "TIMEOUT")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    completed_at TEXT,
+    unit TEXT,
+    flow_path TEXT,
+    margin_path TEXT,
+    seed INTEGER,
+    state TEXT,
+    dry_run INTEGER,
+    status TEXT,
+    subrun_count INTEGER,
+    pass_count INTEGER,
+    fail_count INTEGER,
+    timeout_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_unit ON runs (unit, created_at);
+CREATE INDEX IF NOT EXISTS runs_flow ON runs (flow_path, created_at);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, created_at);
+
+CREATE TABLE IF NOT EXISTS subruns (
+    subrun_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    point_id TEXT,
+    status TEXT,
+    duration_s REAL,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS subruns_run ON subruns (run_id);
+CREATE INDEX IF NOT EXISTS subruns_status ON subruns (status);
+
+CREATE TABLE IF NOT EXISTS steps (
+    subrun_id TEXT NOT NULL REFERENCES subruns (subrun_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    adapter TEXT,
+    status TEXT,
+    duration_s REAL,
+    error TEXT,
+    PRIMARY KEY (subrun_id, position)
+);
+CREATE INDEX IF NOT EXISTS steps_status ON steps (status);
+CREATE INDEX IF NOT EXISTS steps_adapter ON steps (adapter);
+
+CREATE TABLE IF NOT EXISTS margins (
+    subrun_id TEXT NOT NULL REFERENCES subruns (subrun_id) ON DELETE CASCADE,
+    target TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    value TEXT,
+    numeric REAL,
+    PRIMARY KEY (subrun_id, target, parameter)
+);
+CREATE INDEX IF NOT EXISTS margins_parameter ON margins (parameter, numeric);
+"""
+
+RUN_COLUMNS = (
+    "run_id",
+    "created_at",
+    "completed_at",
+    "unit",
+    "flow_path",
+    "margin_path",
+    "seed",
+    "state",
+    "dry_run",
+    "status",
+    "subrun_count",
+    "pass_count",
+    "fail_count",
+    "timeout_count",
+)
+
+
+def _numeric(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _run_status(summary: Mapping[str, Any], counts: Mapping[str, int]) -> str:
+    if summary.get("dry_run"):
+        return "DRY_RUN"
+    if summary.get("state", "complete") != "complete":
+        return "INCOMPLETE"
+    worst = "PASS"
+    for status, count in counts.items():
+        if not count:
+            continue
+        if status not in _STATUS_ORDER:
+            return status
+        if _STATUS_ORDER.index(status) > _STATUS_ORDER.index(worst):
+            worst = status
+    return worst
+
+
+class RunCatalog:
+    """Index of runs, sub-runs, steps and margin values stored next to the run directories.
+
+    The catalog is derived data: ``summary.json`` files remain the source of truth and
+    :meth:`rebuild` regenerates the index from them. Only the path is kept on the instance so
+    that runners holding a catalog can still be shipped to worker processes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self._path, timeout=30.0)) as connection:
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA foreign_keys = ON")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != CATALOG_SCHEMA_VERSION:
+                with connection:
+                    connection.executescript(_SCHEMA)
+                    connection.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+            with connection:
+                yield connection
+
+    def record_run(
+        self,
+        summary: Mapping[str, Any],
+        subruns: Iterable[Mapping[str, Any]] | None = None,
+    ) -> None:
+        """Insert or replace one run together with its sub-runs, steps and margin values.
+
+        ``subruns`` supplies full sub-run summaries (with steps); it defaults to the entries
+        in ``summary``, which for compacted parent summaries are step-less rollups.
+        """
+        with self.connect() as connection:
+            self._insert_run(connection, summary, subruns)
+
+    def remove_runs(self, run_ids: Sequence[str]) -> None:
+        with self.connect() as connection:
+            connection.executemany(
+                "DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id in run_ids]
+            )
+
+    def rebuild(self, runs_path: Path, workers: int = 8) -> int:
+        """Drop every entry and re-index all runs found under ``runs_path``."""
+        run_dirs = sorted(path.parent for path in runs_path.glob("rr-*/summary.json"))
+
+        def load(run_dir: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]] | None:
+            run_paths = RunPaths(parent_id=run_dir.name, base_dir=runs_path)
+            try:
+                with SubRunDetails(run_paths) as details:
+                    return load_run_summary(run_paths), list(details)
+            except (OSError, ValueError):
+                return None
+
+        indexed = 0
+        # Summaries are read concurrently since on network storage the time goes to I/O
+        # latency; inserts stay on this thread and share one transaction.
+        with ThreadPoolExecutor(max_workers=workers) as pool, self.connect() as connection:
+            connection.execute("DELETE FROM runs")
+            for loaded in pool.map(load, run_dirs):
+                if loaded is None:
+                    continue
+                self._insert_run(connection, *loaded)
+                indexed += 1
+        return indexed
+
+    def query_runs(
+        self,
+        unit: str | None = None,
+        flow: str | None = None,
+        status: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = None,
+        oldest_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return matching runs, newest first; ``flow`` matches a substring of the flow path."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if unit is not None:
+            clauses.append("unit = ?")
+            params.append(unit)
+        if flow is not None:
+            clauses.append("instr(flow_path, ?) > 0")
+            params.append(flow)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.upper())
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        sql = f"SELECT {', '.join(RUN_COLUMNS)} FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY created_at {'ASC' if oldest_first else 'DESC'}, run_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(sql, params)]
+
+    def query_subruns(
+        self,
+        run_id: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return sub-runs with their margin values flattened into ``target.parameter`` keys."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if run_id is not None:
+            clauses.append("subruns.run_id = ?")
+            params.append(run_id)
+        if status is not None:
+            clauses.append("subruns.status = ?")
+            params.append(status.upper())
+        sql = (
+            "SELECT subruns.subrun_id, subruns.run_id, runs.unit, subruns.point_id, "
+            "subruns.status, subruns.duration_s, subruns.completed_at "
+            "FROM subruns JOIN runs USING (run_id)"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY runs.created_at DESC, subruns.subrun_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.connect() as connection:
+            rows = [dict(row) for row in connection.execute(sql, params)]
+            by_id = {row["subrun_id"]: row for row in rows}
+            identifiers = list(by_id)
+            for start in range(0, len(identifiers), _MAX_SQL_PARAMETERS):
+                chunk = identifiers[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" for _ in chunk)
+                for subrun_id, target, name, value in connection.execute(
+                    "SELECT subrun_id, target, parameter, value FROM margins "
+                    f"WHERE subrun_id IN ({placeholders})",
+                    chunk,
+                ):
+                    by_id[subrun_id][f"{target}.{name}"] = json.loads(value)
+        return rows
+
+    def _insert_run(
+        self,
+        connection: sqlite3.Connection,
+        summary: Mapping[str, Any],
+        subruns: Iterable[Mapping[str, Any]] | None = None,
+    ) -> None:
+        run_id = summary["run_id"]
+        if subruns is None:
+            subruns = summary.get("subruns", [])
+        counts = {status: 0 for status in _STATUS_ORDER}
+        subrun_rows: List[Tuple[Any, ...]] = []
+        step_rows: List[Tuple[Any, ...]] = []
+        margin_rows: List[Tuple[Any, ...]] = []
+        for sub in subruns:
+            subrun_id = sub["run_id"]
+            status: str = sub.get("status") or "UNKNOWN"
+            counts[status] = counts.get(status, 0) + 1
+            margin = sub.get("margin", {})
+            subrun_rows.append(
+                (
+                    subrun_id,
+                    run_id,
+                    margin.get("point_id"),
+                    status,
+                    sub.get("duration_s"),
+                    sub.get("started_at"),
+                    sub.get("completed_at"),
+                )
+            )
+            for position, step in enumerate(sub.get("steps", [])):
+                step_rows.append(
+                    (
+                        subrun_id,
+                        position,
+                        step.get("name"),
+                        step.get("adapter"),
+                        step.get("status"),
+                        step.get("duration_s"),
+                        step.get("error"),
+                    )
+                )
+            for target, values in margin.get("values", {}).items():
+                for parameter, value in values.items():
+                    margin_rows.append(
+                        (
+                            subrun_id,
+                            target,
+                            parameter,
+                            json.dumps(value, sort_keys=True),
+                            _numeric(value),
+                        )
+                    )
+        flow = summary.get("flow") or {}
+        margin_profile = summary.get("margin") or {}
+        connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        connection.execute(
+            f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in RUN_COLUMNS)})",
+            (
+                run_id,
+                summary.get("created_at"),
+                summary.get("completed_at"),
+                summary.get("unit"),
+                flow.get("path"),
+                margin_profile.get("path"),
+                summary.get("seed"),
+                summary.get("state", "complete"),
+                int(bool(summary.get("dry_run"))),
+                _run_status(summary, counts),
+                len(subrun_rows),
+                counts["PASS"],
+                counts["FAIL"],
+                counts["TIMEOUT"],
+            ),
+        )
+        connection.executemany("INSERT INTO subruns VALUES (?, ?, ?, ?, ?, ?, ?)", subrun_rows)
+        connection.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?)", step_rows)
+        connection.executemany("INSERT INTO margins VALUES (?, ?, ?, ?, ?)", margin_rows)
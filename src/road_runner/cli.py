@@ -2,27 +2,35 @@
 
 from __future__ import annotations
 
-import json
-import shutil
-from datetime import datetime, timedelta, timezone
+import itertools
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from .artifacts import RunPaths
+from .artifacts import FlushPolicy, check_log_compression
+from .cache import ResultCache
+from .catalog import CATALOG_FILE_NAME, RunCatalog
 from .config import load_margin_profile, load_safety_policy
-from .exporter import export_csv
 from .exceptions import RoadRunnerError, ValidationError
+from .exporter import EXPORT_FORMATS, export_run
 from .models import SafetyPolicy
 from .paths import flows_dir, margins_dir, policy_file, policy_profiles_dir, runs_dir
-from .reporting import render_reports
+from .reporting import render_many, render_run_reports
+from .retention import (
+    archive_runs,
+    delete_runs,
+    list_runs,
+    measure_sizes,
+    select_runs,
+)
 from .runner import Runner
 from .safety import SafetyProfileEngine, load_policy_from_profile
 from .sysinfo import collect_sysinfo
-from .utils import read_json
+from .utils import parse_size, read_json
 
 app = typer.Typer(help="Road Runner system-level test execution engine.")
 
@@ -51,9 +59,50 @@ def run(
         None, "--margin", exists=True, dir_okay=False, resolve_path=True
     ),
     dry_run: bool = typer.Option(False, "--dry-run", help="Do not execute adapters"),
+    parallel: int = typer.Option(
+        1, "--parallel", min=1, help="Number of sub-runs to execute concurrently"
+    ),
+    backend: str = typer.Option(
+        "thread", "--backend", help="Parallel execution backend: thread or process"
+    ),
+    log_flush_every: int = typer.Option(
+        1, "--log-flush-every", min=1, help="Flush steps.ldjson after N records"
+    ),
+    log_flush_interval: Optional[float] = typer.Option(
+        None, "--log-flush-interval", help="Also flush steps.ldjson every N seconds"
+    ),
+    log_fsync: bool = typer.Option(
+        False, "--log-fsync", help="fsync steps.ldjson on every flush (survives power loss)"
+    ),
+    refresh_sysinfo: bool = typer.Option(
+        False, "--refresh-sysinfo", help="Ignore the per-boot sysinfo cache"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse results of identical adapter invocations"
+    ),
+    log_compression: str = typer.Option(
+        "none", "--log-compression", help="Compress stdout/stderr logs: none, gzip or zstd"
+    ),
+    telemetry_interval: Optional[float] = typer.Option(
+        None,
+        "--telemetry-interval",
+        help="Sample hwmon, cpufreq and CPU load every N seconds while steps run",
+    ),
+    follow: bool = typer.Option(
+        False, "--follow", help="Stream adapter output to the console while steps run"
+    ),
+    full_plan: bool = typer.Option(
+        False, "--full-plan", help="Also write every planned sub-run to plan.json"
+    ),
 ) -> None:
     """Execute a flow with optional margin profile."""
-    sysinfo_snapshot = collect_sysinfo()
+    try:
+        # Checked before sysinfo and the profile prompt, so a missing codec fails fast.
+        check_log_compression(log_compression.lower())
+    except RoadRunnerError as exc:
+        console.print(f"[red]error: {exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    sysinfo_snapshot = collect_sysinfo(refresh=refresh_sysinfo)
     safety_engine = SafetyProfileEngine(policy_profiles_dir())
     fingerprint = safety_engine.fingerprint(sysinfo_snapshot)
     cpu_label = fingerprint.cpu_model or fingerprint.architecture or "unknown CPU"
@@ -83,7 +132,17 @@ def run(
             "Falling back to policy/safety.yaml[/yellow]"
         )
 
-    runner = Runner()
+    runner = Runner(
+        log_policy=FlushPolicy(
+            every_records=log_flush_every,
+            interval_s=log_flush_interval,
+            fsync=log_fsync,
+        ),
+        result_cache=ResultCache() if cache else None,
+        async_adapters=follow,
+    )
+    if follow:
+        runner.async_executor.subscribe(_echo_output)
     try:
         plan = runner.plan(
             flow_path=flow,
@@ -96,6 +155,11 @@ def run(
             unit=unit,
             dry_run=dry_run,
             sysinfo_override=sysinfo_snapshot,
+            parallel=parallel,
+            backend=backend.lower(),
+            log_compression=log_compression.lower(),
+            telemetry_interval_s=telemetry_interval,
+            full_plan=full_plan,
         )
     except RoadRunnerError as exc:
         raise typer.Exit(f"error: {exc}") from exc
@@ -108,6 +172,11 @@ def run(
         console.print(f"  HTML: {runs_dir() / summary['run_id'] / 'report.html'}")
 
 
+def _echo_output(tag: str, stream: str, chunk: bytes) -> None:
+    for line in chunk.decode("utf-8", errors="replace").splitlines():
+        typer.echo(f"{tag} | {line}", err=stream == "stderr")
+
+
 @app.command("list-flows")
 def list_flows() -> None:
     """List available flows."""
@@ -142,18 +211,12 @@ def list_margins() -> None:
 
 def _validate_margin_against_policy(policy: SafetyPolicy, profile_path: Path) -> None:
     profile = load_margin_profile(profile_path)
-    points = profile.expand_points()
-    for point in points:
-        for target, values in point.values.items():
-            for key, value in values.items():
-                if key == "jitter":
-                    continue
-                policy.validate_value(key, value)
+    policy.validate_grid(profile.value_axes())
 
 
 @margins_app.command("validate")
 def validate_margin(
-    file: Path = typer.Option(..., "--file", exists=True, dir_okay=False, resolve_path=True)
+    file: Path = typer.Option(..., "--file", exists=True, dir_okay=False, resolve_path=True),
 ) -> None:
     policy = load_safety_policy(policy_file())
     try:
@@ -172,6 +235,7 @@ def plan(
     margin: Optional[Path] = typer.Option(
         None, "--margin", exists=True, dir_okay=False, resolve_path=True
     ),
+    limit: int = typer.Option(50, "--limit", min=1, help="Maximum sub-runs to display"),
 ) -> None:
     """Preview run plan without executing."""
     runner = Runner()
@@ -180,70 +244,242 @@ def plan(
     table.add_column("Sub-Run")
     table.add_column("Margin Point")
     table.add_column("Details")
-    for subrun in plan_obj.subruns:
-        margin_details = json.dumps(subrun.margin_point.values, indent=2)
+    for subrun in itertools.islice(plan_obj.subruns, limit):
         details_lines = []
         for step in subrun.steps:
             details_lines.append(f"{step.step.name} ({step.step.adapter}) x{len(step.invocations)}")
         table.add_row(subrun.identifier, subrun.margin_point.identifier, "\n".join(details_lines))
     console.print(table)
+    total = len(plan_obj.subruns)
+    if total > limit:
+        console.print(f"Showing {limit} of {total} sub-runs.")
+    search_axis = plan_obj.margin_profile.search_axis()
+    if search_axis is not None:
+        target_name, parameter, search = search_axis
+        console.print(
+            f"{search.strategy} search over {target_name}.{parameter}: sub-runs above are "
+            "candidates; only those chosen by PASS/FAIL outcomes execute."
+        )
 
 
 @app.command()
 def report(
-    run_id: str = typer.Option(..., "--run-id", help="Run identifier to regenerate report for")
+    run_id: Optional[str] = typer.Option(
+        None, "--run-id", help="Run identifier to regenerate report for"
+    ),
+    all_runs: bool = typer.Option(False, "--all", help="Regenerate reports for every run"),
+    jobs: int = typer.Option(
+        os.cpu_count() or 1, "--jobs", min=1, help="Worker processes used with --all"
+    ),
 ) -> None:
-    run_path = runs_dir() / run_id
-    summary_path = run_path / "summary.json"
-    if not summary_path.exists():
-        raise typer.Exit(f"summary not found for run {run_id}")
-    summary = read_json(summary_path)
-    subruns = summary.get("subruns", [])
-    run_paths = RunPaths(parent_id=run_id, base_dir=runs_dir())
-    render_reports(summary, subruns, run_paths)
-    console.print(f"[green]Regenerated reports for {run_id}[/green]")
+    if all_runs == (run_id is not None):
+        raise typer.Exit("pass exactly one of --run-id or --all")
+    if run_id is not None:
+        run_path = runs_dir() / run_id
+        if not (run_path / "summary.json").exists():
+            raise typer.Exit(f"summary not found for run {run_id}")
+        render_run_reports(run_path)
+        console.print(f"[green]Regenerated reports for {run_id}[/green]")
+        return
+    run_paths = sorted(path.parent for path in runs_dir().glob("rr-*/summary.json"))
+    failed = 0
+    for rendered_id, error in render_many(run_paths, workers=min(jobs, len(run_paths))):
+        if error is not None:
+            failed += 1
+            console.print(f"[red]{rendered_id}: {error}[/red]")
+    console.print(f"[green]Regenerated reports for {len(run_paths) - failed} runs[/green]")
+    if failed:
+        raise typer.Exit(code=1)
 
 
 @app.command()
 def export(
     run: str = typer.Option(..., "--run", help="Parent run identifier"),
-    format: str = typer.Option(..., "--format", help="Export format", case_sensitive=False),
+    format: str = typer.Option(
+        ..., "--format", help="Export format: csv or arrow", case_sensitive=False
+    ),
+    output: Optional[Path] = typer.Option(None, "--output", help="Destination file"),
 ) -> None:
-    if format.lower() != "csv":
-        raise typer.Exit("only csv export is supported")
+    format = format.lower()
+    if format not in EXPORT_FORMATS:
+        raise typer.Exit(f"unsupported export format '{format}'")
     run_path = runs_dir() / run
     if not run_path.exists():
         raise typer.Exit(f"run directory {run_path} not found")
-    destination = export_csv(run_path)
-    console.print(f"[green]Exported CSV to {destination}[/green]")
+    try:
+        destination = export_run(run_path, format, output)
+    except RoadRunnerError as exc:
+        raise typer.Exit(f"error: {exc}") from exc
+    console.print(f"[green]Exported {format.upper()} to {destination}[/green]")
 
 
 @app.command()
 def clean(
-    older_than: int = typer.Option(
-        ..., "--older-than", help="Remove runs older than N days", min=1
+    older_than: Optional[int] = typer.Option(
+        None, "--older-than", help="Remove runs older than N days", min=1
+    ),
+    keep_last: Optional[int] = typer.Option(
+        None, "--keep-last", help="Never remove the N most recent runs", min=0
+    ),
+    max_size: Optional[str] = typer.Option(
+        None, "--max-size", help="Remove oldest runs until runs/ fits, e.g. 500G"
+    ),
+    archive: Optional[Path] = typer.Option(
+        None, "--archive", dir_okay=False, help="Pack removed runs into this .tar.gz first"
+    ),
+    jobs: int = typer.Option(8, "--jobs", min=1, help="Worker threads for sizing and deletion"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only list the runs that would go"),
+) -> None:
+    """Apply a retention policy to ./runs."""
+    if older_than is None and keep_last is None and max_size is None:
+        raise typer.Exit("pass at least one of --older-than, --keep-last or --max-size")
+    try:
+        max_bytes = parse_size(max_size) if max_size is not None else None
+    except ValueError as exc:
+        raise typer.Exit(f"error: {exc}") from exc
+    catalog = RunCatalog(runs_dir() / CATALOG_FILE_NAME)
+    entries = list_runs(runs_dir(), catalog)
+    if max_bytes is not None:
+        measure_sizes(entries, workers=jobs)
+    selected = select_runs(
+        entries, older_than_days=older_than, keep_last=keep_last, max_bytes=max_bytes
     )
+    if dry_run:
+        for entry in selected:
+            console.print(entry.run_id)
+        console.print(f"Would remove {len(selected)} of {len(entries)} runs.")
+        return
+    if not selected:
+        console.print("Nothing to remove.")
+        return
+    if archive is not None:
+        try:
+            archive_runs(selected, archive)
+        except RoadRunnerError as exc:
+            console.print(f"[red]error: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
+        console.print(f"Archived {len(selected)} runs to {archive}")
+    delete_runs(selected, workers=jobs)
+    if catalog.path.exists():
+        catalog.remove_runs([entry.run_id for entry in selected])
+    freed = sum(entry.size or 0 for entry in selected)
+    suffix = f", {freed / 1024**3:.2f} GiB freed" if max_bytes is not None else ""
+    console.print(f"Removed {len(selected)} of {len(entries)} runs{suffix}.")
+
+
+@app.command()
+def resume(
+    run_id: str = typer.Option(..., "--run-id", help="Interrupted run to finish"),
+    parallel: int = typer.Option(
+        1, "--parallel", min=1, help="Number of sub-runs to execute concurrently"
+    ),
+    backend: str = typer.Option(
+        "thread", "--backend", help="Parallel execution backend: thread or process"
+    ),
 ) -> None:
-    cutoff = datetime.now(tz=timezone.utc) - timedelta(days=older_than)
-    removed = 0
-    for run_dir in runs_dir().glob("rr-*"):
-        summary = run_dir / "summary.json"
-        if not summary.exists():
-            continue
-        mtime = datetime.fromtimestamp(summary.stat().st_mtime, tz=timezone.utc)
-        if mtime < cutoff:
-            shutil.rmtree(run_dir, ignore_errors=True)
-            removed += 1
-    console.print(f"Removed {removed} runs older than {older_than} days.")
+    """Re-execute only the missing or partial sub-runs of an interrupted run."""
+    runner = Runner()
+    try:
+        summary = runner.resume(run_id, parallel=parallel, backend=backend.lower())
+    except RoadRunnerError as exc:
+        raise typer.Exit(f"error: {exc}") from exc
+    console.print(f"[green]Resumed run {summary['run_id']}[/green]")
+    console.print(f"  Markdown: {runs_dir() / summary['run_id'] / 'report.md'}")
+    console.print(f"  HTML: {runs_dir() / summary['run_id'] / 'report.html'}")
+
+
+@app.command()
+def query(
+    unit: Optional[str] = typer.Option(None, "--unit", help="Only runs of this unit"),
+    flow: Optional[str] = typer.Option(None, "--flow", help="Substring of the flow path"),
+    status: Optional[str] = typer.Option(
+        None, "--status", help="PASS, FAIL, TIMEOUT, INCOMPLETE or DRY_RUN"
+    ),
+    since: Optional[str] = typer.Option(None, "--since", help="Created at or after (ISO date)"),
+    until: Optional[str] = typer.Option(None, "--until", help="Created before (ISO date)"),
+    subruns: bool = typer.Option(
+        False, "--subruns", help="List sub-runs of the matching runs with their margins"
+    ),
+    limit: int = typer.Option(50, "--limit", min=1, help="Maximum rows to display"),
+) -> None:
+    """Look up runs in the catalog without opening their summaries."""
+    catalog = RunCatalog(runs_dir() / CATALOG_FILE_NAME)
+    runs = catalog.query_runs(
+        unit=unit,
+        flow=flow,
+        status=None if subruns else status,
+        since=since,
+        until=until,
+        limit=None if subruns else limit,
+    )
+    if not subruns:
+        table = Table(title="Runs")
+        for column in ("Run", "Created", "Unit", "Flow", "Status", "Pass/Fail/Timeout"):
+            table.add_column(column)
+        for row in runs:
+            table.add_row(
+                row["run_id"],
+                row["created_at"] or "-",
+                row["unit"] or "-",
+                Path(row["flow_path"]).name if row["flow_path"] else "-",
+                row["status"],
+                f"{row['pass_count']}/{row['fail_count']}/{row['timeout_count']}",
+            )
+        console.print(table)
+        return
+    rows: List[Dict[str, Any]] = []
+    for run_row in runs:
+        remaining = limit - len(rows)
+        if remaining <= 0:
+            break
+        rows.extend(catalog.query_subruns(run_id=run_row["run_id"], status=status, limit=remaining))
+    table = Table(title="Sub-Runs")
+    for column in ("Sub-Run", "Unit", "Status", "Duration (s)", "Margins"):
+        table.add_column(column)
+    fixed = {"subrun_id", "run_id", "unit", "point_id", "status", "duration_s", "completed_at"}
+    for row in rows:
+        margins = ", ".join(
+            f"{key}={value}"
+            for key, value in row.items()
+            if key not in fixed and not isinstance(value, dict)
+        )
+        duration = row["duration_s"]
+        table.add_row(
+            row["subrun_id"],
+            row["unit"] or "-",
+            row["status"],
+            "-" if duration is None else f"{duration:.2f}",
+            margins,
+        )
+    console.print(table)
+
+
+catalog_app = typer.Typer(help="Run catalog maintenance.")
+
+
+@catalog_app.command("rebuild")
+def rebuild_catalog() -> None:
+    """Re-index every run under ./runs from its summary.json."""
+    catalog = RunCatalog(runs_dir() / CATALOG_FILE_NAME)
+    indexed = catalog.rebuild(runs_dir())
+    console.print(f"[green]Indexed {indexed} runs into {catalog.path}[/green]")
+
+
+app.add_typer(catalog_app, name="catalog")
 
 
 @app.command("rerun-last")
 def rerun_last() -> None:
-    candidates = list(runs_dir().glob("rr-*/summary.json"))
-    if not candidates:
-        raise typer.Exit("no previous runs found")
-    candidates.sort(key=lambda path: path.stat().st_mtime, reverse=True)
-    summary = read_json(candidates[0])
+    latest = RunCatalog(runs_dir() / CATALOG_FILE_NAME).query_runs(limit=1)
+    if latest and (runs_dir() / latest[0]["run_id"] / "summary.json").exists():
+        summary_path = runs_dir() / latest[0]["run_id"] / "summary.json"
+    else:
+        # Runs made before the catalog existed; `catalog rebuild` indexes them.
+        candidates = list(runs_dir().glob("rr-*/summary.json"))
+        if not candidates:
+            raise typer.Exit("no previous runs found")
+        summary_path = max(candidates, key=lambda path: path.stat().st_mtime)
+    summary = read_json(summary_path)
     flow_path = Path(summary["flow"]["path"])
     margin_path = summary["margin"]["path"]
     if not flow_path.exists():
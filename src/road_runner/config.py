@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import math
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence
 
 from .exceptions import ValidationError
-from .models import Bound, FlowDefinition, FlowStep, MarginProfile, SafetyPolicy, TargetMargins
-from .utils import load_yaml
+from .models import (
+    Bound,
+    FlowDefinition,
+    FlowStep,
+    MarginProfile,
+    MarginSearch,
+    ResourceLimits,
+    SafetyPolicy,
+    TargetMargins,
+)
+from .search import SEARCH_STRATEGIES
+from .utils import load_yaml, parse_cpu_list, parse_size
 
 
 def _require_keys(data: Dict[str, Any], keys: Sequence[str], context: str) -> None:
@@ -16,6 +27,83 @@ def _require_keys(data: Dict[str, Any], keys: Sequence[str], context: str) -> No
             raise ValidationError(f"{context}: missing required key '{key}'")
 
 
+def parse_timeout(value: Any, context: str) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValidationError(f"{context}: timeout_s must be a positive number")
+    return float(value)
+
+
+def parse_limits(payload: Dict[str, Any], context: str) -> ResourceLimits:
+    """Read the optional ``cpus``, ``numa_node`` and ``memory_max`` keys of a manifest or step."""
+    cpus_raw = payload.get("cpus")
+    cpus: tuple[int, ...] | None = None
+    if cpus_raw is not None:
+        if isinstance(cpus_raw, str):
+            try:
+                cpus = parse_cpu_list(cpus_raw)
+            except ValueError as exc:
+                raise ValidationError(f"{context}: {exc}") from exc
+        elif isinstance(cpus_raw, int) and not isinstance(cpus_raw, bool):
+            cpus = (cpus_raw,)
+        elif isinstance(cpus_raw, list) and all(
+            isinstance(cpu, int) and not isinstance(cpu, bool) for cpu in cpus_raw
+        ):
+            cpus = tuple(sorted(set(cpus_raw)))
+        else:
+            raise ValidationError(
+                f"{context}: cpus must be a CPU list string (e.g. '0-7,16') or list of integers"
+            )
+        if not cpus or cpus[0] < 0:
+            raise ValidationError(f"{context}: cpus must name at least one non-negative CPU")
+    numa_node = payload.get("numa_node")
+    if numa_node is not None and (
+        isinstance(numa_node, bool) or not isinstance(numa_node, int) or numa_node < 0
+    ):
+        raise ValidationError(f"{context}: numa_node must be a non-negative integer")
+    memory_raw = payload.get("memory_max")
+    memory_max: int | None = None
+    if memory_raw is not None:
+        try:
+            memory_max = parse_size(memory_raw) if isinstance(memory_raw, str) else int(memory_raw)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(f"{context}: memory_max must be a size such as '8G'") from exc
+        if isinstance(memory_raw, bool) or memory_max <= 0:
+            raise ValidationError(f"{context}: memory_max must be positive")
+    return ResourceLimits(cpus=cpus, numa_node=numa_node, memory_max=memory_max)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_search(value: Dict[str, Any], context: str) -> MarginSearch:
+    strategy = value.get("strategy", "binary")
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValidationError(f"{context}: strategy must be one of {', '.join(SEARCH_STRATEGIES)}")
+    if "values" in value:
+        values = value["values"]
+        if not isinstance(values, Iterable) or isinstance(values, (str, bytes)):
+            raise ValidationError(f"{context}: values must be list-like")
+        candidates = list(values)
+    else:
+        _require_keys(value, ("start", "stop", "step"), context)
+        start, stop, step = value["start"], value["stop"], value["step"]
+        if not all(_is_number(item) for item in (start, stop, step)) or step <= 0:
+            raise ValidationError(
+                f"{context}: start and stop must be numbers and step a positive number"
+            )
+        direction = 1 if stop >= start else -1
+        count = math.floor(abs(stop - start) / step + 1e-9) + 1
+        candidates = [start + direction * step * index for index in range(count)]
+        if not all(isinstance(item, int) for item in (start, stop, step)):
+            candidates = [round(item, 9) for item in candidates]
+    if not candidates:
+        raise ValidationError(f"{context}: search needs at least one candidate value")
+    return MarginSearch(strategy=strategy, values=tuple(candidates))
+
+
 def load_flow(path: Path) -> FlowDefinition:
     payload = load_yaml(path)
     if not isinstance(payload, dict):
@@ -45,16 +133,46 @@ def load_flow(path: Path) -> FlowDefinition:
                     f"{path} step[{idx}]: sweep '{sweep_key}' must be iterable of values"
                 )
             normalized_sweeps[sweep_key] = list(sweep_values)
+        depends_on = entry.get("depends_on", [])
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        if not isinstance(depends_on, list):
+            raise ValidationError(f"{path} step[{idx}]: depends_on must be a step name or list")
+        parallel_group = entry.get("parallel_group")
+        if parallel_group is not None and not isinstance(parallel_group, (str, int)):
+            raise ValidationError(f"{path} step[{idx}]: parallel_group must be a name")
+        concurrency = entry.get("concurrency", 1)
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            raise ValidationError(f"{path} step[{idx}]: concurrency must be a positive integer")
         steps.append(
             FlowStep(
                 name=str(entry["name"]),
                 adapter=str(entry["adapter"]),
                 parameters=dict(parameters),
                 sweeps=normalized_sweeps,
+                timeout_s=parse_timeout(entry.get("timeout_s"), f"{path} step[{idx}]"),
+                limits=parse_limits(entry, f"{path} step[{idx}]"),
+                depends_on=tuple(str(name) for name in depends_on),
+                parallel_group=str(parallel_group) if parallel_group is not None else None,
+                concurrency=concurrency,
             )
         )
 
-    return FlowDefinition(metadata=dict(metadata), steps=steps)
+    max_parallel_steps = payload.get("max_parallel_steps")
+    if max_parallel_steps is not None and (
+        isinstance(max_parallel_steps, bool)
+        or not isinstance(max_parallel_steps, int)
+        or max_parallel_steps < 1
+    ):
+        raise ValidationError(f"{path}: max_parallel_steps must be a positive integer")
+    definition = FlowDefinition(
+        metadata=dict(metadata), steps=steps, max_parallel_steps=max_parallel_steps
+    )
+    try:
+        definition.step_dependencies()
+    except ValidationError as exc:
+        raise ValidationError(f"{path}: {exc}") from exc
+    return definition
 
 
 def load_margin_profile(path: Path) -> MarginProfile:
@@ -73,6 +191,7 @@ def load_margin_profile(path: Path) -> MarginProfile:
             raise ValidationError(f"{path} target '{target_name}' must be mapping")
         fixed: Dict[str, Any] = {}
         sweeps: Dict[str, Sequence[Any]] = {}
+        searches: Dict[str, MarginSearch] = {}
         jitter = None
 
         for param_name, value in target_payload.items():
@@ -89,6 +208,12 @@ def load_margin_profile(path: Path) -> MarginProfile:
                             f"{path} target '{target_name}' sweep '{param_name}' must be list-like"
                         )
                     sweeps[param_name] = list(sweep_values)
+                elif "search" in value:
+                    search_payload = value["search"]
+                    context = f"{path} target '{target_name}' search '{param_name}'"
+                    if not isinstance(search_payload, dict):
+                        raise ValidationError(f"{context} must be a mapping")
+                    searches[param_name] = parse_search(search_payload, context)
                 elif "value" in value:
                     fixed[param_name] = value["value"]
                 else:
@@ -96,7 +221,15 @@ def load_margin_profile(path: Path) -> MarginProfile:
             else:
                 fixed[param_name] = value
 
-        targets[target_name] = TargetMargins(fixed=fixed, sweeps=sweeps, jitter=jitter)
+        targets[target_name] = TargetMargins(
+            fixed=fixed, sweeps=sweeps, jitter=jitter, searches=searches
+        )
+
+    searched = [name for name, target in targets.items() for _ in target.searches]
+    if len(searched) > 1:
+        raise ValidationError(f"{path}: at most one parameter may use 'search'")
+    if searched and any(target.sweeps for target in targets.values()):
+        raise ValidationError(f"{path}: 'search' cannot be combined with 'sweep' parameters")
 
     seed = payload.get("global_seed")
     if seed is not None and not isinstance(seed, int):
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 
 class RoadRunnerError(Exception):
     """Base exception for the road_runner package."""
@@ -15,5 +17,21 @@ class SafetyViolationError(ValidationError):
     """Raised when a safety policy is violated."""
 
 
+class ConfigError(ValidationError):
+    """Raised when a requested option cannot be honoured on this host."""
+
+
 class AdapterExecutionError(RoadRunnerError):
     """Raised when an adapter fails during execution."""
+
+    def __init__(self, message: str, result: Any = None) -> None:
+        super().__init__(message)
+        self.result = result
+
+
+class AdapterTimeoutError(AdapterExecutionError):
+    """Raised when an adapter exceeds its time limit and is killed."""
+
+
+class MissingDependencyError(ConfigError):
+    """Raised when a feature needs an optional dependency that is not installed."""
@@ -3,38 +3,169 @@
 from __future__ import annotations
 
 import csv
+import json
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
 
-from .artifacts import RunPaths
+from .artifacts import RunPaths, iter_subrun_summaries
+from .exceptions import MissingDependencyError, ValidationError
+from .models import FlowDefinition, MarginProfile
+from .resources import RESOURCE_FIELDS
 from .utils import read_json
 
+EXPORT_FORMATS = ("csv", "arrow")
 
-def export_csv(parent_dir: Path, output_path: Path | None = None) -> Path:
+BASE_COLUMNS: Dict[str, str] = {
+    "parent_run_id": "string",
+    "sub_run_id": "string",
+    "margin_point": "string",
+    "step_name": "string",
+    "adapter": "string",
+    "status": "string",
+    "duration_s": "number",
+    **{name: "number" for name in RESOURCE_FIELDS},
+}
+
+PARAMETER_PREFIX = "param."
+MARGIN_PREFIX = "margin."
+
+
+def _column_type(values: Iterable[Any]) -> str:
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return "string"
+    return "number"
+
+
+def _merge_type(columns: Dict[str, str], name: str, kind: str) -> None:
+    if columns.get(name) != "string":
+        columns[name] = kind
+
+
+def export_columns(flow: FlowDefinition, margin_profile: MarginProfile) -> Dict[str, str]:
+    """Derive the flattened parameter/margin columns of a run from its plan inputs.
+
+    Every exported value is drawn from these axes, so the schema is known before any row is
+    written and stays identical across sub-runs.
+    """
+    columns: Dict[str, str] = {}
+    for step in flow.steps:
+        for _, name, values in step.value_axes():
+            _merge_type(columns, f"{PARAMETER_PREFIX}{name}", _column_type(values))
+    for _, name, values in margin_profile.value_axes():
+        _merge_type(columns, f"{MARGIN_PREFIX}{name}", _column_type(values))
+    return dict(sorted(columns.items()))
+
+
+def _scan_columns(run_paths: RunPaths) -> Dict[str, str]:
+    # Runs recorded before the schema was persisted need one pass over the sub-runs.
+    columns: Dict[str, str] = {}
+    for sub in iter_subrun_summaries(run_paths):
+        for step in sub.get("steps", []):
+            for key, value in step.get("parameters", {}).items():
+                _merge_type(columns, f"{PARAMETER_PREFIX}{key}", _column_type([value]))
+            for key, value in step.get("margin", {}).items():
+                _merge_type(columns, f"{MARGIN_PREFIX}{key}", _column_type([value]))
+    return dict(sorted(columns.items()))
+
+
+def export_schema(parent_dir: Path) -> Dict[str, str]:
     run_paths = RunPaths(parent_id=parent_dir.name, base_dir=parent_dir.parent)
-    summary = read_json(run_paths.summary_path)
-    subruns: Iterable[Dict[str, Any]] = summary.get("subruns", [])
-    rows: List[Dict[str, Any]] = []
+    columns = read_json(run_paths.summary_path).get("export_columns")
+    if columns is None:
+        columns = _scan_columns(run_paths)
+    return {**BASE_COLUMNS, **columns}
 
-    for sub in subruns:
+
+def _cell(value: Any, kind: str) -> Any:
+    if value is None or kind == "number":
+        return value
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def iter_export_rows(parent_dir: Path, schema: Mapping[str, str]) -> Iterator[Dict[str, Any]]:
+    """Yield one flattened row per step invocation, reading one sub-run file at a time."""
+    run_paths = RunPaths(parent_id=parent_dir.name, base_dir=parent_dir.parent)
+    for sub in iter_subrun_summaries(run_paths):
         for step in sub.get("steps", []):
-            row = {
-                "parent_run_id": summary["run_id"],
-                "sub_run_id": sub["run_id"],
-                "margin_point": sub["margin"]["point_id"],
-                "step_name": step["name"],
-                "status": step["status"],
-                "duration_s": step["duration_s"],
-            }
-            rows.append(row)
+            row: Dict[str, Any] = dict.fromkeys(schema)
+            row.update(
+                {
+                    "parent_run_id": run_paths.parent_id,
+                    "sub_run_id": sub["run_id"],
+                    "margin_point": sub["margin"]["point_id"],
+                    "step_name": step["name"],
+                    "adapter": step.get("adapter"),
+                    "status": step["status"],
+                    "duration_s": step["duration_s"],
+                }
+            )
+            resources = step.get("resources") or {}
+            for name in RESOURCE_FIELDS:
+                row[name] = resources.get(name)
+            for key, value in step.get("parameters", {}).items():
+                name = f"{PARAMETER_PREFIX}{key}"
+                if name in schema:
+                    row[name] = _cell(value, schema[name])
+            for key, value in step.get("margin", {}).items():
+                name = f"{MARGIN_PREFIX}{key}"
+                if name in schema:
+                    row[name] = _cell(value, schema[name])
+            yield row
 
+
+def export_csv(parent_dir: Path, output_path: Path | None = None) -> Path:
+    schema = export_schema(parent_dir)
     destination = output_path or parent_dir / f"{parent_dir.name}_export.csv"
     destination.parent.mkdir(parents=True, exist_ok=True)
     with destination.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=["parent_run_id", "sub_run_id", "margin_point", "step_name", "status", "duration_s"],
-        )
+        writer = csv.DictWriter(handle, fieldnames=list(schema))
         writer.writeheader()
-        writer.writerows(rows)
+        writer.writerows(iter_export_rows(parent_dir, schema))
     return destination
+
+
+def export_arrow(
+    parent_dir: Path, output_path: Path | None = None, batch_size: int = 65536
+) -> Path:
+    """Write an Arrow IPC file in fixed-size record batches (requires ``pyarrow``)."""
+    try:
+        import pyarrow as pa
+    except ModuleNotFoundError as exc:
+        raise MissingDependencyError(
+            "arrow export requires pyarrow; install with 'pip install road_runner[arrow]'"
+        ) from exc
+
+    schema = export_schema(parent_dir)
+    arrow_schema = pa.schema(
+        [
+            pa.field(name, pa.float64() if kind == "number" else pa.string())
+            for name, kind in schema.items()
+        ]
+    )
+    destination = output_path or parent_dir / f"{parent_dir.name}_export.arrow"
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with pa.OSFile(str(destination), "wb") as sink, pa.ipc.new_file(sink, arrow_schema) as writer:
+        batch: List[Dict[str, Any]] = []
+        for row in iter_export_rows(parent_dir, schema):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=arrow_schema))
+                batch.clear()
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=arrow_schema))
+    return destination
+
+
+def export_run(parent_dir: Path, format: str, output_path: Path | None = None) -> Path:
+    if format == "csv":
+        return export_csv(parent_dir, output_path)
+    if format == "arrow":
+        return export_arrow(parent_dir, output_path)
+    raise ValidationError(
+        f"unsupported export format '{format}' (expected one of {', '.join(EXPORT_FORMATS)})"
+    )
@@ -3,11 +3,41 @@
 from __future__ import annotations
 
 import itertools
+import math
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, overload
 
 from .exceptions import SafetyViolationError, ValidationError
 
+ValueAxis = Tuple[str, str, Sequence[Any]]
+
+
+def _as_values(value: Any) -> Sequence[Any]:
+    return tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+
+@dataclass(slots=True, frozen=True)
+class ResourceLimits:
+    """CPU placement and memory cap for adapter processes; ``None`` leaves a field unset."""
+
+    cpus: Tuple[int, ...] | None = None
+    numa_node: int | None = None
+    memory_max: int | None = None
+
+    @property
+    def empty(self) -> bool:
+        return self.cpus is None and self.numa_node is None and self.memory_max is None
+
+    def merged(self, override: "ResourceLimits | None") -> "ResourceLimits":
+        """Return these limits with every field set in ``override`` taking precedence."""
+        if override is None:
+            return self
+        return ResourceLimits(
+            cpus=override.cpus if override.cpus is not None else self.cpus,
+            numa_node=override.numa_node if override.numa_node is not None else self.numa_node,
+            memory_max=override.memory_max if override.memory_max is not None else self.memory_max,
+        )
+
 
 @dataclass(slots=True)
 class FlowStep:
@@ -15,6 +45,11 @@ class FlowStep:
     adapter: str
     parameters: Dict[str, Any] = field(default_factory=dict)
     sweeps: Dict[str, Sequence[Any]] = field(default_factory=dict)
+    timeout_s: float | None = None
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
+    depends_on: Tuple[str, ...] = ()
+    parallel_group: str | None = None
+    concurrency: int = 1
 
     def expanded_parameters(self) -> Iterable[Dict[str, Any]]:
         if not self.sweeps:
@@ -24,14 +59,105 @@ class FlowStep:
         combos = itertools.product(*(self.sweeps[key] for key in keys))
         for combo in combos:
             params = dict(self.parameters)
-            params.update(dict(zip(keys, combo)))
+            params.update(dict(zip(keys, combo, strict=True)))
             yield params
 
+    def value_axes(self) -> Iterator[ValueAxis]:
+        for key, value in self.parameters.items():
+            yield f"step {self.name}.{key}", key, _as_values(value)
+        for key, values in self.sweeps.items():
+            yield f"step {self.name}.{key}", key, tuple(values)
+
 
 @dataclass(slots=True)
 class FlowDefinition:
     metadata: Mapping[str, Any]
     steps: List[FlowStep]
+    max_parallel_steps: int | None = None
+
+    @property
+    def scheduled(self) -> bool:
+        """Whether any step opts into DAG scheduling via ``depends_on`` or ``parallel_group``."""
+        return any(step.depends_on or step.parallel_group for step in self.steps)
+
+    def step_dependencies(self) -> List[Tuple[int, ...]]:
+        """Return, per step, the indices of the steps it must wait for.
+
+        ``depends_on`` names are used as given. Any other step waits for the step before it
+        in list order, except that consecutive steps sharing a ``parallel_group`` all wait
+        for whatever the first of them waits for, and the step after a group waits for
+        every member of the group. A flow without either key is therefore a plain chain.
+        """
+        positions: Dict[str, int] = {}
+        for index, step in enumerate(self.steps):
+            if step.name in positions and self.scheduled:
+                raise ValidationError(
+                    f"step name '{step.name}' is used twice; names must be unique when "
+                    "steps declare depends_on or parallel_group"
+                )
+            positions.setdefault(step.name, index)
+        dependencies: List[Tuple[int, ...]] = []
+        barrier: Tuple[int, ...] = ()
+        group_dependencies: Tuple[int, ...] = ()
+        for index, step in enumerate(self.steps):
+            previous = self.steps[index - 1] if index else None
+            joins_group = (
+                step.parallel_group is not None
+                and previous is not None
+                and previous.parallel_group == step.parallel_group
+            )
+            if step.depends_on:
+                unknown = [name for name in step.depends_on if name not in positions]
+                if unknown:
+                    raise ValidationError(
+                        f"step '{step.name}' depends on unknown step(s): {', '.join(unknown)}"
+                    )
+                resolved = tuple(sorted({positions[name] for name in step.depends_on}))
+            elif joins_group:
+                resolved = group_dependencies
+            else:
+                resolved = barrier
+            dependencies.append(resolved)
+            if joins_group:
+                barrier = (*barrier, index)
+            else:
+                barrier = (index,)
+                group_dependencies = resolved
+        _check_acyclic(self.steps, dependencies)
+        return dependencies
+
+
+def _check_acyclic(steps: Sequence[FlowStep], dependencies: Sequence[Tuple[int, ...]]) -> None:
+    state = [0] * len(steps)  # 0 = unvisited, 1 = on the current path, 2 = done
+    for root in range(len(steps)):
+        if state[root]:
+            continue
+        stack: List[Tuple[int, Iterator[int]]] = [(root, iter(dependencies[root]))]
+        state[root] = 1
+        while stack:
+            node, pending = stack[-1]
+            child = next(pending, None)
+            if child is None:
+                state[node] = 2
+                stack.pop()
+            elif state[child] == 1:
+                raise ValidationError(
+                    f"step dependencies form a cycle through '{steps[child].name}'"
+                )
+            elif state[child] == 0:
+                state[child] = 1
+                stack.append((child, iter(dependencies[child])))
+
+
+@dataclass(slots=True)
+class MarginSearch:
+    """Candidate values probed adaptively instead of swept exhaustively.
+
+    ``values`` are ordered from the end expected to pass towards the end expected to fail.
+    """
+
+    strategy: str
+    values: Tuple[Any, ...]
 
 
 @dataclass(slots=True)
@@ -39,6 +165,7 @@ class TargetMargins:
     fixed: Dict[str, Any] = field(default_factory=dict)
     sweeps: Dict[str, Sequence[Any]] = field(default_factory=dict)
     jitter: Mapping[str, Any] | None = None
+    searches: Dict[str, MarginSearch] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -48,40 +175,113 @@ class MarginPoint:
     seed: int
 
 
+MarginAxis = Tuple[str, str, Tuple[Any, ...]]
+
+
+class MarginPoints(Sequence[MarginPoint]):
+    """Lazy view over the Cartesian product of margin sweep axes.
+
+    Points are built on demand; ``len()`` and indexing are computed arithmetically so a
+    sweep never has to be materialized to be planned or executed.
+    """
+
+    __slots__ = ("_base_values", "_axes", "_base_seed", "_length")
+
+    def __init__(
+        self,
+        base_values: Dict[str, Dict[str, Any]],
+        axes: Sequence[MarginAxis],
+        base_seed: int,
+    ) -> None:
+        self._base_values = base_values
+        self._axes = tuple(axes)
+        self._base_seed = base_seed
+        self._length = math.prod(len(values) for _, _, values in self._axes)
+
+    @property
+    def axes(self) -> Tuple[MarginAxis, ...]:
+        return self._axes
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> MarginPoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[MarginPoint]: ...
+
+    def __getitem__(self, index: int | slice) -> MarginPoint | List[MarginPoint]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("margin point index out of range")
+        # Mixed-radix decode; the last axis varies fastest, matching itertools.product.
+        combo: List[Any] = []
+        remainder = index
+        for _, _, values in reversed(self._axes):
+            remainder, position = divmod(remainder, len(values))
+            combo.append(values[position])
+        combo.reverse()
+        return self._build(index, combo)
+
+    def __iter__(self) -> Iterator[MarginPoint]:
+        combos = itertools.product(*(values for _, _, values in self._axes))
+        for idx, combo in enumerate(combos):
+            yield self._build(idx, combo)
+
+    def _build(self, index: int, combo: Sequence[Any]) -> MarginPoint:
+        values = {name: dict(inner) for name, inner in self._base_values.items()}
+        for (target_name, parameter, _), chosen in zip(self._axes, combo, strict=True):
+            values.setdefault(target_name, {})[parameter] = chosen
+        return MarginPoint(f"point-{index}", values, self._base_seed + index)
+
+
 @dataclass(slots=True)
 class MarginProfile:
     metadata: Mapping[str, Any]
     global_seed: int | None
     targets: Dict[str, TargetMargins]
 
-    def expand_points(self) -> List[MarginPoint]:
-        base_values: Dict[str, Dict[str, Any]] = {}
-        sweep_entries: List[tuple[str, str, Sequence[Any]]] = []
+    def sweep_axes(self) -> List[MarginAxis]:
+        axes: List[MarginAxis] = []
+        for target_name, target in self.targets.items():
+            for parameter, values in target.sweeps.items():
+                axes.append((target_name, parameter, tuple(values)))
+        return axes
+
+    def search_axis(self) -> Tuple[str, str, MarginSearch] | None:
+        for target_name, target in self.targets.items():
+            for parameter, search in target.searches.items():
+                return target_name, parameter, search
+        return None
 
+    def value_axes(self) -> Iterator[ValueAxis]:
+        """Yield every fixed, swept and searched value list; each planned point draws from these."""
+        for target_name, target in self.targets.items():
+            for parameter, value in target.fixed.items():
+                yield f"{target_name}.{parameter}", parameter, _as_values(value)
+            for parameter, values in target.sweeps.items():
+                yield f"{target_name}.{parameter}", parameter, tuple(values)
+            for parameter, search in target.searches.items():
+                yield f"{target_name}.{parameter}", parameter, search.values
+
+    def expand_points(self) -> MarginPoints:
+        base_values: Dict[str, Dict[str, Any]] = {}
         for target_name, target in self.targets.items():
             target_values = dict(target.fixed)
             if target.jitter:
                 target_values["jitter"] = target.jitter
             base_values[target_name] = target_values
-            for parameter, values in target.sweeps.items():
-                sweep_entries.append((target_name, parameter, tuple(values)))
-
-        if not sweep_entries:
-            point_id = "point-0"
-            return [MarginPoint(point_id, base_values, self.global_seed or 0)]
-
-        combos = itertools.product(*(entry[2] for entry in sweep_entries))
-        points: List[MarginPoint] = []
-        base_seed = self.global_seed or 0
-        for idx, combo in enumerate(combos):
-            values = {
-                name: dict(inner) for name, inner in base_values.items()
-            }
-            for (target_name, parameter, _), chosen in zip(sweep_entries, combo):
-                values.setdefault(target_name, {})[parameter] = chosen
-            point_id = f"point-{idx}"
-            points.append(MarginPoint(point_id, values, base_seed + idx))
-        return points
+        axes = self.sweep_axes()
+        search = self.search_axis()
+        if search is not None:
+            # Every search candidate is addressable by index; the runner picks which to probe.
+            target_name, parameter, spec = search
+            axes.append((target_name, parameter, spec.values))
+        return MarginPoints(base_values, axes, self.global_seed or 0)
 
 
 @dataclass(slots=True)
@@ -98,13 +298,9 @@ class Bound:
         except (TypeError, ValueError) as exc:
             raise ValidationError(f"{name}: expected numeric value, got {value!r}") from exc
         if self.minimum is not None and numeric < self.minimum:
-            raise SafetyViolationError(
-                f"{name}: value {numeric} below minimum {self.minimum}"
-            )
+            raise SafetyViolationError(f"{name}: value {numeric} below minimum {self.minimum}")
         if self.maximum is not None and numeric > self.maximum:
-            raise SafetyViolationError(
-                f"{name}: value {numeric} above maximum {self.maximum}"
-            )
+            raise SafetyViolationError(f"{name}: value {numeric} above maximum {self.maximum}")
 
 
 @dataclass(slots=True)
@@ -122,3 +318,46 @@ class SafetyPolicy:
                 bound.validate(name, item)
             return
         bound.validate(name, value)
+
+    def validate_grid(self, axes: Iterable[ValueAxis]) -> None:
+        """Validate whole sweep axes at once instead of point by point.
+
+        Each axis is checked once: its numeric values are reduced to a min/max pair and only
+        axes whose extremes fall outside the bound are scanned for the offending coordinates.
+        Every violation across all axes is reported in a single error.
+        """
+        problems: List[str] = []
+        unsafe = False
+        for label, name, values in axes:
+            bound = self.avt_bounds.get(name)
+            if not bound or name == "jitter":
+                continue
+            numeric: List[Tuple[int, float]] = []
+            for position, value in enumerate(values):
+                if value is None:
+                    continue
+                try:
+                    numeric.append((position, float(value)))
+                except (TypeError, ValueError):
+                    problems.append(f"{label}[{position}]: expected numeric value, got {value!r}")
+            if not numeric:
+                continue
+            lowest = min(item[1] for item in numeric)
+            highest = max(item[1] for item in numeric)
+            if (bound.minimum is None or lowest >= bound.minimum) and (
+                bound.maximum is None or highest <= bound.maximum
+            ):
+                continue
+            unsafe = True
+            for position, number in numeric:
+                if bound.minimum is not None and number < bound.minimum:
+                    problems.append(
+                        f"{label}[{position}]: value {number} below minimum {bound.minimum}"
+                    )
+                elif bound.maximum is not None and number > bound.maximum:
+                    problems.append(
+                        f"{label}[{position}]: value {number} above maximum {bound.maximum}"
+                    )
+        if problems:
+            error = SafetyViolationError if unsafe else ValidationError
+            raise error("; ".join(problems))
@@ -43,3 +43,9 @@ def runs_dir() -> Path:
 
 def templates_dir() -> Path:
     return PROJECT_ROOT / "templates"
+
+
+def cache_dir() -> Path:
+    if "ROAD_RUNNER_CACHE_DIR" in os.environ:
+        return Path(os.environ["ROAD_RUNNER_CACHE_DIR"]).expanduser()
+    return PROJECT_ROOT / ".road_runner_cache"
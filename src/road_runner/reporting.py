@@ -2,60 +2,218 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    ChoiceLoader,
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
-from .artifacts import RunPaths
-from .paths import templates_dir
+from .artifacts import RunPaths, SubRunDetails, load_run_summary
+from .paths import cache_dir, templates_dir
+from .shmoo import load_shmoo
 
+MARKDOWN_TEMPLATE = "report.md.j2"
+HTML_TEMPLATE = "report.html.j2"
+PAGE_TEMPLATE = "report_page.html.j2"
 
+REPORT_PAGE_SIZE = 100
+SLOWEST_STEPS = 20
+
+
+@functools.cache
 def _jinja_environment() -> Environment:
-    template_path = templates_dir()
-    loader = FileSystemLoader(str(template_path)) if template_path.exists() else None
+    """Return the process-wide environment.
+
+    Templates from ``templates/`` take precedence over the built-in defaults. Compiled
+    templates stay in the environment's cache for the life of the process and their bytecode
+    is persisted under the cache directory, so later processes skip compilation too.
+    """
     env = Environment(
-        loader=loader,
-        autoescape=select_autoescape(enabled_extensions=("html",)),
+        loader=ChoiceLoader(
+            [
+                FileSystemLoader(str(templates_dir())),
+                DictLoader(
+                    {
+                        MARKDOWN_TEMPLATE: _DEFAULT_MARKDOWN_TEMPLATE,
+                        HTML_TEMPLATE: _DEFAULT_HTML_TEMPLATE,
+                        PAGE_TEMPLATE: _DEFAULT_PAGE_TEMPLATE,
+                    }
+                ),
+            ]
+        ),
+        autoescape=select_autoescape(enabled_extensions=("html", "html.j2")),
         trim_blocks=True,
         lstrip_blocks=True,
+        bytecode_cache=_bytecode_cache(),
     )
     env.globals["len"] = len
     return env
 
 
-def _render_template(env: Environment, template_name: str, fallback: str, context: Dict[str, Any]) -> str:
-    if env.loader and env.loader.get_source:  # type: ignore[attr-defined]
-        try:
-            template = env.get_template(template_name)
-            return template.render(**context)
-        except Exception:
-            pass
-    template = env.from_string(fallback)
-    return template.render(**context)
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    # A read-only checkout or install still renders reports, just without persisted bytecode.
+    bytecode_dir = cache_dir() / "jinja"
+    try:
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    if not os.access(bytecode_dir, os.W_OK | os.X_OK):
+        return None
+    return FileSystemBytecodeCache(str(bytecode_dir))
+
+
+@dataclass(slots=True)
+class ReportOverview:
+    """Run-wide aggregates gathered while sub-run pages are written."""
+
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    step_status_counts: Dict[str, int] = field(default_factory=dict)
+    limit: int = SLOWEST_STEPS
+    _slowest: List[Tuple[float, int, Dict[str, Any]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _seen: int = field(default=0, init=False, repr=False)
+
+    @property
+    def statuses(self) -> List[str]:
+        return sorted(set(self.status_counts) | set(self.step_status_counts))
 
+    @property
+    def slowest_steps(self) -> List[Dict[str, Any]]:
+        return [entry for _, _, entry in sorted(self._slowest, key=lambda item: -item[0])]
 
-def render_reports(summary: Dict[str, Any], subruns: List[Dict[str, Any]], run_paths: RunPaths) -> None:
+    def add(self, sub: Mapping[str, Any], href: str) -> None:
+        status = sub.get("status", "UNKNOWN")
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        for step in sub.get("steps", []):
+            step_status = step.get("status", "UNKNOWN")
+            self.step_status_counts[step_status] = self.step_status_counts.get(step_status, 0) + 1
+            duration = float(step.get("duration_s") or 0.0)
+            self._seen += 1
+            if len(self._slowest) >= self.limit and duration <= self._slowest[0][0]:
+                continue
+            entry = {
+                "subrun": sub.get("run_id"),
+                "name": step.get("name"),
+                "adapter": step.get("adapter"),
+                "status": step_status,
+                "duration_s": duration,
+                "href": f"{href}#{sub.get('run_id')}",
+            }
+            # Min-heap of the slowest steps seen so far; the counter breaks duration ties.
+            item = (duration, self._seen, entry)
+            if len(self._slowest) < self.limit:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heapreplace(self._slowest, item)
+
+
+def render_reports(
+    summary: Dict[str, Any],
+    subruns: Sequence[Dict[str, Any]],
+    run_paths: RunPaths,
+    page_size: int = REPORT_PAGE_SIZE,
+) -> None:
+    """Write ``report.md``, the ``report.html`` overview and paginated sub-run pages.
+
+    Every document is streamed to disk with ``Template.stream`` so no rendered page is held
+    in memory, and each HTML page only carries ``page_size`` sub-runs. Pass a
+    :class:`SubRunDetails` to load sub-run summaries only as each page is written.
+    """
     env = _jinja_environment()
+    # The shmoo only needs statuses and margin values, which the rollups already carry.
+    shmoo = load_shmoo(
+        run_paths, subruns.rollups if isinstance(subruns, SubRunDetails) else subruns
+    )
+    run_paths.parent_dir.mkdir(parents=True, exist_ok=True)
+    shutil.rmtree(run_paths.report_pages_dir, ignore_errors=True)
+    run_paths.report_pages_dir.mkdir(parents=True)
+
+    overview = ReportOverview()
+    pages: List[Dict[str, Any]] = []
+    page_template = env.get_template(PAGE_TEMPLATE)
+    page_count = math.ceil(len(subruns) / page_size)
+    for number in range(1, page_count + 1):
+        chunk = subruns[(number - 1) * page_size : number * page_size]
+        page_path = run_paths.report_page(number)
+        href = page_path.relative_to(run_paths.parent_dir).as_posix()
+        for sub in chunk:
+            overview.add(sub, href)
+        page_template.stream(
+            summary=summary,
+            subruns=chunk,
+            page=number,
+            page_count=page_count,
+            previous_href=run_paths.report_page(number - 1).name if number > 1 else None,
+            next_href=run_paths.report_page(number + 1).name if number < page_count else None,
+        ).dump(str(page_path), encoding="utf-8")
+        pages.append(
+            {
+                "number": number,
+                "href": href,
+                "first": chunk[0].get("run_id"),
+                "last": chunk[-1].get("run_id"),
+                "count": len(chunk),
+            }
+        )
+
     context = {
         "summary": summary,
         "subruns": subruns,
+        "shmoo": shmoo,
+        "overview": overview,
+        "pages": pages,
     }
-    markdown = _render_template(
-        env,
-        "report.md.j2",
-        fallback=_DEFAULT_MARKDOWN_TEMPLATE,
-        context=context,
+    env.get_template(MARKDOWN_TEMPLATE).stream(**context).dump(
+        str(run_paths.markdown_report_path), encoding="utf-8"
     )
-    html = _render_template(
-        env,
-        "report.html.j2",
-        fallback=_DEFAULT_HTML_TEMPLATE,
-        context=context,
+    env.get_template(HTML_TEMPLATE).stream(**context).dump(
+        str(run_paths.html_report_path), encoding="utf-8"
     )
-    run_paths.parent_dir.mkdir(parents=True, exist_ok=True)
-    run_paths.markdown_report_path.write_text(markdown, encoding="utf-8")
-    run_paths.html_report_path.write_text(html, encoding="utf-8")
+
+
+def render_run_reports(parent_dir: Path) -> str:
+    """Re-render the reports of the run stored in ``parent_dir`` and return its id."""
+    run_paths = RunPaths(parent_id=parent_dir.name, base_dir=parent_dir.parent)
+    summary = load_run_summary(run_paths)
+    with SubRunDetails(run_paths) as details:
+        render_reports(summary, details, run_paths)
+    return run_paths.parent_id
+
+
+def _render_run_task(parent_dir: Path) -> Tuple[str, str | None]:
+    try:
+        return render_run_reports(parent_dir), None
+    except (OSError, ValueError, KeyError) as exc:
+        # A missing or corrupt run is reported without aborting the rest of the batch;
+        # template errors still propagate since they would fail every run.
+        return parent_dir.name, f"{type(exc).__name__}: {exc}"
+
+
+def render_many(parent_dirs: Iterable[Path], workers: int = 1) -> Iterator[Tuple[str, str | None]]:
+    """Render reports for many runs, yielding ``(run_id, error)`` in input order.
+
+    Each worker process builds its template environment once and reuses it for every run it
+    is handed.
+    """
+    if workers <= 1:
+        yield from map(_render_run_task, parent_dirs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_render_run_task, parent_dirs, chunksize=4)
 
 
 _DEFAULT_MARKDOWN_TEMPLATE = """# Road Runner Report
@@ -63,25 +221,58 @@ _DEFAULT_MARKDOWN_TEMPLATE = """# Road Runner Report
 ## Run Summary
 
 - Run ID: {{ summary.run_id }}
-- Flow: {{ summary.flow.path }}
+- Flow File: {{ summary.flow.path }}
 - Margin Profile: {{ summary.margin.path or "n/a" }}
 - Unit Under Test: {{ summary.unit or "n/a" }}
 - Created: {{ summary.created_at }}
 - Global Seed: {{ summary.seed }}
 
-## Margin Point Results
+## Status Counts
+
+| Status | Sub-Runs | Step Invocations |
+|--------|----------|------------------|
+{% for status in overview.statuses -%}
+{% set subrun_count = overview.status_counts.get(status, 0) %}
+{% set step_count = overview.step_status_counts.get(status, 0) %}
+| {{ status }} | {{ subrun_count }} | {{ step_count }} |
+{% endfor %}
+
+{% if shmoo %}
+## Shmoo
+
+```
+{{ shmoo.to_text() }}
+```
+
+{% endif %}
+{% if summary.search %}
+{% set search = summary.search %}
+## Margin Search
+
+- Parameter: {{ search.target }}.{{ search.parameter }} ({{ search.strategy }})
+- Last Pass: {{ search.last_pass if search.last_pass is not none else "n/a" }}
+- First Fail: {{ search.first_fail if search.first_fail is not none else "n/a" }}
+- Probes: {{ search.probes }} of {{ search.candidates }} candidates
+
+| Probe | Value | Sub-Run | Status |
+|-------|-------|---------|--------|
+{% for probe in search.trace -%}
+| {{ probe.probe }} | {{ probe.value }} | {{ probe.subrun }} | {{ probe.status }} |
+{% endfor %}
+
+{% endif %}
+## Margin Points
 
 {% for sub in subruns -%}
-### {{ sub.run_id }}
+### {{ sub.run_id }} ({{ sub.margin.point_id }})
 
-- Margin Identifier: {{ sub.margin.point_id }}
 - Status: {{ sub.status }}
-- Duration Seconds: {{ "%.2f"|format(sub.duration_s) }}
+- Duration (s): {{ "%.2f"|format(sub.duration_s) }}
 
-| Step | Status | Duration (s) |
-|------|--------|--------------|
+| Step | Adapter | Status | Duration (s) |
+|------|---------|--------|--------------|
 {% for step in sub.steps -%}
-| {{ step.name }} | {{ step.status }} | {{ "%.2f"|format(step.duration_s) }} |
+| {{ step.name }} | {{ step.adapter }} | {{ step.status }} | {{ "%.2f"|format(step.duration_s) }} |
 {% endfor %}
 
 {% endfor %}
@@ -93,11 +284,12 @@ _DEFAULT_HTML_TEMPLATE = """<!doctype html>
     <meta charset="utf-8" />
     <title>Road Runner Report - {{ summary.run_id }}</title>
     <style>
-      body { font-family: Arial, sans-serif; margin: 2rem; }
-      h1, h2, h3 { color: #1f2933; }
-      table { border-collapse: collapse; margin-bottom: 1.5rem; width: 100%; }
-      th, td { border: 1px solid #d2d6dc; padding: 0.5rem; text-align: left; }
-      th { background-color: #f9fafb; }
+      body { font-family: "Segoe UI", Arial, sans-serif; margin: 2rem; color: #1f2933; }
+      h1, h2, h3 { color: #111827; }
+      table { border-collapse: collapse; width: 100%; margin-bottom: 1.5rem; }
+      th, td { border: 1px solid #d1d5db; padding: 0.5rem; text-align: left; }
+      th { background-color: #f3f4f6; }
+      section { margin-bottom: 2rem; }
     </style>
   </head>
   <body>
@@ -106,43 +298,177 @@ _DEFAULT_HTML_TEMPLATE = """<!doctype html>
       <h2>Run Summary</h2>
       <ul>
         <li><strong>Run ID:</strong> {{ summary.run_id }}</li>
-        <li><strong>Flow:</strong> {{ summary.flow.path }}</li>
+        <li><strong>Flow File:</strong> {{ summary.flow.path }}</li>
         <li><strong>Margin Profile:</strong> {{ summary.margin.path or "n/a" }}</li>
-        <li><strong>Unit:</strong> {{ summary.unit or "n/a" }}</li>
+        <li><strong>Unit Under Test:</strong> {{ summary.unit or "n/a" }}</li>
         <li><strong>Created:</strong> {{ summary.created_at }}</li>
         <li><strong>Global Seed:</strong> {{ summary.seed }}</li>
       </ul>
     </section>
     <section>
-      <h2>Margin Point Results</h2>
-      {% for sub in subruns %}
-      <article>
-        <h3>{{ sub.run_id }} ({{ sub.margin.point_id }})</h3>
-        <ul>
-          <li><strong>Status:</strong> {{ sub.status }}</li>
-          <li><strong>Duration (s):</strong> {{ "%.2f"|format(sub.duration_s) }}</li>
-        </ul>
-        <table>
-          <thead>
-            <tr>
-              <th>Step</th>
-              <th>Status</th>
-              <th>Duration (s)</th>
-            </tr>
-          </thead>
-          <tbody>
-            {% for step in sub.steps %}
-            <tr>
-              <td>{{ step.name }}</td>
-              <td>{{ step.status }}</td>
-              <td>{{ "%.2f"|format(step.duration_s) }}</td>
-            </tr>
-            {% endfor %}
-          </tbody>
-        </table>
-      </article>
-      {% endfor %}
+      <h2>Status Counts</h2>
+      <table>
+        <thead>
+          <tr>
+            <th>Status</th>
+            <th>Sub-Runs</th>
+            <th>Step Invocations</th>
+          </tr>
+        </thead>
+        <tbody>
+          {% for status in overview.statuses %}
+          <tr>
+            <td>{{ status }}</td>
+            <td>{{ overview.status_counts.get(status, 0) }}</td>
+            <td>{{ overview.step_status_counts.get(status, 0) }}</td>
+          </tr>
+          {% endfor %}
+        </tbody>
+      </table>
+    </section>
+    {% if overview.slowest_steps %}
+    <section>
+      <h2>Slowest Steps</h2>
+      <table>
+        <thead>
+          <tr>
+            <th>Sub-Run</th>
+            <th>Step</th>
+            <th>Adapter</th>
+            <th>Status</th>
+            <th>Duration (s)</th>
+          </tr>
+        </thead>
+        <tbody>
+          {% for step in overview.slowest_steps %}
+          <tr>
+            <td><a href="{{ step.href }}">{{ step.subrun }}</a></td>
+            <td>{{ step.name }}</td>
+            <td>{{ step.adapter }}</td>
+            <td>{{ step.status }}</td>
+            <td>{{ "%.2f"|format(step.duration_s) }}</td>
+          </tr>
+          {% endfor %}
+        </tbody>
+      </table>
+    </section>
+    {% endif %}
+    {% if shmoo %}
+    <section>
+      <h2>Shmoo</h2>
+      {{ shmoo.to_svg() | safe }}
+    </section>
+    {% endif %}
+    {% if summary.search %}
+    {% set search = summary.search %}
+    <section>
+      <h2>Margin Search</h2>
+      <ul>
+        <li>
+          <strong>Parameter:</strong>
+          {{ search.target }}.{{ search.parameter }} ({{ search.strategy }})
+        </li>
+        <li>
+          <strong>Last Pass:</strong>
+          {{ search.last_pass if search.last_pass is not none else "n/a" }}
+        </li>
+        <li>
+          <strong>First Fail:</strong>
+          {{ search.first_fail if search.first_fail is not none else "n/a" }}
+        </li>
+        <li><strong>Probes:</strong> {{ search.probes }} of {{ search.candidates }} candidates</li>
+      </ul>
+      <table>
+        <thead>
+          <tr>
+            <th>Probe</th>
+            <th>Value</th>
+            <th>Sub-Run</th>
+            <th>Status</th>
+          </tr>
+        </thead>
+        <tbody>
+          {% for probe in search.trace %}
+          <tr>
+            <td>{{ probe.probe }}</td>
+            <td>{{ probe.value }}</td>
+            <td>{{ probe.subrun }}</td>
+            <td>{{ probe.status }}</td>
+          </tr>
+          {% endfor %}
+        </tbody>
+      </table>
+    </section>
+    {% endif %}
+    <section>
+      <h2>Margin Points</h2>
+      <ul>
+        {% for page in pages %}
+        <li>
+          <a href="{{ page.href }}">Page {{ page.number }}</a>:
+          {{ page.first }} &ndash; {{ page.last }} ({{ page.count }} sub-runs)
+        </li>
+        {% endfor %}
+      </ul>
     </section>
   </body>
 </html>
 """
+
+_DEFAULT_PAGE_TEMPLATE = """<!doctype html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8" />
+    <title>Road Runner Report - {{ summary.run_id }} - Page {{ page }}</title>
+    <style>
+      body { font-family: "Segoe UI", Arial, sans-serif; margin: 2rem; color: #1f2933; }
+      h1, h2, h3 { color: #111827; }
+      table { border-collapse: collapse; width: 100%; margin-bottom: 1.5rem; }
+      th, td { border: 1px solid #d1d5db; padding: 0.5rem; text-align: left; }
+      th { background-color: #f3f4f6; }
+      nav { margin-bottom: 1.5rem; }
+    </style>
+  </head>
+  <body>
+    <h1>{{ summary.run_id }} &ndash; Page {{ page }} of {{ page_count }}</h1>
+    <nav>
+      <a href="../report.html">Overview</a>
+      {% if previous_href %}
+      | <a href="{{ previous_href }}">Previous</a>
+      {% endif %}
+      {% if next_href %}
+      | <a href="{{ next_href }}">Next</a>
+      {% endif %}
+    </nav>
+    {% for sub in subruns %}
+    <article id="{{ sub.run_id }}">
+      <h3>{{ sub.run_id }} ({{ sub.margin.point_id }})</h3>
+      <ul>
+        <li><strong>Status:</strong> {{ sub.status }}</li>
+        <li><strong>Duration (s):</strong> {{ "%.2f"|format(sub.duration_s) }}</li>
+      </ul>
+      <table>
+        <thead>
+          <tr>
+            <th>Step</th>
+            <th>Adapter</th>
+            <th>Status</th>
+            <th>Duration (s)</th>
+          </tr>
+        </thead>
+        <tbody>
+          {% for step in sub.steps %}
+          <tr>
+            <td>{{ step.name }}</td>
+            <td>{{ step.adapter }}</td>
+            <td>{{ step.status }}</td>
+            <td>{{ "%.2f"|format(step.duration_s) }}</td>
+          </tr>
+          {% endfor %}
+        </tbody>
+      </table>
+    </article>
+    {% endfor %}
+  </body>
+</html>
+"""
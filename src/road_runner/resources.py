@@ -0,0 +1,306 @@
+"""Resource accounting and placement (CPU affinity, cgroup v2) for adapter processes."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import resource
+import subprocess
+import threading
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from .exceptions import ValidationError
+from .models import ResourceLimits
+from .utils import parse_cpu_list
+
+CGROUP_MOUNT = Path("/sys/fs/cgroup")
+NUMA_NODE_ROOT = Path("/sys/devices/system/node")
+
+# ru_inblock / ru_oublock count 512-byte blocks on Linux.
+_BLOCK_SIZE = 512
+
+
+@dataclass(slots=True, frozen=True)
+class ResourceUsage:
+    """CPU time, peak memory, context switches and block I/O of one adapter invocation."""
+
+    user_cpu_s: float
+    sys_cpu_s: float
+    max_rss_kb: int
+    voluntary_ctx_switches: int
+    involuntary_ctx_switches: int
+    read_bytes: int
+    write_bytes: int
+    source: str = "rusage"
+
+    @classmethod
+    def from_rusage(cls, usage: resource.struct_rusage) -> "ResourceUsage":
+        return cls(
+            user_cpu_s=usage.ru_utime,
+            sys_cpu_s=usage.ru_stime,
+            # Linux reports ru_maxrss in kilobytes.
+            max_rss_kb=usage.ru_maxrss,
+            voluntary_ctx_switches=usage.ru_nvcsw,
+            involuntary_ctx_switches=usage.ru_nivcsw,
+            read_bytes=usage.ru_inblock * _BLOCK_SIZE,
+            write_bytes=usage.ru_oublock * _BLOCK_SIZE,
+        )
+
+
+RESOURCE_FIELDS: Tuple[str, ...] = tuple(
+    item.name for item in fields(ResourceUsage) if item.name != "source"
+)
+
+
+def wait_with_usage(process: subprocess.Popen[bytes]) -> Tuple[int, ResourceUsage | None]:
+    """Reap ``process`` with ``os.wait4`` and return its exit code and resource usage.
+
+    The usage covers the child and every descendant it waited for itself. If the child was
+    already reaped elsewhere the usage is ``None``.
+    """
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        return process.wait(), None
+    returncode = os.waitstatus_to_exitcode(status)
+    # Tell Popen the child is gone so it never tries to reap the pid again.
+    process.returncode = returncode
+    return returncode, ResourceUsage.from_rusage(usage)
+
+
+async def wait_with_usage_async(
+    process: subprocess.Popen[bytes],
+) -> Tuple[int, ResourceUsage | None]:
+    """Await ``process`` exiting without blocking the event loop, then reap it with usage.
+
+    On Linux a pidfd becomes readable once the child exits, so no thread is parked per
+    running child; elsewhere the blocking :func:`wait_with_usage` runs in a worker thread.
+    """
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        return await asyncio.to_thread(wait_with_usage, process)
+    loop = asyncio.get_running_loop()
+    exited: asyncio.Future[None] = loop.create_future()
+
+    def _ready() -> None:
+        if not exited.done():
+            exited.set_result(None)
+
+    loop.add_reader(pidfd, _ready)
+    try:
+        await exited
+    finally:
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+    return wait_with_usage(process)
+
+
+def total_usage(usages: Iterable[Mapping[str, Any] | None]) -> Dict[str, Any] | None:
+    """Sum per-invocation usage records; peak RSS is the maximum rather than the sum."""
+    totals: Dict[str, Any] | None = None
+    for usage in usages:
+        if not usage:
+            continue
+        if totals is None:
+            totals = dict.fromkeys(RESOURCE_FIELDS, 0)
+        for name in RESOURCE_FIELDS:
+            value = usage.get(name) or 0
+            if name == "max_rss_kb":
+                totals[name] = max(totals[name], value)
+            else:
+                totals[name] += value
+    return totals
+
+
+def numa_node_cpus(node: int, root: Path = NUMA_NODE_ROOT) -> Tuple[int, ...]:
+    try:
+        return parse_cpu_list((root / f"node{node}" / "cpulist").read_text(encoding="utf-8"))
+    except FileNotFoundError as exc:
+        raise ValidationError(f"NUMA node {node} does not exist on this host") from exc
+
+
+def resolve_cpus(
+    limits: ResourceLimits, node_root: Path = NUMA_NODE_ROOT
+) -> Tuple[int, ...] | None:
+    """CPUs an adapter may run on: ``cpus`` and the ``numa_node``'s CPUs, intersected."""
+    if limits.cpus is None and limits.numa_node is None:
+        return None
+    cpus = set(limits.cpus) if limits.cpus is not None else None
+    if limits.numa_node is not None:
+        node_cpus = set(numa_node_cpus(limits.numa_node, node_root))
+        cpus = node_cpus if cpus is None else cpus & node_cpus
+    if hasattr(os, "sched_getaffinity"):
+        assert cpus is not None
+        cpus &= os.sched_getaffinity(0)
+    if not cpus:
+        raise ValidationError(
+            f"no usable CPUs for cpus={list(limits.cpus or [])} numa_node={limits.numa_node}"
+        )
+    return tuple(sorted(cpus))
+
+
+@contextmanager
+def thread_affinity(cpus: Tuple[int, ...] | None) -> Iterator[bool]:
+    """Pin the calling thread to ``cpus`` for the duration of the block.
+
+    Linux applies ``sched_setaffinity(0, ...)`` to the calling thread only, and a forked
+    child inherits that thread's mask, so processes spawned inside the block start on
+    ``cpus`` from their first instruction while other threads are unaffected. Yields whether
+    the mask was applied.
+    """
+    if cpus is None or not hasattr(os, "sched_setaffinity"):
+        yield False
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield True
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def delegated_cgroup(mount: Path = CGROUP_MOUNT) -> Path | None:
+    """Return this process's cgroup v2 directory if it can host child cgroups."""
+    unified = mount if (mount / "cgroup.controllers").exists() else mount / "unified"
+    try:
+        with open("/proc/self/cgroup", encoding="utf-8") as handle:
+            entries = [line.rstrip("\n").split(":", 2) for line in handle]
+    except OSError:
+        return None
+    for entry in entries:
+        if len(entry) == 3 and entry[0] == "0" and entry[1] == "":
+            directory = unified / entry[2].lstrip("/")
+            if (directory / "cgroup.controllers").exists() and os.access(directory, os.W_OK):
+                return directory
+    return None
+
+
+_CGROUP_SEQUENCE = itertools.count()
+
+
+@dataclass(slots=True)
+class TransientCgroup:
+    """Leaf cgroup v2 holding one adapter process, removed once the process has exited."""
+
+    path: Path
+    enforced: List[str] = field(default_factory=list)
+
+    @classmethod
+    def create(
+        cls, limits: ResourceLimits, cpus: Tuple[int, ...] | None, parent: Path | None = None
+    ) -> "TransientCgroup | None":
+        """Create a cgroup applying ``limits``; ``None`` when cgroup v2 is not usable here.
+
+        Limits whose controller cannot be enabled in the parent are left unenforced and
+        missing from :attr:`enforced` rather than failing the step.
+        """
+        parent = parent if parent is not None else delegated_cgroup()
+        if parent is None:
+            return None
+        name = f"rr-{os.getpid()}-{threading.get_native_id()}-{next(_CGROUP_SEQUENCE)}"
+        path = parent / name
+        try:
+            path.mkdir()
+        except OSError:
+            return None
+        group = cls(path)
+        wanted: Dict[str, List[Tuple[str, str]]] = {}
+        if limits.memory_max is not None:
+            wanted["memory"] = [("memory.max", str(limits.memory_max))]
+        if cpus is not None:
+            settings = [("cpuset.cpus", ",".join(str(cpu) for cpu in cpus))]
+            if limits.numa_node is not None:
+                settings.append(("cpuset.mems", str(limits.numa_node)))
+            wanted["cpuset"] = settings
+        for controller, settings in wanted.items():
+            if group._enable(parent, controller) and all(
+                group._write(file_name, value) for file_name, value in settings
+            ):
+                group.enforced.append(controller)
+        return group
+
+    def _enable(self, parent: Path, controller: str) -> bool:
+        try:
+            enabled = (parent / "cgroup.subtree_control").read_text(encoding="utf-8").split()
+            if controller not in enabled:
+                (parent / "cgroup.subtree_control").write_text(f"+{controller}", encoding="utf-8")
+        except OSError:
+            # Typically EBUSY: the parent still holds processes (cgroup v2's
+            # no-internal-processes rule) or the controller is not delegated to us.
+            return False
+        return True
+
+    def _write(self, file_name: str, value: str) -> bool:
+        try:
+            (self.path / file_name).write_text(value, encoding="utf-8")
+        except OSError:
+            return False
+        return True
+
+    def add(self, pid: int) -> bool:
+        return self._write("cgroup.procs", str(pid))
+
+    def usage(self, fallback: ResourceUsage | None) -> ResourceUsage | None:
+        """Overlay the cgroup's CPU and I/O totals, which include every descendant process."""
+        stats = _read_flat_keyed(self.path / "cpu.stat")
+        if "user_usec" not in stats or "system_usec" not in stats:
+            return fallback
+        read_bytes = write_bytes = 0
+        try:
+            for line in (self.path / "io.stat").read_text(encoding="utf-8").splitlines():
+                for item in line.split()[1:]:
+                    key, _, value = item.partition("=")
+                    if key == "rbytes":
+                        read_bytes += int(value)
+                    elif key == "wbytes":
+                        write_bytes += int(value)
+        except (OSError, ValueError):
+            if fallback is not None:
+                read_bytes, write_bytes = fallback.read_bytes, fallback.write_bytes
+        base = fallback or ResourceUsage(0.0, 0.0, 0, 0, 0, 0, 0)
+        return replace(
+            base,
+            user_cpu_s=stats["user_usec"] / 1e6,
+            sys_cpu_s=stats["system_usec"] / 1e6,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            source="cgroup",
+        )
+
+    def remove(self) -> None:
+        # Descendants that outlived the adapter would keep the cgroup busy; cgroup.kill
+        # only exists on Linux 5.14 and later.
+        if (self.path / "cgroup.kill").exists():
+            self._write("cgroup.kill", "1")
+        with suppress(OSError):
+            self.path.rmdir()
+
+
+def _read_flat_keyed(path: Path) -> Dict[str, int]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    values: Dict[str, int] = {}
+    for line in lines:
+        key, _, value = line.partition(" ")
+        if value.strip().isdigit():
+            values[key] = int(value)
+    return values
+
+
+@dataclass(slots=True)
+class Placement:
+    """Where an adapter process actually ran and which limits were enforced."""
+
+    cpus: Tuple[int, ...] | None = None
+    numa_node: int | None = None
+    memory_max: int | None = None
+    affinity: bool = False
+    cgroup: str | None = None
+    cgroup_controllers: Tuple[str, ...] = ()
@@ -0,0 +1,170 @@
+"""Retention policies for run directories: selection, sizing, deletion and archiving."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+from .catalog import RunCatalog
+from .exceptions import ValidationError
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass(slots=True)
+class RunEntry:
+    run_id: str
+    path: Path
+    created: float
+    size: int | None = None
+
+
+def list_runs(runs_path: Path, catalog: RunCatalog | None = None) -> List[RunEntry]:
+    """Return run directories newest first.
+
+    Creation times come from the catalog when it indexes a run; other runs fall back to the
+    modification time of their ``summary.json``.
+    """
+    indexed: Dict[str, float] = {}
+    if catalog is not None and catalog.path.exists():
+        for row in catalog.query_runs():
+            if row["created_at"]:
+                indexed[row["run_id"]] = _parse_timestamp(row["created_at"])
+    entries: List[RunEntry] = []
+    if not runs_path.is_dir():
+        return entries
+    with os.scandir(runs_path) as scan:
+        for entry in scan:
+            if not entry.name.startswith("rr-") or not entry.is_dir(follow_symlinks=False):
+                continue
+            created = indexed.get(entry.name)
+            if created is None:
+                try:
+                    created = os.stat(os.path.join(entry.path, "summary.json")).st_mtime
+                except FileNotFoundError:
+                    continue
+            entries.append(RunEntry(entry.name, Path(entry.path), created))
+    entries.sort(key=lambda item: (item.created, item.run_id), reverse=True)
+    return entries
+
+
+def _parse_timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def directory_size(path: Path) -> int:
+    """Sum file sizes below ``path`` with an explicit ``os.scandir`` stack (no per-file Path)."""
+    total = 0
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            scan = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with scan:
+            for entry in scan:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except FileNotFoundError:
+                    continue
+    return total
+
+
+def measure_sizes(entries: Sequence[RunEntry], workers: int = DEFAULT_WORKERS) -> None:
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rr-size") as pool:
+        sizes = pool.map(directory_size, (entry.path for entry in entries))
+        for entry, size in zip(entries, sizes, strict=True):
+            entry.size = size
+
+
+def select_runs(
+    entries: Sequence[RunEntry],
+    older_than_days: int | None = None,
+    keep_last: int | None = None,
+    max_bytes: int | None = None,
+    now: float | None = None,
+) -> List[RunEntry]:
+    """Pick runs to remove from ``entries`` (newest first), oldest first in the result.
+
+    The ``keep_last`` newest runs are never selected. Runs older than ``older_than_days`` are
+    selected, then further old runs until the remaining runs fit in ``max_bytes`` (which
+    requires sizes from :func:`measure_sizes`).
+    """
+    protected = max(keep_last or 0, 0)
+    candidates = list(entries[protected:])
+    selected: Dict[str, RunEntry] = {}
+    if older_than_days is not None:
+        cutoff = (now if now is not None else time.time()) - older_than_days * 86400
+        for entry in candidates:
+            if entry.created < cutoff:
+                selected[entry.run_id] = entry
+    elif max_bytes is None:
+        selected = {entry.run_id: entry for entry in candidates}
+    if max_bytes is not None:
+        remaining = sum(entry.size or 0 for entry in entries if entry.run_id not in selected)
+        for entry in reversed(candidates):
+            if remaining <= max_bytes:
+                break
+            if entry.run_id in selected:
+                continue
+            selected[entry.run_id] = entry
+            remaining -= entry.size or 0
+    return sorted(selected.values(), key=lambda item: (item.created, item.run_id))
+
+
+def delete_runs(entries: Iterable[RunEntry], workers: int = DEFAULT_WORKERS) -> None:
+    """Delete run directories, fanning out over their sub-run directories.
+
+    Most of the files live under ``subruns/``, so sub-run trees are removed in parallel
+    first and each (now small) run directory afterwards.
+    """
+    entries = list(entries)
+    subrun_dirs: List[str] = []
+    for entry in entries:
+        try:
+            with os.scandir(entry.path / "subruns") as scan:
+                subrun_dirs.extend(item.path for item in scan if item.is_dir(follow_symlinks=False))
+        except FileNotFoundError:
+            continue
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rr-clean") as pool:
+        list(pool.map(_remove_tree, subrun_dirs))
+        list(pool.map(_remove_tree, (os.fspath(entry.path) for entry in entries)))
+
+
+def _remove_tree(path: str) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def archive_runs(entries: Sequence[RunEntry], archive_path: Path) -> Path:
+    """Pack run directories into one compressed tarball, each under its run id.
+
+    An existing archive is never replaced: it may hold the only copy of runs an earlier
+    ``clean`` already deleted.
+    """
+    if archive_path.exists():
+        raise ValidationError(f"archive {archive_path} already exists; refusing to overwrite it")
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = archive_path.with_name(f".{archive_path.name}.partial")
+    try:
+        with tarfile.open(partial, "w:gz") as archive:
+            for entry in entries:
+                archive.add(entry.path, arcname=entry.run_id)
+        # Unlike rename, link fails if an archive of the same name appeared meanwhile.
+        os.link(partial, archive_path)
+    except FileExistsError as exc:
+        raise ValidationError(
+            f"archive {archive_path} already exists; refusing to overwrite it"
+        ) from exc
+    finally:
+        partial.unlink(missing_ok=True)
+    return archive_path
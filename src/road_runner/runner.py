@@ -2,29 +2,90 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
+import itertools
+import logging
 import os
+import shutil
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    overload,
+)
 
-from .adapters import AdapterExecutor, AdapterRegistry
-from .artifacts import LDJSONLogger, RunPaths, sanitize, timestamp_now, write_summary
-from .config import load_flow, load_margin_profile, load_safety_policy
-from .exceptions import AdapterExecutionError
+from .adapters import AdapterExecutor, AdapterRegistry, AdapterResult, AsyncAdapterExecutor
+from .artifacts import (
+    FlushPolicy,
+    LDJSONLogger,
+    RunPaths,
+    SubRunDetails,
+    check_log_compression,
+    compressed_log_path,
+    load_plan_header,
+    sanitize,
+    subrun_rollup,
+    timestamp_now,
+    write_subrun_index,
+    write_summary,
+)
+from .cache import SEED_GENERATED_ENV, ResultCache
+from .catalog import CATALOG_FILE_NAME, RunCatalog
+from .config import (
+    load_flow,
+    load_margin_profile,
+    load_safety_policy,
+    parse_safety_policy,
+)
+from .exceptions import AdapterExecutionError, AdapterTimeoutError, ValidationError
+from .exporter import export_columns
 from .models import (
     FlowDefinition,
     FlowStep,
     MarginPoint,
+    MarginPoints,
     MarginProfile,
     SafetyPolicy,
     TargetMargins,
 )
 from .paths import adapters_dir, policy_file, runs_dir
+from .resources import resolve_cpus, total_usage
+from .search import BoundarySearch
 from .sysinfo import collect_sysinfo
-from .utils import dump_json, ensure_seed
+from .telemetry import TelemetrySampler, system_channels
+from .utils import dump_json, dump_json_stream, ensure_seed, read_json
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+_logger = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -51,7 +112,76 @@ class RunPlan:
     margin_profile: MarginProfile
     safety_policy: SafetyPolicy
     seed: int
-    subruns: List[SubRunPlan] = field(default_factory=list)
+    subruns: Sequence[SubRunPlan] = field(default_factory=list)
+    # True when neither the caller nor the margin profile chose the seed.
+    seed_generated: bool = False
+
+
+class SubRunPlans(Sequence[SubRunPlan]):
+    """Sub-run plans produced on demand from a lazy margin point sequence.
+
+    Invocation lists depend only on the flow, so they are expanded once and shared by
+    every sub-run instead of being copied per margin point.
+    """
+
+    __slots__ = ("_parent_id", "_points", "_steps", "_invocations")
+
+    def __init__(self, parent_id: str, points: MarginPoints, steps: Sequence[FlowStep]) -> None:
+        self._parent_id = parent_id
+        self._points = points
+        self._steps = tuple(steps)
+        self._invocations = [list(step.expanded_parameters()) for step in self._steps]
+
+    @property
+    def points(self) -> MarginPoints:
+        return self._points
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    @overload
+    def __getitem__(self, index: int) -> SubRunPlan: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SubRunPlan]: ...
+
+    def __getitem__(self, index: int | slice) -> SubRunPlan | List[SubRunPlan]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._build(index, self._points[index])
+
+    def __iter__(self) -> Iterator[SubRunPlan]:
+        for index, point in enumerate(self._points):
+            yield self._build(index, point)
+
+    def _build(self, index: int, point: MarginPoint) -> SubRunPlan:
+        step_plans = [
+            StepPlan(
+                step=step,
+                invocations=invocations,
+                margin=_apply_margin_for_step(point, step.adapter),
+            )
+            for step, invocations in zip(self._steps, self._invocations, strict=True)
+        ]
+        return SubRunPlan(
+            identifier=f"{self._parent_id}-s{index:02d}",
+            margin_point=point,
+            steps=step_plans,
+        )
+
+
+@dataclass(slots=True)
+class RunContext:
+    """Per-execution state shared by every sub-run of a run."""
+
+    plan: RunPlan
+    paths: RunPaths
+    unit: str | None = None
+    resume: bool = False
+    log_compression: str = "none"
+    telemetry_interval_s: float | None = None
 
 
 def _default_margin_profile() -> MarginProfile:
@@ -81,11 +211,93 @@ def _apply_margin_for_step(point: MarginPoint, adapter: str) -> Dict[str, Any]:
     return combined
 
 
-def _validate_safety(policy: SafetyPolicy, values: Mapping[str, Any]) -> None:
-    for name, value in values.items():
-        if name == "jitter":
-            continue
-        policy.validate_value(name, value)
+EXECUTION_BACKENDS = ("thread", "process")
+
+
+def _create_pool(backend: str, workers: int) -> Executor:
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rr-subrun")
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+FINISHED_STATUSES = ("PASS", "FAIL", "TIMEOUT")
+SKIPPED_STATUS = "SKIPPED"
+
+DEFAULT_STEP_WORKERS = 4
+
+
+def _finished_subrun(run_paths: RunPaths, subrun_id: str) -> Dict[str, Any] | None:
+    summary_path = run_paths.subrun_summary(subrun_id)
+    if not summary_path.exists():
+        return None
+    try:
+        sub_summary: Dict[str, Any] = read_json(summary_path)
+    except ValueError:
+        return None
+    return sub_summary if sub_summary.get("status") in FINISHED_STATUSES else None
+
+
+def _execute_subrun_task(
+    runner: "Runner", context: RunContext, subplan: SubRunPlan
+) -> Dict[str, Any]:
+    if context.resume:
+        finished = _finished_subrun(context.paths, subplan.identifier)
+        if finished is not None:
+            return finished
+        # Discard artifacts of a partially executed sub-run before running it again.
+        shutil.rmtree(context.paths.subrun_dir(subplan.identifier), ignore_errors=True)
+    return runner._execute_subrun(context, subplan)
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _ordered_map(
+    pool: Executor, func: Callable[[_T], _R], items: Iterable[_T], window: int
+) -> Iterator[_R]:
+    """Like ``Executor.map`` but keeps at most ``window`` tasks in flight.
+
+    Items are pulled lazily, so huge sweeps never queue every sub-run at once, and results
+    are yielded in submission order.
+    """
+    pending: Deque[Future[_R]] = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _AdapterLoop:
+    """Event loop on a daemon thread that drives every adapter process of a runner.
+
+    The loop starts on first use. Copies sent to process-backend workers arrive unstarted,
+    so each worker process drives its own adapters from one loop of its own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def run(self, coroutine: Coroutine[Any, Any, _R]) -> _R:
+        """Run ``coroutine`` on the loop and block the calling thread until it finishes."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="rr-adapter-loop", daemon=True
+                ).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
 
 
 class Runner:
@@ -94,12 +306,35 @@ class Runner:
         adapters_path: Path | None = None,
         runs_path: Path | None = None,
         safety_policy_path: Path | None = None,
+        log_policy: FlushPolicy | None = None,
+        result_cache: ResultCache | None = None,
+        catalog_path: Path | None = None,
+        async_adapters: bool = False,
     ) -> None:
         self._adapters_path = adapters_path or adapters_dir()
         self._runs_path = runs_path or runs_dir()
         self._safety_policy_path = safety_policy_path or policy_file()
+        self._log_policy = log_policy or FlushPolicy()
         self._registry = AdapterRegistry(self._adapters_path)
-        self._executor = AdapterExecutor(self._registry)
+        self._executor = AdapterExecutor(self._registry, cache=result_cache)
+        self._async_executor = AsyncAdapterExecutor(self._registry, cache=result_cache)
+        # With async_adapters, every invocation of every sub-run and step is handed to one
+        # event loop instead of blocking its worker thread on the child.
+        self._adapter_loop = _AdapterLoop() if async_adapters else None
+        self._catalog = RunCatalog(catalog_path or self._runs_path / CATALOG_FILE_NAME)
+
+    @property
+    def catalog(self) -> RunCatalog:
+        return self._catalog
+
+    @property
+    def async_executor(self) -> AsyncAdapterExecutor:
+        """The executor adapters run through when ``async_adapters`` is set.
+
+        Subscribe to it to receive every adapter's output live, tagged
+        ``<sub-run id>/<step>``.
+        """
+        return self._async_executor
 
     def plan(
         self,
@@ -107,34 +342,38 @@ class Runner:
         margin_path: Path | None = None,
         safety_policy: SafetyPolicy | None = None,
         safety_source: str | None = None,
+        parent_id: str | None = None,
+        seed: int | None = None,
     ) -> RunPlan:
         flow = load_flow(flow_path)
-        margin_profile = load_margin_profile(margin_path) if margin_path else _default_margin_profile()
+        margin_profile = (
+            load_margin_profile(margin_path) if margin_path else _default_margin_profile()
+        )
         safety = safety_policy or load_safety_policy(self._safety_policy_path)
         safety_identifier = (
             safety_source if safety_source is not None else self._safety_policy_path.as_posix()
         )
 
-        seed = ensure_seed(margin_profile.global_seed)
-        parent_id = _generate_parent_run_id(flow_path, seed)
-
-        points = margin_profile.expand_points()
-        subruns: List[SubRunPlan] = []
-        for index, point in enumerate(points):
-            for values in point.values.values():
-                _validate_safety(safety, values)
-            identifier = f"{parent_id}-s{index:02d}"
-            step_plans: List[StepPlan] = []
-            for step in flow.steps:
-                step_margin = _apply_margin_for_step(point, step.adapter)
-                _validate_safety(safety, step_margin)
-                for parameter_key, parameter_value in step.parameters.items():
-                    _validate_safety(safety, {parameter_key: parameter_value})
-                for key, values in step.sweeps.items():
-                    _validate_safety(safety, {key: list(values)})
-                invocations = list(step.expanded_parameters())
-                step_plans.append(StepPlan(step=step, invocations=invocations, margin=step_margin))
-            subruns.append(SubRunPlan(identifier=identifier, margin_point=point, steps=step_plans))
+        seed_generated = seed is None and margin_profile.global_seed is None
+        seed = ensure_seed(seed if seed is not None else margin_profile.global_seed)
+        parent_id = parent_id or _generate_parent_run_id(flow_path, seed)
+
+        # Every planned value is drawn from one of these axes, so validating them covers the
+        # whole Cartesian grid in O(sum of axis lengths).
+        safety.validate_grid(
+            itertools.chain(
+                margin_profile.value_axes(),
+                *(step.value_axes() for step in flow.steps),
+            )
+        )
+        # CPU lists and NUMA nodes are host specific; checking them here keeps a bad node
+        # from failing the run at the first invocation that uses it.
+        for step in flow.steps:
+            try:
+                resolve_cpus(self._registry.get(step.adapter).limits.merged(step.limits))
+            except ValidationError as exc:
+                raise ValidationError(f"step '{step.name}': {exc}") from exc
+        subruns = SubRunPlans(parent_id, margin_profile.expand_points(), flow.steps)
 
         return RunPlan(
             parent_id=parent_id,
@@ -146,6 +385,76 @@ class Runner:
             safety_policy=safety,
             seed=seed,
             subruns=subruns,
+            seed_generated=seed_generated,
+        )
+
+    def plan_from_run(self, run_id: str) -> RunPlan:
+        """Rebuild the plan of an existing run from its recorded plan header.
+
+        The flow and margin files must be unchanged since the run was planned, otherwise the
+        regenerated sub-runs would not line up with the artifacts already on disk.
+        """
+        run_paths = RunPaths(parent_id=run_id, base_dir=self._runs_path)
+        if not (run_paths.plan_header_path.exists() or run_paths.plan_path.exists()):
+            raise ValidationError(f"plan not found for run {run_id}")
+        recorded = load_plan_header(run_paths)
+        flow_path = Path(recorded["flow"]["path"])
+        margin_value = recorded["margin"]["path"]
+        margin_path = Path(margin_value) if margin_value else None
+        for label, path, digest in (
+            ("flow", flow_path, recorded["flow"].get("sha256")),
+            ("margin profile", margin_path, recorded["margin"].get("sha256")),
+        ):
+            if path is None:
+                continue
+            if not path.exists():
+                raise ValidationError(f"{label} {path} recorded by run {run_id} not found")
+            if digest is not None and _file_digest(path) != digest:
+                raise ValidationError(f"{label} {path} changed since run {run_id} was planned")
+        safety_payload = recorded["safety_policy"]
+        safety = parse_safety_policy(
+            {
+                "metadata": safety_payload.get("metadata", {}),
+                "avt_bounds": safety_payload.get("avt_bounds", {}),
+                "behavior": safety_payload.get("behavior", {}),
+            },
+            f"{run_paths.plan_header_path} safety_policy",
+        )
+        plan = self.plan(
+            flow_path=flow_path,
+            margin_path=margin_path,
+            safety_policy=safety,
+            safety_source=safety_payload.get("source"),
+            parent_id=run_id,
+            seed=recorded["seed"],
+        )
+        plan.seed_generated = bool(recorded.get("seed_generated", False))
+        expected = recorded["subrun_count"]
+        if expected != len(plan.subruns):
+            raise ValidationError(
+                f"run {run_id} planned {expected} sub-runs but the inputs now expand to "
+                f"{len(plan.subruns)}"
+            )
+        return plan
+
+    def resume(
+        self,
+        run_id: str,
+        parallel: int = 1,
+        backend: str = "thread",
+    ) -> Dict[str, Any]:
+        """Finish an interrupted run in place, re-executing only missing or partial sub-runs."""
+        plan = self.plan_from_run(run_id)
+        run_paths = RunPaths(parent_id=run_id, base_dir=self._runs_path)
+        previous = read_json(run_paths.summary_path) if run_paths.summary_path.exists() else {}
+        return self.execute(
+            plan,
+            unit=previous.get("unit"),
+            parallel=parallel,
+            backend=backend,
+            resume=True,
+            log_compression=previous.get("log_compression", "none"),
+            telemetry_interval_s=previous.get("telemetry_interval_s"),
         )
 
     def execute(
@@ -154,32 +463,44 @@ class Runner:
         unit: str | None = None,
         dry_run: bool = False,
         sysinfo_override: Dict[str, str] | None = None,
+        parallel: int = 1,
+        backend: str = "thread",
+        resume: bool = False,
+        log_compression: str = "none",
+        telemetry_interval_s: float | None = None,
+        full_plan: bool = False,
     ) -> Dict[str, Any]:
+        """Run every sub-run of ``plan`` and write its artifacts, summary and reports.
+
+        Only the plan header (seed, digests, axes, ``subrun_count``) is persisted up front,
+        since sub-runs are regenerated from it. ``full_plan`` also writes every planned
+        sub-run to ``plan.json``, which takes time and disk proportional to the sweep.
+        """
+        if parallel < 1:
+            raise ValidationError(f"parallel must be at least 1, got {parallel}")
+        if backend not in EXECUTION_BACKENDS:
+            raise ValidationError(
+                f"unknown execution backend '{backend}' "
+                f"(expected one of {', '.join(EXECUTION_BACKENDS)})"
+            )
+        check_log_compression(log_compression)
+        if telemetry_interval_s is not None and telemetry_interval_s <= 0:
+            raise ValidationError(
+                f"telemetry interval must be positive, got {telemetry_interval_s}"
+            )
         run_base = self._runs_path
         run_paths = RunPaths(parent_id=plan.parent_id, base_dir=run_base)
         run_paths.parent_dir.mkdir(parents=True, exist_ok=True)
 
-        plan_payload = self._serialize_plan(plan)
-        dump_json(plan_payload, run_paths.plan_path)
-
-        sysinfo = sysinfo_override or collect_sysinfo()
-        dump_json(sysinfo, run_paths.sysinfo_path)
-        dump_json(
-            {
-                "source": plan.safety_source,
-                "metadata": dict(plan.safety_policy.metadata),
-                "behavior": dict(plan.safety_policy.behavior),
-                "avt_bounds": {
-                    name: {"min": bound.minimum, "max": bound.maximum}
-                    for name, bound in plan.safety_policy.avt_bounds.items()
-                },
-            },
-            run_paths.safety_policy_path,
-        )
+        previous: Dict[str, Any] = {}
+        if resume and run_paths.summary_path.exists():
+            previous = read_json(run_paths.summary_path)
+        if not resume:
+            self._write_run_inputs(plan, run_paths, sysinfo_override, full_plan)
 
-        summary = {
+        summary: Dict[str, Any] = {
             "run_id": plan.parent_id,
-            "created_at": timestamp_now(),
+            "created_at": previous.get("created_at") or timestamp_now(),
             "unit": unit,
             "seed": plan.seed,
             "dry_run": dry_run,
@@ -193,34 +514,159 @@ class Runner:
                 "metadata": plan.safety_policy.metadata,
             },
             "environment": _environment_block(),
+            "export_columns": export_columns(plan.flow, plan.margin_profile),
+            "log_compression": log_compression,
+            "telemetry_interval_s": telemetry_interval_s,
+            "state": "complete" if dry_run else "running",
             "subruns": [],
         }
+        if resume:
+            summary["resumed_at"] = [*previous.get("resumed_at", []), timestamp_now()]
 
         write_summary(run_paths.summary_path, summary)
+        self._record_in_catalog(summary)
 
         if dry_run:
             return summary
 
-        for subplan in plan.subruns:
-            sub_summary = self._execute_subrun(plan, subplan, run_paths)
-            summary["subruns"].append(sub_summary)
-            write_summary(run_paths.summary_path, summary)
+        # Rollups of completed sub-runs are appended to a journal instead of rewriting
+        # summary.json each time; the parent summary is compacted once at the end (see
+        # load_run_summary). Step details only live in each sub-run's own summary.json.
+        # On resume the journal is rebuilt in plan order from finished sub-runs plus the
+        # re-executed ones.
+        run_paths.subrun_journal_path.unlink(missing_ok=True)
+        run_paths.subrun_index_path.unlink(missing_ok=True)
+        journal_policy = FlushPolicy(fsync=True)
+        context = RunContext(
+            plan=plan,
+            paths=run_paths,
+            unit=unit,
+            resume=resume,
+            log_compression=log_compression,
+            telemetry_interval_s=telemetry_interval_s,
+        )
+        search_axis = plan.margin_profile.search_axis()
+        search: BoundarySearch | None = None
+        if search_axis is not None:
+            search = BoundarySearch(search_axis[2].strategy, search_axis[2].values)
+            results = self._iter_search_results(context, search)
+        else:
+            results = self._iter_subrun_results(context, parallel, backend)
+        with LDJSONLogger(run_paths.subrun_journal_path, journal_policy) as journal:
+            for sub_summary in results:
+                rollup = subrun_rollup(sub_summary, run_paths)
+                journal.append(rollup)
+                summary["subruns"].append(rollup)
+        write_subrun_index(run_paths)
+
+        if search_axis is not None and search is not None:
+            target_name, parameter, _ = search_axis
+            summary["search"] = {"target": target_name, "parameter": parameter, **search.result()}
+        summary["log_bytes"] = {
+            kind: sum(sub.get("log_bytes", {}).get(kind, 0) for sub in summary["subruns"])
+            for kind in ("raw", "stored")
+        }
+        summary["state"] = "complete"
+        summary["completed_at"] = timestamp_now()
+        write_summary(run_paths.summary_path, summary)
 
         from .reporting import render_reports
 
-        render_reports(summary, summary["subruns"], run_paths)
+        # Step details are read back from the sub-run summaries one page at a time.
+        with SubRunDetails(run_paths, summary["subruns"]) as details:
+            render_reports(summary, details, run_paths)
+            self._record_in_catalog(summary, details)
         return summary
 
-    def _execute_subrun(
+    def _record_in_catalog(
+        self, summary: Mapping[str, Any], subruns: Iterable[Mapping[str, Any]] | None = None
+    ) -> None:
+        # The catalog is derived data that ``catalog rebuild`` restores, so a locked database
+        # or a read-only or badly locking filesystem must not fail the run itself.
+        try:
+            self._catalog.record_run(summary, subruns)
+        except sqlite3.Error as exc:
+            _logger.warning(
+                "run %s not recorded in catalog %s (%s); run 'road_runner catalog rebuild'",
+                summary["run_id"],
+                self._catalog.path,
+                exc,
+            )
+
+    def _write_run_inputs(
         self,
         plan: RunPlan,
-        subplan: SubRunPlan,
         run_paths: RunPaths,
-    ) -> Dict[str, Any]:
+        sysinfo_override: Dict[str, str] | None,
+        full_plan: bool = False,
+    ) -> None:
+        header = self._serialize_plan(plan)
+        dump_json(header, run_paths.plan_header_path)
+        if full_plan:
+            dump_json_stream(
+                header,
+                "subruns",
+                (_serialize_subrun(sub) for sub in plan.subruns),
+                run_paths.plan_path,
+            )
+
+        sysinfo = sysinfo_override or collect_sysinfo()
+        dump_json(sysinfo, run_paths.sysinfo_path)
+        dump_json(
+            {
+                "source": plan.safety_source,
+                "metadata": dict(plan.safety_policy.metadata),
+                "behavior": dict(plan.safety_policy.behavior),
+                "avt_bounds": {
+                    name: {"min": bound.minimum, "max": bound.maximum}
+                    for name, bound in plan.safety_policy.avt_bounds.items()
+                },
+            },
+            run_paths.safety_policy_path,
+        )
+
+    def _iter_subrun_results(
+        self,
+        context: RunContext,
+        parallel: int,
+        backend: str,
+    ) -> Iterator[Dict[str, Any]]:
+        subruns = context.plan.subruns
+        task = functools.partial(_execute_subrun_task, self, context)
+        if parallel == 1 or len(subruns) <= 1:
+            yield from map(task, subruns)
+            return
+        # Results are yielded in submission order, so the summary stays ordered by
+        # sub-run id no matter which worker finishes first.
+        workers = min(parallel, len(subruns))
+        with _create_pool(backend, workers) as pool:
+            yield from _ordered_map(pool, task, subruns, window=workers * 2)
+
+    def _iter_search_results(
+        self,
+        context: RunContext,
+        search: BoundarySearch,
+    ) -> Iterator[Dict[str, Any]]:
+        # Each probe depends on the previous outcome, so search sub-runs execute one at a
+        # time regardless of --parallel.
+        index = search.next_index()
+        while index is not None:
+            subplan = context.plan.subruns[index]
+            sub_summary = _execute_subrun_task(self, context, subplan)
+            search.record(
+                index,
+                sub_summary["status"] == "PASS",
+                subrun=subplan.identifier,
+                status=sub_summary["status"],
+            )
+            yield sub_summary
+            index = search.next_index()
+
+    def _execute_subrun(self, context: RunContext, subplan: SubRunPlan) -> Dict[str, Any]:
+        run_paths = context.paths
         start = time.monotonic()
         sub_dir = run_paths.subrun_dir(subplan.identifier)
         sub_dir.mkdir(parents=True, exist_ok=True)
-        ldjson_logger = LDJSONLogger(run_paths.subrun_ldjson(subplan.identifier))
         sub_summary: Dict[str, Any] = {
             "run_id": subplan.identifier,
             "margin": {
@@ -231,85 +677,337 @@ class Runner:
             "started_at": timestamp_now(),
             "steps": [],
         }
-        status = "PASS"
-        for step_index, step_plan in enumerate(subplan.steps):
-            for invocation_index, parameters in enumerate(step_plan.invocations):
-                step_label = (
-                    step_plan.step.name
-                    if len(step_plan.invocations) == 1
-                    else f"{step_plan.step.name}[{invocation_index}]"
-                )
-                record_base = {
-                    "event": "step",
-                    "run_id": subplan.identifier,
-                    "step": step_label,
-                    "adapter": step_plan.step.adapter,
-                    "parameters": parameters,
-                }
-                ldjson_logger.append({**record_base, "action": "start", "timestamp": timestamp_now()})
-                step_start = time.monotonic()
-                stdout_path = run_paths.step_stdout(
-                    subplan.identifier, step_plan.step.name, step_index, invocation_index
+        ldjson_path = run_paths.subrun_ldjson(subplan.identifier)
+        with LDJSONLogger(ldjson_path, self._log_policy) as ldjson_logger:
+            if context.plan.flow.scheduled:
+                step_records = self._execute_step_graph(context, subplan, ldjson_logger)
+            else:
+                step_records = []
+                for step_index, step_plan in enumerate(subplan.steps):
+                    records = self._execute_step(
+                        context, subplan, step_plan, step_index, ldjson_logger
+                    )
+                    step_records.append(records)
+                    if _step_status(records) != "PASS":
+                        break
+        sub_summary["steps"] = [record for records in step_records for record in records]
+        # The first failure in flow order decides the status; skipped steps only follow it.
+        status = next(
+            (
+                step["status"]
+                for step in sub_summary["steps"]
+                if step["status"] not in ("PASS", SKIPPED_STATUS)
+            ),
+            "PASS",
+        )
+        sub_summary["status"] = status
+        sub_summary["duration_s"] = time.monotonic() - start
+        sub_summary["log_bytes"] = _total_log_bytes(sub_summary["steps"])
+        sub_summary["resources"] = total_usage(
+            step.get("resources") for step in sub_summary["steps"]
+        )
+        sub_summary["completed_at"] = timestamp_now()
+        sub_summary_path = run_paths.subrun_summary(subplan.identifier)
+        write_summary(sub_summary_path, sub_summary)
+        return sub_summary
+
+    def _execute_step(
+        self,
+        context: RunContext,
+        subplan: SubRunPlan,
+        step_plan: StepPlan,
+        step_index: int,
+        ldjson_logger: LDJSONLogger,
+    ) -> List[Dict[str, Any]]:
+        """Run a step's invocations, stopping at the first one that does not pass.
+
+        With ``concurrency`` above 1, up to that many invocations run at once. Each one
+        buffers its LDJSON records, and the buffers are written in invocation order, so
+        ``steps.ldjson`` reads the same as a sequential run. After a failure no new
+        invocations start; those already in flight finish and are recorded.
+        """
+        invocations = step_plan.invocations
+        workers = min(step_plan.step.concurrency, len(invocations))
+        records: List[Dict[str, Any]] = []
+        if workers <= 1:
+            for invocation_index, parameters in enumerate(invocations):
+                record = self._execute_invocation(
+                    context,
+                    subplan,
+                    step_plan,
+                    step_index,
+                    invocation_index,
+                    parameters,
+                    ldjson_logger,
                 )
-                stderr_path = run_paths.step_stderr(
-                    subplan.identifier, step_plan.step.name, step_index, invocation_index
+                records.append(record)
+                if record["status"] != "PASS":
+                    break
+            return records
+
+        failed = False
+
+        def remaining() -> Iterator[Tuple[int, Dict[str, Any]]]:
+            for item in enumerate(invocations):
+                if failed:
+                    return
+                yield item
+
+        def invoke(item: Tuple[int, Dict[str, Any]]) -> Tuple[Dict[str, Any], _RecordBuffer]:
+            buffer = _RecordBuffer()
+            record = self._execute_invocation(
+                context, subplan, step_plan, step_index, item[0], item[1], buffer
+            )
+            return record, buffer
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rr-invoke") as pool:
+            for record, buffer in _ordered_map(pool, invoke, remaining(), window=workers):
+                buffer.replay(ldjson_logger)
+                records.append(record)
+                if record["status"] != "PASS":
+                    failed = True
+        return records
+
+    def _execute_step_graph(
+        self,
+        context: RunContext,
+        subplan: SubRunPlan,
+        ldjson_logger: LDJSONLogger,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run a sub-run's steps as a DAG on a bounded thread pool.
+
+        A step starts once every step it depends on has passed. When a step fails or times
+        out, only its transitive dependents are skipped; independent branches keep running.
+        Records are returned per step in flow order regardless of completion order.
+        """
+        flow = context.plan.flow
+        dependencies = flow.step_dependencies()
+        dependents: List[List[int]] = [[] for _ in dependencies]
+        for index, required in enumerate(dependencies):
+            for dependency in required:
+                dependents[dependency].append(index)
+        waiting = [len(required) for required in dependencies]
+        records: List[List[Dict[str, Any]] | None] = [None] * len(dependencies)
+        workers = min(flow.max_parallel_steps or DEFAULT_STEP_WORKERS, len(dependencies))
+
+        def skip(index: int, cause: int, cause_status: str) -> None:
+            pending = [(index, cause, cause_status)]
+            while pending:
+                current, cause, cause_status = pending.pop()
+                if records[current] is not None:
+                    continue
+                records[current] = [
+                    self._skipped_step_record(
+                        subplan,
+                        subplan.steps[current],
+                        subplan.steps[cause],
+                        cause_status,
+                        ldjson_logger,
+                    )
+                ]
+                pending.extend(
+                    (dependent, current, SKIPPED_STATUS) for dependent in dependents[current]
                 )
-                result_status = "PASS"
-                error_message: str | None = None
-                try:
-                    env = _build_step_environment(
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rr-step") as pool:
+            running: Dict[Future[List[Dict[str, Any]]], int] = {}
+
+            def submit(index: int) -> None:
+                running[
+                    pool.submit(
+                        self._execute_step,
+                        context,
                         subplan,
-                        plan,
-                        step_plan,
-                        parameters,
+                        subplan.steps[index],
+                        index,
+                        ldjson_logger,
                     )
-                    self._executor.run(
+                ] = index
+
+            for index, count in enumerate(waiting):
+                if count == 0:
+                    submit(index)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=running.__getitem__):
+                    index = running.pop(future)
+                    step_records = future.result()
+                    records[index] = step_records
+                    status = _step_status(step_records)
+                    for dependent in dependents[index]:
+                        if status != "PASS":
+                            skip(dependent, index, status)
+                            continue
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and records[dependent] is None:
+                            submit(dependent)
+        return [step_records or [] for step_records in records]
+
+    def _skipped_step_record(
+        self,
+        subplan: SubRunPlan,
+        step_plan: StepPlan,
+        cause: StepPlan,
+        cause_status: str,
+        ldjson_logger: LDJSONLogger,
+    ) -> Dict[str, Any]:
+        error = f"dependency '{cause.step.name}' {cause_status.lower()}"
+        ldjson_logger.append(
+            {
+                "event": "step",
+                "run_id": subplan.identifier,
+                "step": step_plan.step.name,
+                "adapter": step_plan.step.adapter,
+                "action": "skip",
+                "timestamp": timestamp_now(),
+                "status": SKIPPED_STATUS,
+                "error": error,
+            }
+        )
+        return {
+            "name": step_plan.step.name,
+            "adapter": step_plan.step.adapter,
+            "status": SKIPPED_STATUS,
+            "duration_s": 0.0,
+            "parameters": {},
+            "margin": step_plan.margin,
+            "error": error,
+        }
+
+    def _execute_invocation(
+        self,
+        context: RunContext,
+        subplan: SubRunPlan,
+        step_plan: StepPlan,
+        step_index: int,
+        invocation_index: int,
+        parameters: Dict[str, Any],
+        ldjson_logger: LDJSONLogger | _RecordBuffer,
+    ) -> Dict[str, Any]:
+        run_paths = context.paths
+        step_label = (
+            step_plan.step.name
+            if len(step_plan.invocations) == 1
+            else f"{step_plan.step.name}[{invocation_index}]"
+        )
+        record_base = {
+            "event": "step",
+            "run_id": subplan.identifier,
+            "step": step_label,
+            "adapter": step_plan.step.adapter,
+            "parameters": parameters,
+        }
+        ldjson_logger.append({**record_base, "action": "start", "timestamp": timestamp_now()})
+        step_start = time.monotonic()
+        stdout_path = compressed_log_path(
+            run_paths.step_stdout(
+                subplan.identifier, step_plan.step.name, step_index, invocation_index
+            ),
+            context.log_compression,
+        )
+        stderr_path = compressed_log_path(
+            run_paths.step_stderr(
+                subplan.identifier, step_plan.step.name, step_index, invocation_index
+            ),
+            context.log_compression,
+        )
+        telemetry_path: Path | None = None
+        sampler: TelemetrySampler | None = None
+        if context.telemetry_interval_s is not None:
+            telemetry_path = run_paths.step_telemetry(
+                subplan.identifier, step_plan.step.name, step_index, invocation_index
+            )
+            sampler = TelemetrySampler(system_channels(), context.telemetry_interval_s)
+            sampler.start()
+        result_status = "PASS"
+        error_message: str | None = None
+        result: AdapterResult | None = None
+        try:
+            env = _build_step_environment(
+                subplan,
+                context.plan,
+                step_plan,
+                parameters,
+                unit=context.unit,
+            )
+            if self._adapter_loop is not None:
+                result = self._adapter_loop.run(
+                    self._async_executor.run(
                         step_plan.step.adapter,
                         parameters,
                         stdout_path,
                         stderr_path,
                         env=env,
+                        timeout_s=step_plan.step.timeout_s,
+                        tag=f"{subplan.identifier}/{step_label}",
+                        compression=context.log_compression,
+                        limits=step_plan.step.limits,
                     )
-                except AdapterExecutionError as exc:
-                    result_status = "FAIL"
-                    error_message = str(exc)
-                    status = "FAIL"
-                step_duration = time.monotonic() - step_start
-                ldjson_logger.append(
-                    {
-                        **record_base,
-                        "action": "end",
-                        "timestamp": timestamp_now(),
-                        "status": result_status,
-                        "duration_s": step_duration,
-                        "error": error_message,
-                    }
                 )
-                sub_summary["steps"].append(
-                    {
-                        "name": step_label,
-                        "adapter": step_plan.step.adapter,
-                        "status": result_status,
-                        "duration_s": step_duration,
-                        "parameters": parameters,
-                        "artifacts": {
-                            "stdout": stdout_path.relative_to(run_paths.parent_dir).as_posix(),
-                            "stderr": stderr_path.relative_to(run_paths.parent_dir).as_posix(),
-                        },
-                        "margin": step_plan.margin,
-                        "error": error_message,
-                    }
+            else:
+                result = self._executor.run(
+                    step_plan.step.adapter,
+                    parameters,
+                    stdout_path,
+                    stderr_path,
+                    env=env,
+                    timeout_s=step_plan.step.timeout_s,
+                    compression=context.log_compression,
+                    limits=step_plan.step.limits,
                 )
-                if result_status != "PASS":
-                    break
-            if status != "PASS":
-                break
-        sub_summary["status"] = status
-        sub_summary["duration_s"] = time.monotonic() - start
-        sub_summary["completed_at"] = timestamp_now()
-        sub_summary_path = run_paths.subrun_summary(subplan.identifier)
-        write_summary(sub_summary_path, sub_summary)
-        return sub_summary
+        except AdapterTimeoutError as exc:
+            result_status = "TIMEOUT"
+            error_message = str(exc)
+            result = exc.result
+        except AdapterExecutionError as exc:
+            result_status = "FAIL"
+            error_message = str(exc)
+            result = exc.result
+        finally:
+            if sampler is not None:
+                sampler.stop()
+        step_duration = time.monotonic() - step_start
+        resources = asdict(result.resources) if result and result.resources else None
+        placement = asdict(result.placement) if result and result.placement else None
+        telemetry: Dict[str, Any] | None = None
+        if sampler is not None and telemetry_path is not None:
+            telemetry = {
+                "path": telemetry_path.relative_to(run_paths.parent_dir).as_posix(),
+                **sampler.write(telemetry_path),
+            }
+        ldjson_logger.append(
+            {
+                **record_base,
+                "action": "end",
+                "timestamp": timestamp_now(),
+                "status": result_status,
+                "duration_s": step_duration,
+                "cached": bool(result and result.cached),
+                "resources": resources,
+                "placement": placement,
+                "telemetry": telemetry,
+                "error": error_message,
+            }
+        )
+        return {
+            "name": step_label,
+            "adapter": step_plan.step.adapter,
+            "status": result_status,
+            "duration_s": step_duration,
+            "parameters": parameters,
+            "artifacts": {
+                "stdout": stdout_path.relative_to(run_paths.parent_dir).as_posix(),
+                "stderr": stderr_path.relative_to(run_paths.parent_dir).as_posix(),
+                "compression": context.log_compression,
+                "bytes": _log_byte_counts(result, stdout_path, stderr_path),
+            },
+            "margin": step_plan.margin,
+            "cached": bool(result and result.cached),
+            "resources": resources,
+            "placement": placement,
+            "telemetry": telemetry,
+            "error": error_message,
+        }
 
     def _serialize_plan(self, plan: RunPlan) -> Dict[str, Any]:
         return {
@@ -317,10 +1015,12 @@ class Runner:
             "flow": {
                 "path": plan.flow_path.as_posix(),
                 "metadata": plan.flow.metadata,
+                "sha256": _file_digest(plan.flow_path),
             },
             "margin": {
                 "path": plan.margin_path.as_posix() if plan.margin_path else None,
                 "metadata": plan.margin_profile.metadata,
+                "sha256": _file_digest(plan.margin_path) if plan.margin_path else None,
             },
             "safety_policy": {
                 "source": plan.safety_source,
@@ -332,29 +1032,93 @@ class Runner:
                 },
             },
             "seed": plan.seed,
-            "subruns": [
-                {
-                    "run_id": sub.identifier,
-                    "margin_point": {
-                        "id": sub.margin_point.identifier,
-                        "values": sub.margin_point.values,
-                        "seed": sub.margin_point.seed,
-                    },
-                    "steps": [
-                        {
-                            "name": step.step.name,
-                            "adapter": step.step.adapter,
-                            "margin": step.margin,
-                            "invocations": step.invocations,
-                        }
-                        for step in sub.steps
-                    ],
-                }
-                for sub in plan.subruns
+            "seed_generated": plan.seed_generated,
+            "axes": [
+                {"target": target, "parameter": parameter, "values": list(values)}
+                for target, parameter, values in plan.margin_profile.sweep_axes()
             ],
+            "search": _serialize_search(plan.margin_profile),
+            "subrun_count": len(plan.subruns),
         }
 
 
+def _step_status(records: Sequence[Mapping[str, Any]]) -> str:
+    return next((record["status"] for record in records if record["status"] != "PASS"), "PASS")
+
+
+class _RecordBuffer:
+    """Holds the LDJSON records of one concurrent invocation until it is its turn to log."""
+
+    __slots__ = ("records",)
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+    def replay(self, logger: LDJSONLogger) -> None:
+        for record in self.records:
+            logger.append(record)
+
+
+def _total_log_bytes(steps: Iterable[Mapping[str, Any]]) -> Dict[str, int]:
+    totals = {"raw": 0, "stored": 0}
+    for step in steps:
+        for counts in step.get("artifacts", {}).get("bytes", {}).values():
+            for kind in totals:
+                totals[kind] += counts[kind] or 0
+    return totals
+
+
+def _log_byte_counts(
+    result: AdapterResult | None, stdout_path: Path, stderr_path: Path
+) -> Dict[str, Dict[str, int | None]]:
+    counts: Dict[str, Dict[str, int | None]] = {}
+    for stream, path in (("stdout", stdout_path), ("stderr", stderr_path)):
+        try:
+            stored: int | None = path.stat().st_size
+        except FileNotFoundError:
+            stored = None
+        raw = getattr(result, f"{stream}_bytes") if result is not None else None
+        counts[stream] = {"raw": raw, "stored": stored}
+    return counts
+
+
+def _serialize_search(profile: MarginProfile) -> Dict[str, Any] | None:
+    search_axis = profile.search_axis()
+    if search_axis is None:
+        return None
+    target_name, parameter, search = search_axis
+    return {
+        "target": target_name,
+        "parameter": parameter,
+        "strategy": search.strategy,
+        "values": list(search.values),
+    }
+
+
+def _serialize_subrun(sub: SubRunPlan) -> Dict[str, Any]:
+    return {
+        "run_id": sub.identifier,
+        "margin_point": {
+            "id": sub.margin_point.identifier,
+            "values": sub.margin_point.values,
+            "seed": sub.margin_point.seed,
+        },
+        "steps": [
+            {
+                "name": step.step.name,
+                "adapter": step.step.adapter,
+                "margin": step.margin,
+                "timeout_s": step.step.timeout_s,
+                "invocations": step.invocations,
+            }
+            for step in sub.steps
+        ],
+    }
+
+
 def _environment_block() -> Dict[str, Any]:
     import importlib
     import platform
@@ -381,6 +1145,7 @@ def _build_step_environment(
     plan: RunPlan,
     step_plan: StepPlan,
     parameters: Mapping[str, Any],
+    unit: str | None = None,
 ) -> Dict[str, str]:
     env = dict(os.environ)
     env["RR_RUN_ID"] = plan.parent_id
@@ -396,4 +1161,10 @@ def _build_step_environment(
         env[env_key] = str(value)
     env["RR_MARGIN_POINT"] = subplan.margin_point.identifier
     env["RR_GLOBAL_SEED"] = str(plan.seed)
+    if plan.seed_generated:
+        env[SEED_GENERATED_ENV] = "1"
+    else:
+        env.pop(SEED_GENERATED_ENV, None)
+    if unit:
+        env["RR_UNIT"] = unit
     return env
@@ -0,0 +1,82 @@
+"""Adaptive pass/fail boundary search over a margin axis."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Sequence
+
+from .exceptions import ValidationError
+
+SEARCH_STRATEGIES = ("binary", "golden", "step_down")
+
+# Fraction of the open bracket between the last pass and the first fail at which the golden
+# strategy probes next, measured from the passing side.
+GOLDEN_FRACTION = 1 - (math.sqrt(5) - 1) / 2
+
+
+class BoundarySearch:
+    """Locate the pass/fail edge of candidates ordered from passing towards failing.
+
+    The search assumes a single transition: every candidate before the edge passes and every
+    candidate from it onwards fails. ``binary`` halves the open bracket on each probe,
+    ``golden`` splits it at the golden ratio so probes stay closer to the passing side (fewer
+    runs spent in the failing region for the same O(log N) bound) and ``step_down`` walks the
+    candidates in order until the first failure.
+    """
+
+    def __init__(self, strategy: str, values: Sequence[Any]) -> None:
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValidationError(
+                f"unknown search strategy '{strategy}' "
+                f"(expected one of {', '.join(SEARCH_STRATEGIES)})"
+            )
+        self._strategy = strategy
+        self._values = tuple(values)
+        # Indices of the last candidate known to pass and the first known to fail; the
+        # sentinels -1 and len(values) stand for "not observed yet".
+        self._last_pass = -1
+        self._first_fail = len(self._values)
+        self._trace: List[Dict[str, Any]] = []
+
+    @property
+    def trace(self) -> List[Dict[str, Any]]:
+        return self._trace
+
+    def next_index(self) -> int | None:
+        """Return the next candidate index to probe, or ``None`` once the edge is located."""
+        low, high = self._last_pass, self._first_fail
+        if high - low <= 1:
+            return None
+        if self._strategy == "step_down":
+            return low + 1
+        if self._strategy == "golden":
+            offset = round((high - low) * GOLDEN_FRACTION)
+            return min(max(low + offset, low + 1), high - 1)
+        return (low + high) // 2
+
+    def record(self, index: int, passed: bool, **details: Any) -> None:
+        self._trace.append(
+            {
+                "probe": len(self._trace),
+                "index": index,
+                "value": self._values[index],
+                "passed": passed,
+                **details,
+            }
+        )
+        if passed:
+            self._last_pass = max(self._last_pass, index)
+        else:
+            self._first_fail = min(self._first_fail, index)
+
+    def result(self) -> Dict[str, Any]:
+        last_pass = self._last_pass if self._last_pass >= 0 else None
+        first_fail = self._first_fail if self._first_fail < len(self._values) else None
+        return {
+            "strategy": self._strategy,
+            "candidates": len(self._values),
+            "probes": len(self._trace),
+            "last_pass": None if last_pass is None else self._values[last_pass],
+            "first_fail": None if first_fail is None else self._values[first_fail],
+            "trace": self._trace,
+        }
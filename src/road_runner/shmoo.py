@@ -0,0 +1,193 @@
+"""Pass/fail shmoo grids over the swept margin axes of a run."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from html import escape
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .artifacts import RunPaths, load_plan_header
+
+# When a cell aggregates several sub-runs (grids with more than two axes) the most severe
+# status is shown.
+STATUS_SEVERITY = {"PASS": 0, "FAIL": 2, "TIMEOUT": 3}
+_UNKNOWN_SEVERITY = 1
+
+STATUS_GLYPHS = {"PASS": "+", "FAIL": "X", "TIMEOUT": "T"}
+STATUS_COLORS = {"PASS": "#16a34a", "FAIL": "#dc2626", "TIMEOUT": "#d97706"}
+_MISSING_GLYPH = "."
+_MISSING_COLOR = "#e5e7eb"
+_OTHER_GLYPH = "?"
+_OTHER_COLOR = "#6b7280"
+
+SVG_MAX_WIDTH = 800
+SVG_MAX_CELL = 24
+SVG_MAX_TICKS = 20
+TEXT_MAX_WIDTH = 120
+
+
+@dataclass(slots=True)
+class ShmooAxis:
+    target: str
+    parameter: str
+    values: Tuple[Any, ...]
+
+    @property
+    def label(self) -> str:
+        return f"{self.target}.{self.parameter}"
+
+
+@dataclass(slots=True)
+class Shmoo:
+    """Status grid indexed ``cells[row][column]``; rows follow ``y`` and columns ``x``."""
+
+    x: ShmooAxis
+    y: ShmooAxis | None
+    cells: List[List[str | None]]
+
+    def to_text(self) -> str:
+        """Render an ASCII grid; the first ``y`` value is the bottom row, as in the SVG."""
+        labels = [str(value) for value in self.x.values]
+        width = max(len(label) for label in labels)
+        if len(labels) * (width + 1) > TEXT_MAX_WIDTH:
+            width = 1
+        row_labels = [str(value) for value in self.y.values] if self.y else [""]
+        gutter = max(len(label) for label in row_labels)
+        lines: List[str] = []
+        for label, row in reversed(list(zip(row_labels, self.cells, strict=True))):
+            glyphs = " ".join(_glyph(status).center(width) for status in row)
+            lines.append(f"{label.rjust(gutter)} | {glyphs}".rstrip())
+        lines.append(f"{' ' * gutter} +-{'-' * (len(row) * (width + 1) - 1)}")
+        if width > 1:
+            header = " ".join(label.center(width) for label in labels)
+            lines.append(f"{' ' * gutter}   {header}".rstrip())
+        footer = f"x: {self.x.label} ({labels[0]} .. {labels[-1]}, {len(labels)} values)"
+        if self.y:
+            footer += f"; y: {self.y.label} ({row_labels[0]} .. {row_labels[-1]})"
+        lines.append(footer)
+        legend = ", ".join(f"{glyph} {status}" for status, glyph in STATUS_GLYPHS.items())
+        lines.append(f"legend: {legend}, {_MISSING_GLYPH} not run")
+        return "\n".join(lines)
+
+    def to_svg(self) -> str:
+        columns = len(self.x.values)
+        rows = len(self.cells)
+        cell = max(1, min(SVG_MAX_CELL, SVG_MAX_WIDTH // columns))
+        left, top, bottom = 80, 10, 50
+        width = left + columns * cell + 10
+        height = top + rows * cell + bottom
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="10">'
+        ]
+        for row_index, row in enumerate(self.cells):
+            y = top + (rows - 1 - row_index) * cell
+            # Adjacent cells with the same status share one rect, which keeps large grids
+            # to a few thousand elements instead of one per cell.
+            start = 0
+            for column in range(1, columns + 1):
+                if column < columns and row[column] == row[start]:
+                    continue
+                parts.append(
+                    f'<rect x="{left + start * cell}" y="{y}" width="{(column - start) * cell}" '
+                    f'height="{cell}" fill="{_color(row[start])}"/>'
+                )
+                start = column
+        for index in _ticks(columns):
+            x = left + index * cell + cell / 2
+            parts.append(
+                f'<text x="{x}" y="{top + rows * cell + 12}" text-anchor="middle">'
+                f"{escape(str(self.x.values[index]))}</text>"
+            )
+        parts.append(
+            f'<text x="{left + columns * cell / 2}" y="{height - 8}" text-anchor="middle">'
+            f"{escape(self.x.label)}</text>"
+        )
+        if self.y is not None:
+            for index in _ticks(rows):
+                label_y = top + (rows - 1 - index) * cell + cell / 2 + 3
+                parts.append(
+                    f'<text x="{left - 4}" y="{label_y}" text-anchor="end">'
+                    f"{escape(str(self.y.values[index]))}</text>"
+                )
+            middle = top + rows * cell / 2
+            parts.append(
+                f'<text x="10" y="{middle}" text-anchor="middle" '
+                f'transform="rotate(-90 10 {middle})">{escape(self.y.label)}</text>'
+            )
+        parts.append("</svg>")
+        return "".join(parts)
+
+
+def _glyph(status: str | None) -> str:
+    if status is None:
+        return _MISSING_GLYPH
+    return STATUS_GLYPHS.get(status, _OTHER_GLYPH)
+
+
+def _color(status: str | None) -> str:
+    if status is None:
+        return _MISSING_COLOR
+    return STATUS_COLORS.get(status, _OTHER_COLOR)
+
+
+def _ticks(count: int) -> range:
+    return range(0, count, max(1, math.ceil(count / SVG_MAX_TICKS)))
+
+
+def _value_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def _severity(status: str) -> int:
+    return STATUS_SEVERITY.get(status, _UNKNOWN_SEVERITY)
+
+
+def shmoo_axes(plan: Mapping[str, Any]) -> List[ShmooAxis]:
+    """Return the swept (or searched) margin axes recorded in a run's plan header."""
+    axes = [
+        ShmooAxis(axis["target"], axis["parameter"], tuple(axis["values"]))
+        for axis in plan.get("axes", [])
+    ]
+    search = plan.get("search")
+    if search:
+        axes.append(ShmooAxis(search["target"], search["parameter"], tuple(search["values"])))
+    return [axis for axis in axes if axis.values]
+
+
+def build_shmoo(axes: Sequence[ShmooAxis], subruns: Iterable[Mapping[str, Any]]) -> Shmoo | None:
+    """Aggregate sub-run statuses onto the last two axes in a single pass.
+
+    The last axis varies fastest in the plan, so it becomes the x axis and the one before it
+    the y axis; any further axes are folded into each cell by severity.
+    """
+    if not axes:
+        return None
+    x_axis = axes[-1]
+    y_axis = axes[-2] if len(axes) > 1 else None
+    x_index = {_value_key(value): index for index, value in enumerate(x_axis.values)}
+    y_index: Dict[str, int] = {}
+    if y_axis is not None:
+        y_index = {_value_key(value): index for index, value in enumerate(y_axis.values)}
+    rows = len(y_axis.values) if y_axis else 1
+    cells: List[List[str | None]] = [[None] * len(x_axis.values) for _ in range(rows)]
+    for sub in subruns:
+        values = sub.get("margin", {}).get("values", {})
+        try:
+            column = x_index[_value_key(values[x_axis.target][x_axis.parameter])]
+            row = y_index[_value_key(values[y_axis.target][y_axis.parameter])] if y_axis else 0
+        except (KeyError, TypeError):
+            continue
+        status = sub.get("status", "")
+        current = cells[row][column]
+        if current is None or _severity(status) > _severity(current):
+            cells[row][column] = status
+    return Shmoo(x=x_axis, y=y_axis, cells=cells)
+
+
+def load_shmoo(run_paths: RunPaths, subruns: Iterable[Mapping[str, Any]]) -> Shmoo | None:
+    if not (run_paths.plan_header_path.exists() or run_paths.plan_path.exists()):
+        return None
+    return build_shmoo(shmoo_axes(load_plan_header(run_paths)), subruns)
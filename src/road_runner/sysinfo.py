@@ -2,14 +2,45 @@
 
 from __future__ import annotations
 
+import json
+import os
 import platform
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, Mapping
 
+from .paths import cache_dir
 
-def _run_command(args: list[str]) -> str:
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+
+DEFAULT_COMMAND_TIMEOUT_S = 5.0
+
+# Sources that cannot change without a reboot; cached per boot id.
+STABLE_COMMANDS: Dict[str, list[str]] = {
+    "uname": ["uname", "-a"],
+    "lscpu": ["lscpu"],
+    "dmidecode": ["dmidecode"],
+}
+STABLE_FILES: Dict[str, Path] = {}
+
+# Sources that drift while the machine is up; refreshed on every collection. /proc/cpuinfo
+# reports each core's current "cpu MHz", so it belongs here; lscpu covers the stable topology.
+VOLATILE_COMMANDS: Dict[str, list[str]] = {"sensors": ["sensors"]}
+VOLATILE_FILES: Dict[str, Path] = {
+    "cpuinfo": Path("/proc/cpuinfo"),
+    "meminfo": Path("/proc/meminfo"),
+}
+
+COMMAND_TIMEOUTS_S: Dict[str, float] = {"dmidecode": 10.0}
+
+# Outputs of _run_command that describe a failed attempt rather than the host; never cached.
+_TRANSIENT_PREFIXES = ("timeout(", "error(")
+
+
+def _run_command(args: list[str], timeout: float = DEFAULT_COMMAND_TIMEOUT_S) -> str:
     try:
         result = subprocess.run(
             args,
@@ -17,9 +48,12 @@ def _run_command(args: list[str]) -> str:
             text=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            timeout=timeout,
         )
     except FileNotFoundError:
         return "command-not-found"
+    except subprocess.TimeoutExpired:
+        return f"timeout({timeout}s)"
     if result.returncode != 0:
         return f"error({result.returncode}): {result.stderr.strip()}"
     return result.stdout.strip()
@@ -34,18 +68,83 @@ def _read_optional(path: Path) -> str:
         return "permission-denied"
 
 
-def collect_sysinfo() -> Dict[str, str]:
+def _boot_id() -> str | None:
+    try:
+        return BOOT_ID_PATH.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def _collect(commands: Mapping[str, list[str]], files: Mapping[str, Path]) -> Dict[str, str]:
+    collectors: Dict[str, Callable[[], str]] = {}
+    for key, args in commands.items():
+        if key == "sensors" and not shutil.which("sensors"):
+            collectors[key] = lambda: "sensors-not-available"
+            continue
+        timeout = COMMAND_TIMEOUTS_S.get(key, DEFAULT_COMMAND_TIMEOUT_S)
+        collectors[key] = partial(_run_command, args, timeout)
+    for key, path in files.items():
+        collectors[key] = partial(_read_optional, path)
+    if not collectors:
+        return {}
+    # Every source is independent, so wall time is bounded by the slowest one (and its
+    # timeout) instead of the sum of all of them.
+    with ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix="rr-sysinfo") as pool:
+        futures = {key: pool.submit(collector) for key, collector in collectors.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def _load_cached(path: Path) -> Dict[str, str]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    stable = set(STABLE_COMMANDS) | set(STABLE_FILES)
+    return {
+        key: value
+        for key, value in payload.items()
+        if key in stable and isinstance(value, str) and not value.startswith(_TRANSIENT_PREFIXES)
+    }
+
+
+def _store_cached(path: Path, payload: Dict[str, str]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        temporary.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def collect_sysinfo(use_cache: bool = True, refresh: bool = False) -> Dict[str, str]:
+    """Snapshot host information.
+
+    Stable sources (``uname``, ``lscpu``, ``dmidecode``) are cached on disk keyed by the
+    kernel boot id, so repeated runs on the same boot skip them entirely. Volatile sources
+    (``sensors``, ``/proc/cpuinfo``, ``/proc/meminfo``) are always collected fresh. A stable
+    source that timed out or failed is not cached and is retried on the next collection.
+    """
     info: Dict[str, str] = {
         "platform": platform.platform(),
         "python_version": platform.python_version(),
     }
-    info["uname"] = _run_command(["uname", "-a"])
-    info["lscpu"] = _run_command(["lscpu"])
-    info["dmidecode"] = _run_command(["dmidecode"])
-    if shutil.which("sensors"):
-        info["sensors"] = _run_command(["sensors"])
-    else:
-        info["sensors"] = "sensors-not-available"
-    info["meminfo"] = _read_optional(Path("/proc/meminfo"))
-    info["cpuinfo"] = _read_optional(Path("/proc/cpuinfo"))
+    boot_id = _boot_id() if use_cache else None
+    cache_path = cache_dir() / "sysinfo" / f"{boot_id}.json" if boot_id else None
+    cached = {} if refresh or cache_path is None else _load_cached(cache_path)
+    commands = {key: args for key, args in STABLE_COMMANDS.items() if key not in cached}
+    files = {key: path for key, path in STABLE_FILES.items() if key not in cached}
+    collected = _collect({**commands, **VOLATILE_COMMANDS}, {**files, **VOLATILE_FILES})
+    fresh = {key: collected.pop(key) for key in (*commands, *files)}
+    succeeded = {
+        key: value for key, value in fresh.items() if not value.startswith(_TRANSIENT_PREFIXES)
+    }
+    if cache_path is not None and succeeded:
+        _store_cached(cache_path, {**cached, **succeeded})
+    info.update(cached)
+    info.update(fresh)
+    info.update(collected)
     return info
@@ -0,0 +1,226 @@
+"""Background sampling of temperatures, power, CPU frequency and load while steps run."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_INTERVAL_S = 0.5
+DEFAULT_CAPACITY = 4096
+_READ_SIZE = 256
+
+
+@dataclass(slots=True, frozen=True)
+class TelemetryChannel:
+    name: str
+    path: str
+    unit: str
+    scale: float
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def discover_channels(root: Path = Path("/")) -> Tuple[TelemetryChannel, ...]:
+    """Find readable hwmon temperature/power inputs and per-CPU cpufreq files under ``root``."""
+    channels: List[TelemetryChannel] = []
+    hwmon_root = root / "sys" / "class" / "hwmon"
+    for hwmon in sorted(hwmon_root.glob("hwmon*")):
+        device = _read_text(hwmon / "name") or hwmon.name
+        for pattern, unit, scale in (("temp*_input", "C", 1e-3), ("power*_input", "W", 1e-6)):
+            for sensor in sorted(hwmon.glob(pattern)):
+                prefix = sensor.name[: -len("_input")]
+                label = _read_text(hwmon / f"{prefix}_label") or prefix
+                channels.append(TelemetryChannel(f"{device}.{label}", str(sensor), unit, scale))
+    cpu_root = root / "sys" / "devices" / "system" / "cpu"
+    cpufreq = list(cpu_root.glob("cpu[0-9]*/cpufreq/scaling_cur_freq"))
+    for path in sorted(cpufreq, key=lambda item: int(item.parent.parent.name[3:])):
+        name = f"{path.parent.parent.name}.freq"
+        channels.append(TelemetryChannel(name, str(path), "MHz", 1e-3))
+    return tuple(channels)
+
+
+@cache
+def system_channels() -> Tuple[TelemetryChannel, ...]:
+    """Channels of this host, discovered once per process."""
+    return discover_channels()
+
+
+class _CpuLoad:
+    """Busy percentage across all CPUs between consecutive reads of ``/proc/stat``."""
+
+    def __init__(self) -> None:
+        self._previous: Tuple[int, int] | None = None
+        self._busy = float("nan")
+
+    def sample(self, fd: int) -> float:
+        try:
+            fields = os.pread(fd, _READ_SIZE, 0).split(b"\n", 1)[0].split()[1:]
+            values = [int(field) for field in fields]
+            # idle + iowait count as not busy.
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+        except (OSError, ValueError, IndexError):
+            return float("nan")
+        total = sum(values[:8])
+        previous = self._previous
+        if previous is not None and total == previous[1]:
+            # No jiffies elapsed since the last read; keep the last known load.
+            return self._busy
+        self._previous = (idle, total)
+        if previous is None:
+            return float("nan")
+        self._busy = 100.0 * (1.0 - (idle - previous[0]) / (total - previous[1]))
+        return self._busy
+
+
+class TelemetrySampler:
+    """Samples telemetry channels on a daemon thread into a fixed-size ring buffer.
+
+    Every channel file is opened once and re-read with ``os.pread``, so a sample costs one
+    syscall per channel and no allocation beyond the parsed number. Samples stay in memory
+    until :meth:`write` so sampling never competes with the diagnostic for disk I/O; when the
+    buffer is full the oldest samples are overwritten. The sampler's own CPU time is tracked
+    with ``time.thread_time`` and reported alongside the series.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[TelemetryChannel],
+        interval_s: float = DEFAULT_INTERVAL_S,
+        capacity: int = DEFAULT_CAPACITY,
+        proc_stat: str | None = "/proc/stat",
+    ) -> None:
+        self._channels = tuple(channels)
+        self._interval_s = interval_s
+        self._capacity = capacity
+        self._proc_stat = proc_stat if proc_stat and os.path.exists(proc_stat) else None
+        self._width = 1 + len(self._channels) + (1 if self._proc_stat else 0)
+        self._buffer = array("d", bytes(8 * self._width * capacity))
+        self._count = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self._cpu_s = 0.0
+        self._sample_s = 0.0
+
+    @property
+    def columns(self) -> List[str]:
+        names = ["t"] + [channel.name for channel in self._channels]
+        return names + (["cpu.busy_pct"] if self._proc_stat else [])
+
+    @property
+    def samples(self) -> int:
+        return min(self._count, self._capacity)
+
+    def __enter__(self) -> "TelemetrySampler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="rr-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        cpu_start = time.thread_time()
+        fds: List[int | None] = []
+        for channel in self._channels:
+            try:
+                fds.append(os.open(channel.path, os.O_RDONLY))
+            except OSError:
+                fds.append(None)
+        stat_fd = os.open(self._proc_stat, os.O_RDONLY) if self._proc_stat else None
+        load = _CpuLoad() if self._proc_stat else None
+        try:
+            while True:
+                began = time.perf_counter()
+                self._sample(fds, stat_fd, load)
+                self._sample_s += time.perf_counter() - began
+                if self._stop.wait(self._interval_s):
+                    break
+            # One last sample so short steps still get a reading at their end.
+            self._sample(fds, stat_fd, load)
+        finally:
+            for fd in [*fds, stat_fd]:
+                if fd is not None:
+                    os.close(fd)
+            self._cpu_s = time.thread_time() - cpu_start
+
+    def _sample(
+        self, fds: Sequence[int | None], stat_fd: int | None, load: _CpuLoad | None
+    ) -> None:
+        base = (self._count % self._capacity) * self._width
+        buffer = self._buffer
+        buffer[base] = time.monotonic() - self._started
+        for offset, (channel, fd) in enumerate(zip(self._channels, fds, strict=True), start=1):
+            if fd is None:
+                value = float("nan")
+            else:
+                try:
+                    value = int(os.pread(fd, _READ_SIZE, 0)) * channel.scale
+                except (OSError, ValueError):
+                    value = float("nan")
+            buffer[base + offset] = value
+        if stat_fd is not None and load is not None:
+            buffer[base + self._width - 1] = load.sample(stat_fd)
+        self._count += 1
+
+    def overhead(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "samples": self._count,
+            "dropped": max(self._count - self._capacity, 0),
+            "cpu_s": round(self._cpu_s, 6),
+            "cpu_pct": round(100.0 * self._cpu_s / elapsed, 4),
+            "mean_sample_us": round(1e6 * self._sample_s / max(self._count - 1, 1), 2),
+        }
+
+    def write(self, path: Path) -> Dict[str, Any]:
+        """Write the buffered series as LDJSON (header, one row per sample, overhead)."""
+        overhead = self.overhead()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        first = self._count - self.samples
+        with path.open("w", encoding="utf-8") as handle:
+            header = {
+                "event": "header",
+                "interval_s": self._interval_s,
+                "columns": self.columns,
+                "units": ["s"]
+                + [channel.unit for channel in self._channels]
+                + (["%"] if self._proc_stat else []),
+            }
+            handle.write(json.dumps(header) + "\n")
+            for index in range(first, self._count):
+                base = (index % self._capacity) * self._width
+                row = [
+                    None if value != value else round(value, 3)
+                    for value in self._buffer[base : base + self._width]
+                ]
+                handle.write(json.dumps(row) + "\n")
+            handle.write(json.dumps({"event": "overhead", **overhead}) + "\n")
+        return overhead
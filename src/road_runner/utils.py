@@ -4,17 +4,21 @@ from __future__ import annotations
 
 import json
 import random
+import re
 import time
 from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Mapping
 
 import yaml
 
+# libyaml's C loader is several times faster than the pure-Python one when available.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
+        return yaml.load(handle, Loader=_YAML_LOADER)
 
 
 def dump_json(data: Any, path: Path) -> None:
@@ -25,6 +29,24 @@ def dump_json(data: Any, path: Path) -> None:
         json.dump(data, handle, indent=2, sort_keys=True)
 
 
+def dump_json_stream(header: Mapping[str, Any], key: str, items: Iterable[Any], path: Path) -> None:
+    """Write ``header`` as a JSON object whose ``key`` member is streamed from ``items``.
+
+    Only one item is held in memory at a time, which keeps very large plans cheap to persist.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("{\n")
+        for name in sorted(header):
+            value = json.dumps(header[name], indent=2, sort_keys=True).replace("\n", "\n  ")
+            handle.write(f"  {json.dumps(name)}: {value},\n")
+        handle.write(f"  {json.dumps(key)}: [")
+        for index, item in enumerate(items):
+            handle.write(",\n    " if index else "\n    ")
+            handle.write(json.dumps(item, sort_keys=True))
+        handle.write("\n  ]\n}\n")
+
+
 def read_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
@@ -35,3 +57,31 @@ def ensure_seed(seed: int | None) -> int:
         seed = int(time.time())
     random.seed(seed)
     return seed
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as ``"500M"`` or ``"1.5G"`` (binary units, optional ``iB``/``B``)."""
+    match = re.fullmatch(r"\s*([0-9]+(?:\.[0-9]+)?)\s*([KMGT]?)(?:I?B)?\s*", value.upper())
+    if not match:
+        raise ValueError(f"invalid size {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def parse_cpu_list(value: str) -> tuple[int, ...]:
+    """Parse a kernel-style CPU list such as ``"0-3,8,10-11"`` into sorted CPU numbers."""
+    cpus: set[int] = set()
+    for part in value.strip().split(","):
+        if not part:
+            continue
+        match = re.fullmatch(r"\s*([0-9]+)\s*(?:-\s*([0-9]+)\s*)?", part)
+        if not match:
+            raise ValueError(f"invalid CPU list {value!r}")
+        first = int(match.group(1))
+        last = int(match.group(2)) if match.group(2) is not None else first
+        if last < first:
+            raise ValueError(f"invalid CPU range {part.strip()!r}")
+        cpus.update(range(first, last + 1))
+    return tuple(sorted(cpus))
@@ -0,0 +1,11 @@
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    # Adapter indexes, sysinfo and Jinja bytecode would otherwise land in the checkout.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("ROAD_RUNNER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        yield
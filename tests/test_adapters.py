@@ -0,0 +1,268 @@
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+
+from road_runner import adapters
+from road_runner.adapters import (
+    AdapterExecutor,
+    AdapterRegistry,
+    AdapterRequest,
+    AdapterResult,
+    AsyncAdapterExecutor,
+)
+from road_runner.cache import ResultCache
+from road_runner.exceptions import AdapterExecutionError, AdapterTimeoutError
+from road_runner.models import ResourceLimits
+from road_runner.resources import TransientCgroup
+
+
+def _write_manifest(directory: Path, file_name: str, name: str, path: str) -> Path:
+    manifest = directory / file_name
+    manifest.write_text(f"name: {name}\npath: {path}\n", encoding="utf-8")
+    return manifest
+
+
+def test_registry_reuses_index_until_manifest_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = tmp_path / "adapters"
+    directory.mkdir()
+    _write_manifest(directory, "one.yaml", "one", "/bin/true")
+    manifest = _write_manifest(directory, "two.yaml", "two", "/bin/false")
+    index_path = tmp_path / "index.json"
+
+    assert AdapterRegistry(directory, index_path).get("two").path == Path("/bin/false")
+    assert index_path.exists()
+
+    def fail_load(path: Path) -> Any:
+        raise AssertionError(f"unexpected parse of {path}")
+
+    monkeypatch.setattr(adapters, "load_yaml", fail_load)
+    assert AdapterRegistry(directory, index_path).get("one").path == Path("/bin/true")
+
+    monkeypatch.undo()
+    _write_manifest(directory, "two.yaml", "two", "/usr/bin/false")
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert AdapterRegistry(directory, index_path).get("two").path == Path("/usr/bin/false")
+
+
+def test_shared_registry_indexes_drop_missing_and_least_recent_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ROAD_RUNNER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(adapters, "ADAPTER_INDEX_LIMIT", 2)
+    index_dir = tmp_path / "cache" / "adapters"
+    directories = []
+    for number in range(3):
+        directory = tmp_path / f"adapters-{number}"
+        directory.mkdir()
+        _write_manifest(directory, "one.yaml", "one", "/bin/true")
+        directories.append(directory)
+
+    AdapterRegistry(directories[0]).load()
+    AdapterRegistry(directories[1]).load()
+    (directories[0] / "one.yaml").unlink()
+    directories[0].rmdir()
+    AdapterRegistry(directories[2]).load()
+    assert sorted(path.name for path in index_dir.glob("*.json")) == sorted(
+        adapters._default_index_path(directory).name for directory in directories[1:]
+    )
+
+    # Past the limit the least recently read index goes; reading one counts as a use.
+    past = os.stat(index_dir).st_mtime - 60
+    for path in index_dir.glob("*.json"):
+        os.utime(path, (past, past))
+    AdapterRegistry(directories[1]).load()
+    extra = tmp_path / "adapters-extra"
+    extra.mkdir()
+    _write_manifest(extra, "one.yaml", "one", "/bin/true")
+    AdapterRegistry(extra).load()
+    assert sorted(path.name for path in index_dir.glob("*.json")) == sorted(
+        adapters._default_index_path(directory).name for directory in (directories[1], extra)
+    )
+
+
+def test_async_executor_streams_output_and_enforces_timeout(tmp_path: Path) -> None:
+    directory = tmp_path / "adapters"
+    directory.mkdir()
+    script = tmp_path / "talk.py"
+    script.write_text(
+        "import argparse, time\n"
+        "parser = argparse.ArgumentParser()\n"
+        "parser.add_argument('--sleep', type=float, default=0.0)\n"
+        "args = parser.parse_args()\n"
+        "print('hello', flush=True)\n"
+        "time.sleep(args.sleep)\n",
+        encoding="utf-8",
+    )
+    (directory / "talk.yaml").write_text(
+        f"name: talk\npath: {sys.executable}\nargs: ['{script}']\n", encoding="utf-8"
+    )
+    executor = AsyncAdapterExecutor(AdapterRegistry(directory, tmp_path / "index.json"))
+    chunks: List[Tuple[str, str, bytes]] = []
+    executor.subscribe(lambda tag, stream, chunk: chunks.append((tag, stream, chunk)))
+
+    requests = [
+        AdapterRequest("talk", {}, tmp_path / "fast.out", tmp_path / "fast.err", tag="fast"),
+        AdapterRequest(
+            "talk",
+            {"sleep": 5},
+            tmp_path / "slow.out",
+            tmp_path / "slow.err",
+            timeout_s=0.5,
+            tag="slow",
+        ),
+    ]
+    fast, slow = asyncio.run(executor.run_all(requests))
+    assert isinstance(fast, AdapterResult) and fast.returncode == 0
+    assert isinstance(slow, AdapterExecutionError) and "timed out" in str(slow)
+    assert (tmp_path / "fast.out").read_text(encoding="utf-8") == "hello\n"
+    streamed = b"".join(
+        chunk for tag, stream, chunk in chunks if tag == "fast" and stream == "stdout"
+    )
+    assert streamed == b"hello\n"
+
+
+def test_executor_escalates_to_sigkill_when_sigterm_is_ignored(tmp_path: Path) -> None:
+    directory = tmp_path / "adapters"
+    directory.mkdir()
+    script = tmp_path / "stubborn.py"
+    script.write_text(
+        "import signal, time\n"
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n",
+        encoding="utf-8",
+    )
+    (directory / "stubborn.yaml").write_text(
+        f"name: stubborn\npath: {sys.executable}\nargs: ['{script}']\n", encoding="utf-8"
+    )
+    registry = AdapterRegistry(directory, tmp_path / "index.json")
+    executor = AdapterExecutor(registry, kill_grace_s=0.2)
+    with pytest.raises(AdapterTimeoutError):
+        executor.run("stubborn", {}, tmp_path / "out.log", tmp_path / "err.log", timeout_s=0.5)
+
+
+def test_executor_replays_cached_result_for_identical_invocation(tmp_path: Path) -> None:
+    directory = tmp_path / "adapters"
+    directory.mkdir()
+    script = tmp_path / "count.py"
+    counter = tmp_path / "calls.txt"
+    script.write_text(
+        "import os\n"
+        f"with open({str(counter)!r}, 'a') as handle: handle.write('x')\n"
+        "print('vdd', os.environ['RR_PARAM_VDD'])\n",
+        encoding="utf-8",
+    )
+    (directory / "count.yaml").write_text(
+        f"name: count\npath: {sys.executable}\nargs: ['{script}']\n", encoding="utf-8"
+    )
+    registry = AdapterRegistry(directory, tmp_path / "index.json")
+    executor = AdapterExecutor(registry, cache=ResultCache(tmp_path / "cache"))
+
+    def invoke(index: int, vdd: str) -> Tuple[AdapterResult, str]:
+        stdout_path = tmp_path / f"out-{index}.log"
+        env = {"RR_PARAM_VDD": vdd, "RR_RUN_ID": f"run-{index}"}
+        result = executor.run("count", {}, stdout_path, tmp_path / f"err-{index}.log", env=env)
+        return result, stdout_path.read_text(encoding="utf-8")
+
+    first, first_output = invoke(0, "0.9")
+    second, second_output = invoke(1, "0.9")
+    third, _ = invoke(2, "1.0")
+
+    assert not first.cached and second.cached and not third.cached
+    assert second_output == first_output == "vdd 0.9\n"
+    assert counter.read_text(encoding="utf-8") == "xx"
+
+    script.write_text(script.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    fourth, _ = invoke(3, "0.9")
+    assert not fourth.cached
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs sched_setaffinity")
+def test_executor_pins_child_to_requested_cpus(tmp_path: Path) -> None:
+    directory = tmp_path / "adapters"
+    directory.mkdir()
+    (directory / "affinity.yaml").write_text(
+        f"name: affinity\npath: {sys.executable}\n"
+        "args: ['-c', 'import os; print(sorted(os.sched_getaffinity(0)))']\n",
+        encoding="utf-8",
+    )
+    cpu = min(os.sched_getaffinity(0))
+    before = os.sched_getaffinity(0)
+    executor = AdapterExecutor(AdapterRegistry(directory, tmp_path / "index.json"))
+    stdout_path = tmp_path / "out.log"
+    result = executor.run(
+        "affinity",
+        {},
+        stdout_path,
+        tmp_path / "err.log",
+        limits=ResourceLimits(cpus=(cpu,), memory_max=64 << 20),
+    )
+    assert stdout_path.read_text(encoding="utf-8") == f"[{cpu}]\n"
+    assert os.sched_getaffinity(0) == before
+    assert result.placement is not None
+    assert result.placement.affinity and result.placement.cpus == (cpu,)
+    assert result.resources is not None
+
+
+def test_transient_cgroup_applies_limits_and_cleans_up(tmp_path: Path) -> None:
+    parent = tmp_path / "cgroup"
+    parent.mkdir()
+    (parent / "cgroup.subtree_control").write_text("cpu", encoding="utf-8")
+    limits = ResourceLimits(cpus=(2, 3), numa_node=1, memory_max=1 << 30)
+    group = TransientCgroup.create(limits, (2, 3), parent=parent)
+    assert group is not None
+    assert group.enforced == ["memory", "cpuset"]
+    assert (group.path / "memory.max").read_text(encoding="utf-8") == str(1 << 30)
+    assert (group.path / "cpuset.cpus").read_text(encoding="utf-8") == "2,3"
+    assert (group.path / "cpuset.mems").read_text(encoding="utf-8") == "1"
+    assert group.add(1234)
+    (group.path / "cpu.stat").write_text(
+        "usage_usec 3000000\nuser_usec 2500000\nsystem_usec 500000\n", encoding="utf-8"
+    )
+    (group.path / "io.stat").write_text("8:0 rbytes=4096 wbytes=8192 rios=1 wios=2\n")
+    usage = group.usage(None)
+    assert usage is not None and usage.source == "cgroup"
+    assert (usage.user_cpu_s, usage.sys_cpu_s) == (2.5, 0.5)
+    assert (usage.read_bytes, usage.write_bytes) == (4096, 8192)
+
+    for child in group.path.iterdir():
+        child.unlink()
+    group.remove()
+    assert not group.path.exists()
+    assert TransientCgroup.create(limits, (2, 3), parent=tmp_path / "missing") is None
+
+
+def test_cache_stores_same_key_from_concurrent_threads(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(["adapter", "--vdd", "0.9"], {"RR_PARAM_VDD": "0.9"})
+    outputs = []
+    for index in range(8):
+        stdout_path = tmp_path / f"out-{index}.log"
+        stdout_path.write_bytes(f"writer {index}\n".encode() * (index + 1) * 20_000)
+        stderr_path = tmp_path / f"err-{index}.log"
+        stderr_path.write_bytes(b"")
+        outputs.append((stdout_path, stderr_path))
+    barrier = threading.Barrier(len(outputs))
+
+    def store(paths: Tuple[Path, Path]) -> None:
+        barrier.wait()
+        cache.put(key, 0, *paths, output_bytes=(paths[0].stat().st_size, 0))
+
+    with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+        list(pool.map(store, outputs))
+    cached = cache.get(key)
+    assert cached is not None
+    # One writer's entry, complete and consistent with its own metadata.
+    stored = cached.stdout_path.read_bytes()
+    assert stored in {stdout_path.read_bytes() for stdout_path, _ in outputs}
+    assert cached.output_bytes == (len(stored), 0)
+    assert [path.name for path in cached.stdout_path.parent.parent.iterdir()] == [key]
@@ -0,0 +1,35 @@
+import time
+from pathlib import Path
+
+from road_runner.artifacts import FlushPolicy, LDJSONLogger, read_ldjson
+
+
+def test_ldjson_logger_batches_until_policy_triggers(tmp_path: Path) -> None:
+    path = tmp_path / "steps.ldjson"
+    with LDJSONLogger(path, FlushPolicy(every_records=3)) as logger:
+        logger.append({"index": 0})
+        logger.append({"index": 1})
+        assert path.read_text(encoding="utf-8") == ""
+        logger.append({"index": 2})
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+        logger.append({"index": 3})
+    assert [record["index"] for record in read_ldjson(path)] == [0, 1, 2, 3]
+
+
+def test_ldjson_logger_flushes_on_interval_without_further_appends(tmp_path: Path) -> None:
+    path = tmp_path / "steps.ldjson"
+    with LDJSONLogger(path, FlushPolicy(every_records=100, interval_s=0.05)) as logger:
+        logger.append({"index": 0, "action": "start"})
+        assert path.read_text(encoding="utf-8") == ""
+        deadline = time.monotonic() + 5.0
+        while not path.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [record["index"] for record in read_ldjson(path)] == [0]
+        logger.append({"index": 1})
+    assert [record["index"] for record in read_ldjson(path)] == [0, 1]
+
+
+def test_read_ldjson_skips_truncated_trailing_line(tmp_path: Path) -> None:
+    path = tmp_path / "steps.ldjson"
+    path.write_text('{"index": 0}\n{"index": 1}\n{"ind', encoding="utf-8")
+    assert [record["index"] for record in read_ldjson(path)] == [0, 1]
@@ -1,10 +1,17 @@
+import itertools
 from pathlib import Path
 
 import pytest
 
 from road_runner.config import load_flow, load_margin_profile, load_safety_policy
-from road_runner.exceptions import SafetyViolationError
-from road_runner.models import FlowDefinition, MarginProfile, SafetyPolicy
+from road_runner.exceptions import SafetyViolationError, ValidationError
+from road_runner.models import (
+    Bound,
+    FlowDefinition,
+    MarginProfile,
+    ResourceLimits,
+    SafetyPolicy,
+)
 
 
 def test_flow_loading(tmp_path: Path) -> None:
@@ -30,6 +37,37 @@ steps:
     assert len(expanded) == 2
 
 
+def test_flow_step_resource_limits(tmp_path: Path) -> None:
+    flow_path = tmp_path / "flow.yaml"
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - name: socket0
+    adapter: stress
+    cpus: "0-3,8"
+    numa_node: 0
+    memory_max: 512M
+  - name: plain
+    adapter: stress
+""",
+        encoding="utf-8",
+    )
+    first, second = load_flow(flow_path).steps
+    assert first.limits == ResourceLimits(cpus=(0, 1, 2, 3, 8), numa_node=0, memory_max=512 << 20)
+    assert second.limits.empty
+    assert ResourceLimits(cpus=(1,), memory_max=1).merged(first.limits) == first.limits
+    assert ResourceLimits(memory_max=1).merged(ResourceLimits(numa_node=1)).memory_max == 1
+
+    for bad in ("cpus: '3-1'", "numa_node: -1", "memory_max: lots", "cpus: []"):
+        flow_path.write_text(
+            f"metadata: {{}}\nsteps:\n  - name: s\n    adapter: a\n    {bad}\n",
+            encoding="utf-8",
+        )
+        with pytest.raises(ValidationError):
+            load_flow(flow_path)
+
+
 def test_margin_profile_expansion(tmp_path: Path) -> None:
     margin_path = tmp_path / "margin.yaml"
     margin_path.write_text(
@@ -70,3 +108,92 @@ behavior:
     policy.validate_value("vcore_mv", 950)
     with pytest.raises(SafetyViolationError):
         policy.validate_value("vcore_mv", 1100)
+
+
+def test_margin_profile_expansion_is_lazy(tmp_path: Path) -> None:
+    margin_path = tmp_path / "margin.yaml"
+    margin_path.write_text(
+        """
+metadata: {}
+global_seed: 7
+targets:
+  default:
+    vcore_mv:
+      sweep: [900, 910, 920, 930, 940, 950, 960, 970, 980, 990]
+    soc_freq_mhz:
+      sweep: [1500, 1600, 1700, 1800, 1900, 2000, 2100, 2200, 2300, 2400]
+  mem_diag:
+    vddio_mv:
+      sweep: [1100, 1150, 1200, 1250, 1300, 1350, 1400, 1450, 1500, 1550]
+""",
+        encoding="utf-8",
+    )
+    profile = load_margin_profile(margin_path)
+    points = profile.expand_points()
+    assert len(points) == 1000
+    eager = list(itertools.product(*(values for _, _, values in points.axes)))
+    assert points[537].values["default"]["vcore_mv"] == eager[537][0]
+    assert points[537].values["mem_diag"]["vddio_mv"] == eager[537][2]
+    assert points[-1].identifier == "point-999"
+    assert points[537].seed == 7 + 537
+    assert [point.identifier for point in points[:3]] == ["point-0", "point-1", "point-2"]
+
+
+def test_safety_policy_validate_grid_reports_every_violation() -> None:
+    policy = SafetyPolicy(
+        metadata={},
+        avt_bounds={"vcore_mv": Bound(900, 1000), "soc_freq_mhz": Bound(1500, 2200)},
+        behavior={},
+    )
+    policy.validate_grid([("default.vcore_mv", "vcore_mv", [900, 950, 1000])])
+    with pytest.raises(SafetyViolationError) as excinfo:
+        policy.validate_grid(
+            [
+                ("default.vcore_mv", "vcore_mv", [850, 950, 1050]),
+                ("default.soc_freq_mhz", "soc_freq_mhz", [1800, 2400]),
+                ("default.load_percent", "load_percent", [150]),
+            ]
+        )
+    message = str(excinfo.value)
+    assert "default.vcore_mv[0]" in message
+    assert "default.vcore_mv[2]" in message
+    assert "default.soc_freq_mhz[1]" in message
+    assert "vcore_mv[1]" not in message
+    assert "load_percent" not in message
+
+
+def test_flow_step_dependencies(tmp_path: Path) -> None:
+    flow_path = tmp_path / "flow.yaml"
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - {name: setup, adapter: a}
+  - {name: cpu, adapter: a, parallel_group: diag}
+  - {name: mem, adapter: a, parallel_group: diag}
+  - {name: collect, adapter: a}
+  - {name: upload, adapter: a, depends_on: setup}
+""",
+        encoding="utf-8",
+    )
+    definition = load_flow(flow_path)
+    assert definition.scheduled
+    assert definition.step_dependencies() == [(), (0,), (0,), (1, 2), (0,)]
+
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - {name: one, adapter: a, depends_on: two}
+  - {name: two, adapter: a, depends_on: one}
+""",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValidationError, match="cycle"):
+        load_flow(flow_path)
+    flow_path.write_text(
+        "metadata: {}\nsteps:\n  - {name: one, adapter: a, depends_on: missing}\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValidationError, match="unknown"):
+        load_flow(flow_path)
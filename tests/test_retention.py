@@ -0,0 +1,80 @@
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from road_runner.exceptions import ValidationError
+from road_runner.retention import (
+    archive_runs,
+    delete_runs,
+    list_runs,
+    measure_sizes,
+    select_runs,
+)
+
+
+def _make_run(runs: Path, name: str, age_days: float, payload: int, now: float) -> Path:
+    run_dir = runs / name
+    logs = run_dir / "subruns" / f"{name}-s00" / "stdout"
+    logs.mkdir(parents=True)
+    (logs / "00_step.log").write_bytes(b"x" * payload)
+    summary = run_dir / "summary.json"
+    summary.write_text("{}", encoding="utf-8")
+    stamp = now - age_days * 86400
+    os.utime(summary, (stamp, stamp))
+    return run_dir
+
+
+def test_retention_policies_combine_age_budget_and_keep_last(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    now = 1_800_000_000.0
+    for index, age in enumerate((1, 2, 10, 20, 30)):
+        _make_run(runs, f"rr-{index}", age, 1000, now)
+    entries = list_runs(runs)
+    assert [entry.run_id for entry in entries] == ["rr-0", "rr-1", "rr-2", "rr-3", "rr-4"]
+    measure_sizes(entries, workers=2)
+    assert all(entry.size is not None and entry.size >= 1000 for entry in entries)
+
+    def ids(**policy: object) -> list:
+        return [entry.run_id for entry in select_runs(entries, now=now, **policy)]
+
+    assert ids(older_than_days=7) == ["rr-4", "rr-3", "rr-2"]
+    assert ids(older_than_days=7, keep_last=4) == ["rr-4"]
+    assert ids(keep_last=2) == ["rr-4", "rr-3", "rr-2"]
+    size = entries[0].size or 0
+    assert ids(max_bytes=2 * size) == ["rr-4", "rr-3", "rr-2"]
+    assert ids(older_than_days=25, max_bytes=3 * size + 1) == ["rr-4", "rr-3"]
+
+
+def test_archive_then_delete_runs(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    now = 1_800_000_000.0
+    _make_run(runs, "rr-old", 40, 10, now)
+    _make_run(runs, "rr-new", 1, 10, now)
+    selected = select_runs(list_runs(runs), older_than_days=30, now=now)
+    archive = archive_runs(selected, tmp_path / "old-runs.tar.gz")
+    delete_runs(selected, workers=2)
+
+    assert sorted(path.name for path in runs.iterdir()) == ["rr-new"]
+    with tarfile.open(archive) as bundle:
+        assert "rr-old/subruns/rr-old-s00/stdout/00_step.log" in bundle.getnames()
+
+
+def test_archive_refuses_to_overwrite_an_existing_archive(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    now = 1_800_000_000.0
+    _make_run(runs, "rr-first", 40, 10, now)
+    archive_path = tmp_path / "old-runs.tar.gz"
+    first = select_runs(list_runs(runs), older_than_days=30, now=now)
+    archive_runs(first, archive_path)
+    delete_runs(first, workers=2)
+
+    _make_run(runs, "rr-second", 40, 10, now)
+    second = select_runs(list_runs(runs), older_than_days=30, now=now)
+    with pytest.raises(ValidationError, match="already exists"):
+        archive_runs(second, archive_path)
+
+    with tarfile.open(archive_path) as bundle:
+        assert "rr-first/summary.json" in bundle.getnames()
+    assert [path.name for path in tmp_path.iterdir() if "partial" in path.name] == []
@@ -1,7 +1,31 @@
+import csv
+import json
+import sqlite3
 import sys
+import threading
+from datetime import datetime
 from pathlib import Path
+from typing import Any, List, Set, Tuple
 
+import pytest
+
+from road_runner import reporting
+from road_runner import runner as runner_module
+from road_runner.artifacts import (
+    RunPaths,
+    SubRunDetails,
+    SubRunRollups,
+    load_run_summary,
+    read_ldjson,
+    read_log_text,
+    write_summary,
+)
+from road_runner.cache import ResultCache
+from road_runner.exceptions import ConfigError, ValidationError
+from road_runner.exporter import export_arrow, export_csv
+from road_runner.reporting import render_many, render_reports, render_run_reports
 from road_runner.runner import Runner
+from road_runner.utils import read_json
 
 
 def _prepare_environment(base: Path) -> tuple[Path, Path, Path, Path]:
@@ -102,9 +126,798 @@ def test_runner_execute_creates_artifacts(tmp_path: Path) -> None:
     plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
     summary = runner.execute(plan, unit="unit-42")
     assert summary["subruns"]
-    subrun = summary["subruns"][0]
-    assert subrun["steps"][0]["status"] == "PASS"
+    rollup = summary["subruns"][0]
+    assert "steps" not in rollup
+    assert rollup["step_count"] == 1
+    assert rollup["step_status_counts"] == {"PASS": 1}
     run_dir = tmp_path / "runs" / summary["run_id"]
+    subrun = read_json(run_dir / rollup["summary"])
+    assert subrun["steps"][0]["status"] == "PASS"
+    resources = subrun["steps"][0]["resources"]
+    assert resources["source"] == "rusage"
+    assert resources["max_rss_kb"] > 0
+    assert subrun["resources"]["user_cpu_s"] == resources["user_cpu_s"]
+    end_record = list(read_ldjson(run_dir / "subruns" / rollup["run_id"] / "steps.ldjson"))[-1]
+    assert end_record["resources"] == resources
     assert (run_dir / "summary.json").exists()
     assert (run_dir / "report.md").exists()
     assert (run_dir / "safety_policy.json").exists()
+
+
+def test_runner_parallel_execution_keeps_subrun_order(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 930, 950, 970]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, parallel=3)
+    run_ids = [sub["run_id"] for sub in summary["subruns"]]
+    assert run_ids == [sub.identifier for sub in plan.subruns]
+    assert all(sub["status"] == "PASS" for sub in summary["subruns"])
+
+
+def test_interrupted_run_summary_recovers_from_journal(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    assert read_json(run_paths.summary_path)["state"] == "complete"
+    assert len(list(read_ldjson(run_paths.subrun_journal_path))) == len(summary["subruns"])
+
+    # Simulate a run killed before the final compaction.
+    write_summary(run_paths.summary_path, {**summary, "state": "running", "subruns": []})
+    recovered = load_run_summary(run_paths)
+    assert [sub["run_id"] for sub in recovered["subruns"]] == [
+        sub["run_id"] for sub in summary["subruns"]
+    ]
+
+
+def test_export_csv_flattens_parameters_and_margins(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 950]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, sysinfo_override={})
+    destination = export_csv(tmp_path / "runs" / summary["run_id"])
+    with destination.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["margin.vcore_mv"] for row in rows] == ["910", "950"]
+    assert rows[0]["param.message"] == "hello"
+    assert rows[0]["param.duration"] == "0.001"
+    assert rows[0]["status"] == "PASS"
+    assert float(rows[0]["user_cpu_s"]) + float(rows[0]["sys_cpu_s"]) > 0
+    assert int(rows[0]["max_rss_kb"]) > 0
+
+
+def test_export_arrow_writes_flattened_schema_in_batches(tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 930, 950]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, sysinfo_override={})
+    destination = export_arrow(tmp_path / "runs" / summary["run_id"], batch_size=2)
+    with pa.OSFile(str(destination), "rb") as source:
+        reader = pa.ipc.open_file(source)
+        assert reader.num_record_batches == 2
+        table = reader.read_all()
+
+    schema = table.schema
+    assert schema.names[:3] == ["parent_run_id", "sub_run_id", "margin_point"]
+    assert schema.field("param.message").type == pa.string()
+    assert schema.field("param.duration").type == pa.float64()
+    assert schema.field("margin.vcore_mv").type == pa.float64()
+    assert schema.field("max_rss_kb").type == pa.float64()
+    assert table.num_rows == 3
+    assert table.column("margin.vcore_mv").to_pylist() == [910, 930, 950]
+    assert set(table.column("param.message").to_pylist()) == {"hello"}
+    assert set(table.column("status").to_pylist()) == {"PASS"}
+
+
+def test_hung_step_is_killed_and_recorded_as_timeout(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    hang_script = tmp_path / "diags" / "hang.py"
+    hang_script.write_text("import time\ntime.sleep(60)\n", encoding="utf-8")
+    (adapters_dir / "hang.yaml").write_text(
+        f"name: hang\npath: {sys.executable}\nargs: ['{hang_script}']\ntimeout_s: 30\n",
+        encoding="utf-8",
+    )
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - name: hang-step
+    adapter: hang
+    timeout_s: 0.3
+  - name: echo-step
+    adapter: echo
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    subrun = SubRunDetails(run_paths)[0]
+    assert subrun["status"] == "TIMEOUT"
+    assert [step["status"] for step in subrun["steps"]] == ["TIMEOUT"]
+    assert subrun["steps"][0]["duration_s"] < 10
+    records = list(read_ldjson(run_paths.subrun_ldjson(subrun["run_id"])))
+    assert records[-1]["status"] == "TIMEOUT"
+
+
+def test_resume_only_reexecutes_unfinished_subruns(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 930, 950]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, unit="unit-7")
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    first, _, last = (sub["run_id"] for sub in summary["subruns"])
+
+    # Simulate a crash during the last sub-run: no sub-run summary, compaction never ran.
+    run_paths.subrun_summary(last).unlink()
+    write_summary(run_paths.summary_path, {**summary, "state": "running", "subruns": []})
+    first_log = run_paths.subrun_ldjson(first)
+    first_mtime = first_log.stat().st_mtime_ns
+    # Sub-runs are regenerated from the plan header; they are never listed up front.
+    assert read_json(run_paths.plan_header_path)["subrun_count"] == 3
+    assert not run_paths.plan_path.exists()
+
+    resumed = runner.resume(summary["run_id"])
+    assert resumed["run_id"] == summary["run_id"]
+    assert resumed["unit"] == "unit-7"
+    assert [sub["run_id"] for sub in resumed["subruns"]] == [
+        sub["run_id"] for sub in summary["subruns"]
+    ]
+    assert all(sub["status"] == "PASS" for sub in resumed["subruns"])
+    assert first_log.stat().st_mtime_ns == first_mtime
+    assert len(list(read_ldjson(run_paths.subrun_ldjson(last)))) == 2
+    assert read_json(run_paths.summary_path)["resumed_at"]
+
+
+def test_margin_search_locates_failing_edge_in_log_probes(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    edge_script = tmp_path / "diags" / "edge.py"
+    edge_script.write_text(
+        "import os, sys\nsys.exit(int(os.environ['RR_MARGIN_VCORE_MV']) < 937)\n",
+        encoding="utf-8",
+    )
+    (adapters_dir / "edge.yaml").write_text(
+        f"name: edge\npath: {sys.executable}\nargs: ['{edge_script}']\n", encoding="utf-8"
+    )
+    flow_path.write_text(
+        "metadata: {}\nsteps:\n  - name: edge-step\n    adapter: edge\n", encoding="utf-8"
+    )
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      search:
+        strategy: binary
+        start: 1000
+        stop: 900
+        step: 5
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    assert len(plan.subruns) == 21
+    summary = runner.execute(plan, sysinfo_override={})
+    search = summary["search"]
+    assert (search["last_pass"], search["first_fail"]) == (940, 935)
+    assert search["probes"] == len(summary["subruns"]) <= 5
+    assert [probe["subrun"] for probe in search["trace"]] == [
+        sub["run_id"] for sub in summary["subruns"]
+    ]
+    assert all((probe["status"] == "PASS") == (probe["value"] >= 937) for probe in search["trace"])
+
+
+def test_render_many_regenerates_reports_and_isolates_broken_runs(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+    run_dir = tmp_path / "runs" / summary["run_id"]
+    (run_dir / "report.md").unlink()
+    broken = tmp_path / "runs" / "rr-broken"
+    broken.mkdir()
+    (broken / "summary.json").write_text("{not json", encoding="utf-8")
+
+    results = dict(render_many([run_dir, broken], workers=2))
+    assert results[summary["run_id"]] is None
+    assert results["rr-broken"] is not None
+    assert summary["run_id"] in (run_dir / "report.md").read_text(encoding="utf-8")
+
+
+def test_html_report_is_split_into_pages_with_overview(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 920, 930, 940, 950]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    render_reports(summary, summary["subruns"], run_paths, page_size=2)
+
+    pages = sorted(run_paths.report_pages_dir.glob("page-*.html"))
+    assert [page.name for page in pages] == ["page-0001.html", "page-0002.html", "page-0003.html"]
+    last_id = summary["subruns"][-1]["run_id"]
+    assert f'id="{last_id}"' in pages[-1].read_text(encoding="utf-8")
+    overview = run_paths.html_report_path.read_text(encoding="utf-8")
+    assert "report_pages/page-0003.html" in overview
+    assert "<td>PASS</td>\n            <td>5</td>" in overview
+    assert f'id="{last_id}"' not in overview
+
+
+def test_catalog_indexes_runs_and_rebuilds_from_summaries(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        """
+metadata: {}
+targets:
+  default:
+    vcore_mv:
+      sweep: [910, 950]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    first = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path), unit="A")
+    second = runner.execute(
+        runner.plan(flow_path=flow_path, margin_path=margin_path, seed=7), unit="B"
+    )
+    catalog = runner.catalog
+
+    assert [row["run_id"] for row in catalog.query_runs(unit="A")] == [first["run_id"]]
+    row = catalog.query_runs(unit="B", status="pass")[0]
+    assert (row["run_id"], row["subrun_count"], row["pass_count"]) == (second["run_id"], 2, 2)
+    assert catalog.query_runs(status="FAIL") == []
+    subruns = catalog.query_subruns(run_id=first["run_id"])
+    assert sorted(sub["default.vcore_mv"] for sub in subruns) == [910, 950]
+
+    catalog.path.unlink()
+    assert catalog.rebuild(tmp_path / "runs") == 2
+    assert {row["unit"] for row in catalog.query_runs(flow="sample")} == {"A", "B"}
+
+
+def test_gzip_log_compression_records_raw_and_stored_sizes(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, log_compression="gzip")
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    step = SubRunDetails(run_paths)[0]["steps"][0]
+    artifacts = step["artifacts"]
+    assert artifacts["compression"] == "gzip"
+    assert artifacts["stdout"].endswith(".log.gz")
+    stdout_path = tmp_path / "runs" / summary["run_id"] / artifacts["stdout"]
+    assert read_log_text(stdout_path) == "hello\n"
+    assert artifacts["bytes"]["stdout"] == {"raw": 6, "stored": stdout_path.stat().st_size}
+    assert summary["log_bytes"]["raw"] == 6
+    assert summary["subruns"][0]["log_bytes"]["stored"] > 0
+
+
+def test_zstd_logs_round_trip_through_the_result_cache(tmp_path: Path) -> None:
+    pytest.importorskip("zstandard")
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+        result_cache=ResultCache(tmp_path / "cache"),
+    )
+    steps = []
+    for parent_id in ("first", "replayed"):
+        plan = runner.plan(flow_path=flow_path, margin_path=margin_path, parent_id=parent_id)
+        summary = runner.execute(plan, log_compression="zstd")
+        run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+        step = SubRunDetails(run_paths)[0]["steps"][0]
+        assert step["artifacts"]["stdout"].endswith(".log.zst")
+        stdout_path = run_paths.parent_dir / step["artifacts"]["stdout"]
+        assert read_log_text(stdout_path) == "hello\n"
+        assert step["artifacts"]["bytes"]["stdout"] == {
+            "raw": 6,
+            "stored": stdout_path.stat().st_size,
+        }
+        steps.append(step)
+    assert [step["cached"] for step in steps] == [False, True]
+
+
+def test_zstd_without_zstandard_fails_before_the_run_starts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    # A None entry makes ``import zstandard`` fail even where the package is installed.
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    with pytest.raises(ConfigError, match="pip install road_runner\\[zstd\\]"):
+        runner.execute(plan, log_compression="zstd")
+    assert not (tmp_path / "runs" / plan.parent_id).exists()
+
+
+def test_telemetry_sampling_writes_per_step_series(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, telemetry_interval_s=0.05)
+    assert summary["telemetry_interval_s"] == 0.05
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    telemetry = SubRunDetails(run_paths)[0]["steps"][0]["telemetry"]
+    assert telemetry["path"].endswith(".ldjson")
+    assert telemetry["samples"] >= 1
+    assert "cpu_pct" in telemetry
+    lines = (tmp_path / "runs" / summary["run_id"] / telemetry["path"]).read_text().splitlines()
+    assert json.loads(lines[0])["event"] == "header"
+
+
+def test_subrun_rollups_use_index_and_survive_stale_index(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    assert run_paths.subrun_index_path.exists()
+    with SubRunRollups(run_paths) as rollups:
+        assert list(rollups) == summary["subruns"]
+        assert rollups[-1] == summary["subruns"][-1]
+        journal = rollups._journal
+    assert journal is not None and journal.closed
+
+    # A journal extended after the index was written (e.g. a killed resume) is rescanned.
+    extra = {**summary["subruns"][0], "run_id": "extra"}
+    with run_paths.subrun_journal_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(extra) + "\n" + '{"truncated')
+    with SubRunRollups(run_paths) as rollups:
+        assert len(rollups) == len(summary["subruns"]) + 1
+        assert rollups[-1]["run_id"] == "extra"
+        with SubRunDetails(run_paths, rollups) as details:
+            assert details[0]["steps"]
+            assert details[-1] == extra
+        # Rollups handed to the details stay usable; only owned ones are closed.
+        assert rollups[0] == summary["subruns"][0]
+
+
+def test_step_graph_runs_independent_steps_concurrently_and_skips_dependents(
+    tmp_path: Path,
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    script = tmp_path / "diags" / "sleeper.py"
+    script.write_text(
+        "import argparse, sys, time\n"
+        "parser = argparse.ArgumentParser()\n"
+        "parser.add_argument('--seconds', type=float, default=0.0)\n"
+        "parser.add_argument('--fail', action='store_true')\n"
+        "args = parser.parse_args()\n"
+        "time.sleep(args.seconds)\n"
+        "sys.exit(1 if args.fail else 0)\n",
+        encoding="utf-8",
+    )
+    (adapters_dir / "sleeper.yaml").write_text(
+        f"name: sleeper\npath: {sys.executable}\nargs: ['{script}']\n", encoding="utf-8"
+    )
+    flow_path.write_text(
+        """
+metadata: {}
+max_parallel_steps: 4
+steps:
+  - name: cpu
+    adapter: sleeper
+    parallel_group: diag
+    parameters: {seconds: 0.4, fail: true}
+  - name: mem
+    adapter: sleeper
+    parallel_group: diag
+    parameters: {seconds: 0.4}
+  - name: cpu-report
+    adapter: sleeper
+    depends_on: cpu
+  - name: cpu-archive
+    adapter: sleeper
+    depends_on: [cpu-report]
+  - name: mem-report
+    adapter: sleeper
+    depends_on: [mem]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    subrun = SubRunDetails(run_paths)[0]
+    assert subrun["status"] == "FAIL"
+    assert [(step["name"], step["status"]) for step in subrun["steps"]] == [
+        ("cpu", "FAIL"),
+        ("mem", "PASS"),
+        ("cpu-report", "SKIPPED"),
+        ("cpu-archive", "SKIPPED"),
+        ("mem-report", "PASS"),
+    ]
+    assert subrun["steps"][3]["error"] == "dependency 'cpu-report' skipped"
+    # cpu and mem overlap instead of taking 0.8s back to back.
+    assert subrun["duration_s"] < 0.75
+    assert summary["subruns"][0]["step_status_counts"] == {"FAIL": 1, "PASS": 2, "SKIPPED": 2}
+
+
+def test_step_concurrency_runs_sweep_invocations_in_parallel_with_ordered_log(
+    tmp_path: Path,
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    script = tmp_path / "diags" / "worker.py"
+    script.write_text(
+        "import argparse, sys, time\n"
+        "parser = argparse.ArgumentParser()\n"
+        "parser.add_argument('--workers', type=int)\n"
+        "args = parser.parse_args()\n"
+        "time.sleep(0.3 if args.workers != 2 else 0.0)\n"
+        "print(args.workers)\n"
+        "sys.exit(1 if args.workers == 16 else 0)\n",
+        encoding="utf-8",
+    )
+    (adapters_dir / "worker.yaml").write_text(
+        f"name: worker\npath: {sys.executable}\nargs: ['{script}']\n", encoding="utf-8"
+    )
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - name: scale
+    adapter: worker
+    concurrency: 4
+    sweeps:
+      workers: [1, 2, 4, 8]
+  - name: fails
+    adapter: worker
+    concurrency: 2
+    sweeps:
+      workers: [1, 16, 4, 8, 32]
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    subrun = SubRunDetails(run_paths)[0]
+    scale = subrun["steps"][:4]
+    assert [step["name"] for step in scale] == [f"scale[{index}]" for index in range(4)]
+    assert all(step["status"] == "PASS" for step in scale)
+    assert len({step["artifacts"]["stdout"] for step in scale}) == 4
+    assert read_log_text(run_paths.parent_dir / scale[3]["artifacts"]["stdout"]) == "8\n"
+
+    # After the failing invocation no new ones start; the one already in flight is kept.
+    fails = subrun["steps"][4:]
+    assert [step["status"] for step in fails] == ["PASS", "FAIL", "PASS"]
+    assert subrun["status"] == "FAIL"
+
+    records = list(read_ldjson(run_paths.subrun_ldjson(subrun["run_id"])))
+    assert [(record["step"], record["action"]) for record in records] == [
+        (step["name"], action) for step in subrun["steps"] for action in ("start", "end")
+    ]
+    # The three 0.3s invocations overlap instead of taking 0.9s back to back.
+    scale_wall = datetime.fromisoformat(records[7]["timestamp"]) - datetime.fromisoformat(
+        records[0]["timestamp"]
+    )
+    assert scale_wall.total_seconds() < 0.8
+
+
+def test_async_adapters_drive_a_flow_from_one_event_loop(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    hang_script = tmp_path / "diags" / "hang.py"
+    hang_script.write_text("import time\ntime.sleep(60)\n", encoding="utf-8")
+    (adapters_dir / "hang.yaml").write_text(
+        f"name: hang\npath: {sys.executable}\nargs: ['{hang_script}']\n", encoding="utf-8"
+    )
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - name: echo-step
+    adapter: echo
+    concurrency: 3
+    sweeps:
+      message: [one, two, three]
+  - name: hang-step
+    adapter: hang
+    timeout_s: 0.3
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+        result_cache=ResultCache(tmp_path / "cache"),
+        async_adapters=True,
+    )
+    streamed: List[Tuple[str, str, bytes]] = []
+    loop_threads: Set[str] = set()
+
+    def follow(tag: str, stream: str, chunk: bytes) -> None:
+        streamed.append((tag, stream, chunk))
+        loop_threads.add(threading.current_thread().name)
+
+    runner.async_executor.subscribe(follow)
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path, seed=7)
+    summary = runner.execute(plan, log_compression="gzip")
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    subrun = SubRunDetails(run_paths)[0]
+    echo_steps, hang_step = subrun["steps"][:3], subrun["steps"][3]
+    assert [step["status"] for step in echo_steps] == ["PASS", "PASS", "PASS"]
+    assert hang_step["status"] == "TIMEOUT" and hang_step["duration_s"] < 10
+    assert subrun["status"] == "TIMEOUT"
+    assert loop_threads == {"rr-adapter-loop"}
+    tag = f"{subrun['run_id']}/echo-step[1]"
+    assert b"".join(chunk for name, _, chunk in streamed if name == tag) == b"two\n"
+    # Same accounting as the blocking executor: rusage, raw vs. stored bytes, the cache.
+    assert echo_steps[1]["resources"]["max_rss_kb"] > 0
+    stdout_bytes = echo_steps[1]["artifacts"]["bytes"]["stdout"]
+    assert stdout_bytes["raw"] == 4 and stdout_bytes["stored"] > 0
+    assert read_log_text(run_paths.parent_dir / echo_steps[1]["artifacts"]["stdout"]) == "two\n"
+
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path, parent_id="rerun", seed=7)
+    summary = runner.execute(plan, log_compression="gzip")
+    rerun = SubRunDetails(RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs"))[0]
+    assert [step["cached"] for step in rerun["steps"][:3]] == [True, True, True]
+
+
+def test_reports_render_without_a_writable_bytecode_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    read_only = tmp_path / "read-only"
+    read_only.write_text("", encoding="utf-8")
+    monkeypatch.setattr(reporting, "cache_dir", lambda: read_only / "cache")
+    reporting._jinja_environment.cache_clear()
+    try:
+        runner = Runner(
+            adapters_path=adapters_dir,
+            runs_path=tmp_path / "runs",
+            safety_policy_path=policy_path,
+        )
+        summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+        assert reporting._jinja_environment().bytecode_cache is None
+    finally:
+        reporting._jinja_environment.cache_clear()
+    assert (tmp_path / "runs" / summary["run_id"] / "report.html").exists()
+
+
+def test_builtin_templates_render_like_the_shipped_templates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+    run_dir = tmp_path / "runs" / summary["run_id"]
+    rendered = {}
+    shipped = Path(__file__).resolve().parents[1] / "templates"
+    for label, directory in (("shipped", shipped), ("builtin", tmp_path / "no-templates")):
+        monkeypatch.setattr(reporting, "templates_dir", lambda directory=directory: directory)
+        reporting._jinja_environment.cache_clear()
+        try:
+            render_run_reports(run_dir)
+        finally:
+            reporting._jinja_environment.cache_clear()
+        rendered[label] = [
+            (run_dir / name).read_text(encoding="utf-8")
+            for name in ("report.md", "report.html", "report_pages/page-0001.html")
+        ]
+    assert "| Step | Adapter | Status | Duration (s) |" in rendered["builtin"][0]
+    assert rendered["builtin"] == rendered["shipped"]
+
+
+def test_cache_hits_across_runs_with_generated_seeds_and_renumbered_points(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    generated = iter([1_792_368_370, 1_792_368_371])
+    monkeypatch.setattr(
+        runner_module, "ensure_seed", lambda seed: next(generated) if seed is None else seed
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+        result_cache=ResultCache(tmp_path / "cache"),
+    )
+
+    def run_sweep(values: str) -> List[bool]:
+        margin_path.write_text(
+            f"metadata: {{}}\ntargets:\n  default:\n    vcore_mv:\n      sweep: {values}\n",
+            encoding="utf-8",
+        )
+        summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+        run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+        return [sub["steps"][0]["cached"] for sub in SubRunDetails(run_paths)]
+
+    assert run_sweep("[910, 950]") == [False, False]
+    # A new seed and a value inserted in front renumber every point, yet each value is
+    # still asked the same thing as before.
+    assert run_sweep("[900, 910, 950]") == [False, True, True]
+
+
+def test_full_plan_is_opt_in_and_still_resumes_runs_without_a_header(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    margin_path.write_text(
+        "metadata: {}\ntargets:\n  default:\n    vcore_mv:\n      sweep: [910, 950]\n",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    plan = runner.plan(flow_path=flow_path, margin_path=margin_path)
+    summary = runner.execute(plan, full_plan=True)
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    recorded = read_json(run_paths.plan_path)
+    assert [sub["run_id"] for sub in recorded["subruns"]] == [
+        sub["run_id"] for sub in summary["subruns"]
+    ]
+
+    # Runs recorded before plan_header.json existed resume from the full plan instead.
+    run_paths.plan_header_path.unlink()
+    resumed = runner.resume(summary["run_id"])
+    assert [sub["status"] for sub in resumed["subruns"]] == ["PASS", "PASS"]
+
+
+def test_catalog_failures_do_not_abort_the_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+
+    def locked(*args: Any, **kwargs: Any) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(runner.catalog, "record_run", locked)
+    summary = runner.execute(runner.plan(flow_path=flow_path, margin_path=margin_path))
+
+    run_paths = RunPaths(parent_id=summary["run_id"], base_dir=tmp_path / "runs")
+    assert read_json(run_paths.summary_path)["state"] == "complete"
+    assert run_paths.html_report_path.exists()
+    assert "database is locked" in caplog.text
+    assert "catalog rebuild" in caplog.text
+
+
+def test_plan_rejects_numa_nodes_missing_on_this_host(tmp_path: Path) -> None:
+    flow_path, margin_path, policy_path, adapters_dir = _prepare_environment(tmp_path)
+    flow_path.write_text(
+        """
+metadata: {}
+steps:
+  - name: pinned
+    adapter: echo
+    numa_node: 4096
+    parameters:
+      message: hello
+""",
+        encoding="utf-8",
+    )
+    runner = Runner(
+        adapters_path=adapters_dir,
+        runs_path=tmp_path / "runs",
+        safety_policy_path=policy_path,
+    )
+    with pytest.raises(ValidationError, match="step 'pinned': NUMA node 4096 does not exist"):
+        runner.plan(flow_path=flow_path, margin_path=margin_path)
+    assert list((tmp_path / "runs").iterdir()) == []
@@ -0,0 +1,26 @@
+import pytest
+
+from road_runner.exceptions import ValidationError
+from road_runner.search import BoundarySearch
+
+
+@pytest.mark.parametrize(
+    ("strategy", "max_probes"), [("binary", 7), ("golden", 9), ("step_down", 64)]
+)
+def test_boundary_search_finds_edge(strategy: str, max_probes: int) -> None:
+    values = list(range(1000, 900, -1))
+    for edge in (0, 1, 37, 99, 100):
+        search = BoundarySearch(strategy, values)
+        index = search.next_index()
+        while index is not None:
+            search.record(index, index < edge)
+            index = search.next_index()
+        result = search.result()
+        assert result["last_pass"] == (values[edge - 1] if edge > 0 else None)
+        assert result["first_fail"] == (values[edge] if edge < len(values) else None)
+        assert result["probes"] <= (max_probes if strategy != "step_down" else edge + 1)
+
+
+def test_boundary_search_rejects_unknown_strategy() -> None:
+    with pytest.raises(ValidationError):
+        BoundarySearch("random", [1, 2, 3])
@@ -0,0 +1,44 @@
+from road_runner.shmoo import ShmooAxis, build_shmoo, shmoo_axes
+
+
+def _subrun(vcore: int, freq: int, jitter: bool, status: str) -> dict:
+    values = {"default": {"vcore_mv": vcore, "soc_freq_mhz": freq, "jitter": jitter}}
+    return {"margin": {"values": values}, "status": status}
+
+
+def test_build_shmoo_folds_extra_axes_by_severity() -> None:
+    plan = {
+        "axes": [
+            {"target": "default", "parameter": "jitter", "values": [False, True]},
+            {"target": "default", "parameter": "vcore_mv", "values": [900, 950]},
+            {"target": "default", "parameter": "soc_freq_mhz", "values": [1800, 2000, 2200]},
+        ]
+    }
+    axes = shmoo_axes(plan)
+    subruns = [
+        _subrun(900, 1800, False, "PASS"),
+        _subrun(900, 1800, True, "FAIL"),
+        _subrun(900, 2000, False, "TIMEOUT"),
+        _subrun(950, 1800, False, "PASS"),
+        _subrun(950, 2000, True, "PASS"),
+        _subrun(950, 2200, False, "FAIL"),
+    ]
+    shmoo = build_shmoo(axes, subruns)
+    assert shmoo is not None
+    assert shmoo.x.parameter == "soc_freq_mhz" and shmoo.y is not None
+    assert shmoo.cells == [["FAIL", "TIMEOUT", None], ["PASS", "PASS", "FAIL"]]
+
+    text = shmoo.to_text().splitlines()
+    assert text[0].split("|")[1].split() == ["+", "+", "X"]
+    assert text[1].split("|")[1].split() == ["X", "T", "."]
+
+    svg = shmoo.to_svg()
+    assert svg.startswith("<svg") and svg.endswith("</svg>")
+    # The two adjacent PASS cells of the top row share a single rect.
+    assert svg.count("<rect") == 5
+
+
+def test_build_shmoo_without_axes_returns_none() -> None:
+    assert build_shmoo([], []) is None
+    single = build_shmoo([ShmooAxis("default", "vcore_mv", (900, 950))], [])
+    assert single is not None and single.y is None and single.cells == [[None, None]]
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from road_runner import sysinfo
+
+
+def test_collect_sysinfo_caches_stable_sources_per_boot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    boot_id = tmp_path / "boot_id"
+    boot_id.write_text("boot-1\n", encoding="utf-8")
+    monkeypatch.setattr(sysinfo, "BOOT_ID_PATH", boot_id)
+    monkeypatch.setattr(sysinfo, "cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(sysinfo.shutil, "which", lambda name: f"/usr/bin/{name}")
+    cpuinfo = tmp_path / "cpuinfo"
+    cpuinfo.write_text("cpu MHz\t\t: 1200.000\n", encoding="utf-8")
+    monkeypatch.setitem(sysinfo.VOLATILE_FILES, "cpuinfo", cpuinfo)
+    calls: List[str] = []
+
+    def fake_run(args: List[str], timeout: float = 5.0) -> str:
+        calls.append(args[0])
+        return f"{args[0]}-output"
+
+    monkeypatch.setattr(sysinfo, "_run_command", fake_run)
+
+    first = sysinfo.collect_sysinfo()
+    assert sorted(calls) == ["dmidecode", "lscpu", "sensors", "uname"]
+    assert (tmp_path / "cache" / "sysinfo" / "boot-1.json").exists()
+
+    calls.clear()
+    cpuinfo.write_text("cpu MHz\t\t: 3400.000\n", encoding="utf-8")
+    second = sysinfo.collect_sysinfo()
+    assert calls == ["sensors"]
+    assert second["dmidecode"] == first["dmidecode"] == "dmidecode-output"
+    assert "3400.000" in second["cpuinfo"]
+
+    boot_id.write_text("boot-2\n", encoding="utf-8")
+    calls.clear()
+    sysinfo.collect_sysinfo()
+    assert "dmidecode" in calls
+
+
+def test_run_command_times_out() -> None:
+    assert sysinfo._run_command(["sleep", "5"], timeout=0.1).startswith("timeout")
+
+
+def test_collect_sysinfo_retries_failed_sources(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    boot_id = tmp_path / "boot_id"
+    boot_id.write_text("boot-1\n", encoding="utf-8")
+    monkeypatch.setattr(sysinfo, "BOOT_ID_PATH", boot_id)
+    monkeypatch.setattr(sysinfo, "cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(sysinfo.shutil, "which", lambda name: f"/usr/bin/{name}")
+    calls: List[str] = []
+    slow = {"dmidecode"}
+
+    def fake_run(args: List[str], timeout: float = 5.0) -> str:
+        calls.append(args[0])
+        if args[0] in slow:
+            return f"timeout({timeout}s)"
+        return f"{args[0]}-output"
+
+    monkeypatch.setattr(sysinfo, "_run_command", fake_run)
+
+    assert sysinfo.collect_sysinfo()["dmidecode"].startswith("timeout")
+
+    slow.clear()
+    calls.clear()
+    assert sysinfo.collect_sysinfo()["dmidecode"] == "dmidecode-output"
+    assert sorted(calls) == ["dmidecode", "sensors"]
+
+    calls.clear()
+    assert sysinfo.collect_sysinfo()["dmidecode"] == "dmidecode-output"
+    assert calls == ["sensors"]
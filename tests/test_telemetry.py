@@ -0,0 +1,65 @@
+import json
+import time
+from pathlib import Path
+
+from road_runner.telemetry import TelemetrySampler, discover_channels
+
+
+def _fake_sysfs(root: Path) -> Path:
+    hwmon = root / "sys" / "class" / "hwmon" / "hwmon0"
+    hwmon.mkdir(parents=True)
+    (hwmon / "name").write_text("coretemp\n")
+    (hwmon / "temp1_input").write_text("45000\n")
+    (hwmon / "temp1_label").write_text("Package id 0\n")
+    (hwmon / "power1_input").write_text("12500000\n")
+    for cpu in (0, 1, 10):
+        cpufreq = root / "sys" / "devices" / "system" / "cpu" / f"cpu{cpu}" / "cpufreq"
+        cpufreq.mkdir(parents=True)
+        (cpufreq / "scaling_cur_freq").write_text(f"{3000000 + cpu}\n")
+    stat = root / "proc" / "stat"
+    stat.parent.mkdir(parents=True)
+    stat.write_text("cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 50 0 50 400 0 0 0 0 0 0\n")
+    return stat
+
+
+def test_sampler_writes_series_with_overhead(tmp_path: Path) -> None:
+    stat = _fake_sysfs(tmp_path)
+    channels = discover_channels(tmp_path)
+    assert [channel.name for channel in channels] == [
+        "coretemp.Package id 0",
+        "coretemp.power1",
+        "cpu0.freq",
+        "cpu1.freq",
+        "cpu10.freq",
+    ]
+
+    sampler = TelemetrySampler(channels, interval_s=0.01, capacity=4, proc_stat=str(stat))
+    with sampler:
+        time.sleep(0.05)
+        stat.write_text("cpu  150 0 150 900 0 0 0 0 0 0\n")
+        time.sleep(0.05)
+    output = tmp_path / "telemetry.ldjson"
+    overhead = sampler.write(output)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    header, rows, footer = lines[0], lines[1:-1], lines[-1]
+    assert header["columns"][0] == "t"
+    assert header["columns"][-1] == "cpu.busy_pct"
+    assert header["units"][1:3] == ["C", "W"]
+    # The ring buffer keeps only the newest samples.
+    assert len(rows) == 4
+    assert overhead["dropped"] == overhead["samples"] - 4
+    assert rows[-1][1:6] == [45.0, 12.5, 3000.0, 3000.001, 3000.01]
+    assert rows[-1][-1] == 50.0
+    assert footer["event"] == "overhead"
+    assert footer["cpu_s"] >= 0
+    assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+
+
+def test_sampler_without_sources(tmp_path: Path) -> None:
+    sampler = TelemetrySampler([], interval_s=1.0, proc_stat=str(tmp_path / "missing"))
+    with sampler:
+        pass
+    overhead = sampler.write(tmp_path / "out.ldjson")
+    assert sampler.columns == ["t"]
+    assert overhead["samples"] == 2